@@ -0,0 +1,241 @@
+import asyncio
+from trader_bot import TraderBot
+from decorators import *
+from class_blueprints.trader import post_order, cancel_order, cancel_all_orders
+from class_blueprints.stop_loss_repository import repository as stop_loss_repository
+from class_blueprints.metrics import order_latency, orders, tick_latency
+
+
+class AsyncTraderBot(TraderBot):
+    """
+    Runs every strategy check and every pending limit order as its own asyncio task, so a slow history download or
+    an unfilled order on one symbol doesn't delay the other symbols. The blocking API calls run in worker threads
+    over the pooled connections of the trader module.
+    """
+
+    def __init__(self, name, strategies, portfolio, prices, market_stream=None, order_tracker=None,
+                 warm_start=None):
+        super().__init__(name=name, strategies=strategies, portfolio=portfolio, prices=prices,
+                         market_stream=market_stream, order_tracker=order_tracker, warm_start=warm_start)
+        self.__busy = set()
+        self.__tasks = set()
+        self.__buy_lock = None
+
+    # ----- PLACE ORDERS ----- #
+
+    async def place_limit_order_async(self, symbol, action, strategy):
+        """
+        Places a limit order with the Binance API without blocking the other strategies while it waits for a fill.
+
+        :param symbol: (str) The symbol of the asset that is to be traded.
+        :param action: (str) The action that the limit order will execute. Can be either "buy" or "sell".
+        :param strategy: (object) The strategy that is currently used.
+        :return: (dict) Returns the receipt (response from Binance API) in a dictionary.
+        """
+
+        try:
+            price, crypto_coins = await asyncio.to_thread(self.get_coins_to_trade, strategy=strategy, action=action)
+
+        except TypeError:
+            print("There is no fiat in your account. No order will be place.")
+
+        else:
+            client_order_id = self._order_tracker.track()
+
+            try:
+                with order_latency.time(stage="post", side=action):
+                    receipt = await asyncio.to_thread(post_order, asset=symbol, action=action, order_type="limit",
+                                                      price=price, quantity_type="quantity", amount=crypto_coins,
+                                                      client_order_id=client_order_id)
+
+                # Will wait until the limit order is filled. After a certain amount of time it will cancel the
+                # order and try again.
+                with order_latency.time(stage="fill", side=action):
+                    confirmation = await self._order_tracker.wait_async(symbol=symbol, order_id=receipt["orderId"],
+                                                                        client_order_id=client_order_id)
+                orders.inc(side=action, status=confirmation["status"].lower())
+
+                if confirmation["status"].lower() == "filled":
+                    return confirmation
+
+                with order_latency.time(stage="cancel", side=action):
+                    order = await asyncio.to_thread(cancel_order, symbol=symbol, order_id=receipt["orderId"])
+
+                # Part of the order may have been filled before it was cancelled.
+                self._portfolio.account_state.apply_fill(order)
+
+            except BinanceAccountIssue:
+                self.save_snapshot()
+                os.system(config.command)
+                sys.exit("Restarting bot. Please fix issue if it persists.")
+
+            else:
+                if order["status"] == "canceled":
+                    print("Limit order was not filled, order is cancelled. Will try again.")
+                    await asyncio.to_thread(self._prices.refresh)
+                    return await self.place_limit_order_async(symbol=symbol, action=action, strategy=strategy)
+
+            finally:
+                # The future is forgotten as well when the order couldn't be placed or the wait failed.
+                self._order_tracker.forget(client_order_id)
+
+    async def _trade(self, action, strategy):
+        """
+        Places the order and processes it when it's filled. Buy orders are placed one at a time, so the fiat
+        balance that is divided over the orders is always up to date.
+
+        :param action: (str) The action that the limit order will execute. Can be either "buy" or "sell".
+        :param strategy: (object) The strategy that is currently used.
+        """
+
+        if action == "buy":
+            async with self.__buy_lock:
+                order_receipt = await self.place_limit_order_async(symbol=strategy.symbol, action=action,
+                                                                   strategy=strategy)
+                await self._process_receipt(order_receipt=order_receipt, action=action, strategy=strategy)
+        else:
+            order_receipt = await self.place_limit_order_async(symbol=strategy.symbol, action=action,
+                                                               strategy=strategy)
+            await self._process_receipt(order_receipt=order_receipt, action=action, strategy=strategy)
+
+    async def _process_receipt(self, order_receipt, action, strategy):
+        if order_receipt:
+            if order_receipt["status"].lower() == "filled":
+                await asyncio.to_thread(self.process_order, receipt=order_receipt, strategy=strategy)
+                self.print_new_order(action, strategy.symbol)
+
+    # ----- STRATEGIES ----- #
+
+    async def _run_strategy(self, strategy, check_signal):
+        """
+        Checks one strategy for a signal or a triggered stop loss and trades on it.
+
+        :param strategy: (object) The strategy that needs to be checked.
+        :param check_signal: (bool) Checks for a signal when True, otherwise only checks the stop loss.
+        """
+
+        action = None
+        tick_start = time.perf_counter()
+
+        try:
+            if check_signal:
+                try:
+                    data, action = await asyncio.to_thread(strategy.check_for_signal)
+
+                except TypeError:
+                    print("Something went wrong. Continuing")
+                    return
+
+                self.print_new_data(df=data.df, strategy=strategy)
+                await asyncio.to_thread(self._portfolio.print_portfolio)
+
+            elif strategy.stop_loss:
+                action = await asyncio.to_thread(strategy.check_stop_loss)
+
+            if action and action != "continue":
+                await self._trade(action=action, strategy=strategy)
+
+        except BinanceConnectionIssue as error:
+            # The bot keeps its state and tries again on the next tick.
+            print(f"{error} Trying again next tick.")
+
+        finally:
+            tick_latency.observe(time.perf_counter() - tick_start, symbol=strategy.symbol, source="tick")
+            self.__busy.discard(strategy.symbol)
+
+    async def _consume_market_stream(self):
+        """
+        Checks the trailing stop losses against the prices that come in from the market stream. A strategy that is
+        busy, ie. checking for a signal, is checked again with the next prices.
+        """
+
+        while True:
+            ranges = await asyncio.to_thread(self._market_stream.wait, 1)
+
+            for symbol, (low, high, last) in ranges.items():
+                self._prices.update(symbol=symbol, price=last)
+                strategy = self._strategies_by_symbol.get(symbol)
+
+                if strategy and strategy.stop_loss and symbol not in self.__busy:
+                    with tick_latency.time(symbol=symbol, source="stream"):
+                        action = strategy.check_stop_loss(low=low, high=high)
+
+                    if action == "sell":
+                        self.__busy.add(symbol)
+                        self._add_task(self._sell_on_stop_loss(strategy=strategy))
+
+    async def _sell_on_stop_loss(self, strategy):
+        try:
+            await self._trade(action="sell", strategy=strategy)
+        except BinanceConnectionIssue as error:
+            print(f"{error} Trying again with the next price.")
+        finally:
+            self.__busy.discard(strategy.symbol)
+
+    def _add_task(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    def _start_strategy(self, strategy, check_signal):
+        # A strategy that is still busy with the previous tick, ie. waiting for a fill, is skipped.
+        if strategy.symbol in self.__busy:
+            return
+
+        self.__busy.add(strategy.symbol)
+        self._add_task(self._run_strategy(strategy=strategy, check_signal=check_signal))
+
+    # ----- ON/OFF BUTTON ----- #
+
+    def activate(self):
+        """Activate the main loop of the bot"""
+        try:
+            asyncio.run(self.run())
+        finally:
+            self.save_snapshot()
+
+    async def run(self):
+        """The main loop of the bot. Starts the strategy tasks at the start of every minute."""
+        self.__buy_lock = asyncio.Lock()
+
+        for symbol, crypto in self._portfolio.crypto_balances.items():
+            try:
+                await asyncio.to_thread(cancel_all_orders, symbol=symbol)
+            except BinanceAccountIssue:
+                print(f"There are no orders to cancel for {symbol.upper()}.")
+
+        if self._market_stream:
+            self._market_stream.start()
+            self._add_task(self._consume_market_stream())
+        self._order_tracker.start()
+
+        scheduler = self.create_scheduler()
+
+        while True:
+            await asyncio.sleep(scheduler.time_until_next())
+            events = self.check_deadlines(scheduler.pop_due())
+            if not events:
+                continue
+
+            streaming = self._market_stream is not None and self._market_stream.connected
+            check_signal = "30m" in events
+
+            # All stop loss changes of the previous tick are written in one transaction.
+            await asyncio.to_thread(stop_loss_repository.flush)
+
+            # The indicators are only saved while no strategy is checking for a signal in a thread.
+            if check_signal and not self.__busy:
+                self.save_snapshot()
+            try:
+                if not streaming:
+                    await asyncio.to_thread(self._prices.refresh)
+                if check_signal:
+                    await asyncio.to_thread(self._portfolio.update_portfolio)
+            except BinanceConnectionIssue as error:
+                print(f"{error} Trying again next tick.")
+                continue
+
+            for strategy in self._strategies:
+                # The market stream checks the stop losses as soon as the prices come in.
+                if check_signal or not streaming:
+                    self._start_strategy(strategy=strategy, check_signal=check_signal)
@@ -0,0 +1,58 @@
+import argparse
+import time
+import config
+from functions import format_border
+from class_blueprints.kline_store import KlineStore
+from class_blueprints.backtester import Backtester, candles_from_klines, DEFAULT_PARAMETERS, FOUR_HOURS
+
+
+def load_candles(kline_store, symbol, days, download=True):
+    """
+    Loads the 30m, 1h and 4h candles of an asset from the kline store.
+
+    :param kline_store: (object) The kline store.
+    :param symbol: (str) The symbol of the asset.
+    :param days: (int) The number of days to test.
+    :param download: (bool) Downloads the missing candles first when True.
+    :return: (dict) Candles per interval as NumPy columns.
+    """
+
+    # The 4h EMA's need history before the first day that is tested.
+    start_time = round(time.time() * 1000) - days * 86_400_000 - DEFAULT_PARAMETERS["market_slow"] * FOUR_HOURS
+
+    candles = {}
+    for interval in ("30m", "1h", "4h"):
+        if download:
+            kline_store.download(symbol=symbol, interval=interval, start_time=start_time)
+        klines = [kline for kline in kline_store.load(symbol=symbol, interval=interval) if kline[0] >= start_time]
+        candles[interval] = candles_from_klines(klines)
+    return candles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the Golden Cross strategy over stored candles.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to test. Default is every crypto in config.")
+    parser.add_argument("--days", type=int, default=365, help="Number of days to test.")
+    parser.add_argument("--offline", action="store_true", help="Only use candles that are already stored.")
+    args = parser.parse_args()
+
+    symbols = args.symbols or [crypto + config.FIAT_MARKET for crypto in config.CRYPTOS]
+    kline_store = KlineStore()
+
+    for symbol in symbols:
+        candles = load_candles(kline_store=kline_store, symbol=symbol, days=args.days, download=not args.offline)
+
+        tic = time.perf_counter()
+        result = Backtester(candles=candles).run()
+        duration = time.perf_counter() - tic
+
+        format_border(f"BACKTEST {symbol.upper()}")
+        print(f"\nTrades: {result['number_of_trades']}")
+        print(f"Total return: {result['total_return']:.2%}")
+        print(f"Win rate: {result['win_rate']:.2%}")
+        print(f"Max drawdown: {result['max_drawdown']:.2%}")
+        print(f"Elapsed time: {duration:0.4f} seconds.\n")
+
+
+if __name__ == "__main__":
+    main()
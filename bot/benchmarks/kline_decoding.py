@@ -0,0 +1,77 @@
+"""
+Compares decoding a klines response of 1000 candles with response.json() to the kline decoder.
+
+Run from the bot folder: python -m benchmarks.kline_decoding
+"""
+import argparse
+import json
+import random
+import timeit
+import numpy as np
+from class_blueprints import kline_decoder
+from class_blueprints.kline_decoder import decode_klines
+
+
+def create_response(candles, seed=1):
+    generator = random.Random(seed)
+    price = 20000.0
+    klines = []
+
+    for i in range(candles):
+        open_time = 1_600_000_000_000 + i * 1_800_000
+        price *= 1 + generator.gauss(0, 0.01)
+        klines.append([open_time, f"{price:.8f}", f"{price * 1.01:.8f}", f"{price * 0.99:.8f}", f"{price:.8f}",
+                       f"{generator.random() * 100:.8f}", open_time + 1_799_999, f"{generator.random() * 1e6:.8f}",
+                       generator.randint(100, 1000), f"{generator.random() * 50:.8f}",
+                       f"{generator.random() * 1e6:.8f}", "0"])
+    return json.dumps(klines, separators=(",", ":")).encode()
+
+
+def json_path(content):
+    """The old path: response.json() and converting the prices when they are stored"""
+    return [[kline[0], float(kline[1]), float(kline[2]), float(kline[3]), float(kline[4]), float(kline[5]), kline[6]]
+            for kline in json.loads(content)]
+
+
+def stdlib_path(content):
+    kline_decoder.loads = json.loads
+    return decode_klines(content)
+
+
+def orjson_path(content):
+    kline_decoder.loads = kline_decoder.orjson.loads
+    return decode_klines(content)
+
+
+def measure(function, content, number):
+    return min(timeit.repeat(lambda: function(content), number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of decoding klines responses.")
+    parser.add_argument("--candles", type=int, default=1000, help="Candles per response.")
+    parser.add_argument("--number", type=int, default=50, help="Decodes per measurement.")
+    arguments = parser.parse_args()
+
+    content = create_response(candles=arguments.candles)
+    paths = [("response.json() + float()", json_path), ("decode_klines (json)", stdlib_path)]
+    if kline_decoder.orjson is not None:
+        paths += [("decode_klines (orjson)", orjson_path)]
+
+    expected = np.array(json_path(content), dtype=np.float64)
+    baseline = None
+    print(f"{arguments.candles} candles, {len(content)} bytes")
+
+    for name, function in paths:
+        result = function(content)
+        assert np.array_equal(np.array(result, dtype=np.float64)[:, :7], expected)
+
+        seconds = measure(function, content, number=arguments.number)
+        baseline = baseline or seconds
+        print(f"{name:<32}{seconds * 1e6:>10.0f} us{baseline / seconds:>8.1f}x")
+
+    kline_decoder.loads = json.loads if kline_decoder.orjson is None else kline_decoder.orjson.loads
+
+
+if __name__ == "__main__":
+    main()
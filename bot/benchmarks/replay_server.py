@@ -0,0 +1,281 @@
+"""
+Local stand-in for the Binance REST endpoints that the bot uses. It replays a recording of klines, ticker, account
+and exchange info responses, and fills every order right away.
+"""
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+
+INTERVALS_MS = {"30m": 1_800_000, "1h": 3_600_000, "4h": 14_400_000}
+
+
+class Recording:
+
+    def __init__(self, klines, account, exchange_info):
+        """
+        The responses that are replayed.
+
+        :param klines: (dict) Per (SYMBOL, interval) a 2D array with the columns open time, open, high, low, close
+        and volume.
+        :param account: (dict) The response of /api/v3/account.
+        :param exchange_info: (dict) Per SYMBOL the symbol info of /api/v3/exchangeInfo.
+        """
+
+        self._klines = klines
+        self._account = account
+        self._exchange_info = exchange_info
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def account(self):
+        return self._account
+
+    @property
+    def symbols(self):
+        return list(self._exchange_info)
+
+    # ----- CLASS METHODS ----- #
+
+    @classmethod
+    def create(cls, symbols, fiat="eur", candles=2000, intervals=tuple(INTERVALS_MS), funded=0.5, end_time=None,
+               seed=1):
+        """
+        Creates a synthetic recording with random walks that end at end_time.
+
+        :param symbols: (list) The cryptos ie. ["btc", "eth"].
+        :param fiat: (str) The fiat market.
+        :param candles: (int) The number of candles per interval.
+        :param intervals: (tuple) The intervals that are recorded.
+        :param funded: (float) Part of the cryptos that have a balance in the account.
+        :param end_time: (int) Time in ms of the last candle. Default is now.
+        :param seed: (int) Seed of the random walks.
+        """
+
+        end_time = end_time or int(time.time() * 1000)
+        generator = np.random.default_rng(seed)
+        klines, balances, exchange_info = {}, [{"asset": fiat.upper(), "free": "10000.00000000", "locked": "0"}], {}
+
+        for position, crypto in enumerate(symbols):
+            symbol = f"{crypto}{fiat}".upper()
+            start_price = 10 ** generator.uniform(0, 4)
+
+            for interval in intervals:
+                length = INTERVALS_MS[interval]
+                last_open_time = end_time - end_time % length
+                open_times = last_open_time - length * np.arange(candles - 1, -1, -1, dtype=np.int64)
+                closes = start_price * np.exp(np.cumsum(generator.normal(0, 0.01, candles)))
+                opens = np.concatenate(([start_price], closes[:-1]))
+                spread = np.abs(generator.normal(0, 0.003, candles))
+                klines[(symbol, interval)] = np.column_stack((
+                    open_times, opens, np.maximum(opens, closes) * (1 + spread),
+                    np.minimum(opens, closes) * (1 - spread), closes, generator.uniform(1, 100, candles)))
+
+            balance = 1000 / start_price if position < len(symbols) * funded else 0
+            balances.append({"asset": crypto.upper(), "free": f"{balance:.8f}", "locked": "0"})
+            exchange_info[symbol] = {"symbol": symbol, "filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.00010000"},
+                {"filterType": "LOT_SIZE", "stepSize": "0.00001000"},
+            ]}
+
+        return cls(klines=klines, account={"balances": balances}, exchange_info=exchange_info)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a recording that was saved with save.
+
+        :param path: (str) The path of the JSON file.
+        """
+
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        klines = {(symbol, interval): np.array(rows, dtype=np.float64)
+                  for symbol, intervals in data["klines"].items() for interval, rows in intervals.items()}
+        return cls(klines=klines, account=data["account"], exchange_info=data["exchange_info"])
+
+    def save(self, path):
+        klines = {}
+        for (symbol, interval), rows in self._klines.items():
+            klines.setdefault(symbol, {})[interval] = rows.tolist()
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"klines": klines, "account": self._account, "exchange_info": self._exchange_info}, file)
+
+    def get_klines(self, symbol, interval, limit=500, start_time=None):
+        rows = self._klines[(symbol, interval)]
+
+        if start_time is None:
+            selected = rows[-limit:]
+        else:
+            first = np.searchsorted(rows[:, 0], start_time)
+            selected = rows[first:first + limit]
+
+        length = INTERVALS_MS[interval]
+        return "[" + ",".join(
+            f'[{int(row[0])},"{row[1]:.8f}","{row[2]:.8f}","{row[3]:.8f}","{row[4]:.8f}","{row[5]:.8f}",'
+            f'{int(row[0]) + length - 1},"0",0,"0","0","0"]' for row in selected) + "]"
+
+    def get_price(self, symbol):
+        return float(self._klines[(symbol, "30m")][-1, 4])
+
+    def get_exchange_info(self, symbols):
+        return {"symbols": [self._exchange_info[symbol] for symbol in symbols]}
+
+
+class ReplayServer:
+
+    def __init__(self, recording, host="127.0.0.1", port=0):
+        """
+        Serves a recording over HTTP in a background thread and counts the requests per endpoint.
+
+        :param recording: (object) The Recording that is replayed.
+        :param host: (str) The address to listen on.
+        :param port: (int) The port to listen on. Default is a free port.
+        """
+
+        self._recording = recording
+        self.__counts = {}
+        self.__orders = {}
+        self.__order_ids = itertools.count(1)
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer((host, port), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def url(self):
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def counts(self):
+        with self.__lock:
+            return dict(self.__counts)
+
+    # ----- CLASS METHODS ----- #
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="replay-server", daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def reset_counts(self):
+        with self.__lock:
+            self.__counts = {}
+
+    def handle(self, method, path, params):
+        """
+        Returns the status code and body of a request.
+
+        :param method: (str) The HTTP method.
+        :param path: (str) The path of the endpoint.
+        :param params: (dict) The query parameters.
+        :return: (tuple) The status code and the body as a string.
+        """
+
+        with self.__lock:
+            self.__counts[f"{method} {path}"] = self.__counts.get(f"{method} {path}", 0) + 1
+
+        recording = self._recording
+
+        if path == "/api/v3/klines":
+            start_time = int(params["startTime"]) if "startTime" in params else None
+            return 200, recording.get_klines(symbol=params["symbol"], interval=params["interval"],
+                                             limit=int(params.get("limit", 500)), start_time=start_time)
+
+        if path == "/api/v3/ticker/price":
+            symbols = json.loads(params["symbols"]) if "symbols" in params else [params["symbol"]]
+            tickers = [{"symbol": symbol, "price": f"{recording.get_price(symbol):.8f}"} for symbol in symbols]
+            return 200, json.dumps(tickers if "symbols" in params else tickers[0])
+
+        if path == "/api/v3/exchangeInfo":
+            symbols = json.loads(params["symbols"]) if "symbols" in params else [params["symbol"]]
+            return 200, json.dumps(recording.get_exchange_info(symbols=symbols))
+
+        if path == "/api/v3/account":
+            return 200, json.dumps(recording.account)
+
+        if path == "/api/v3/order":
+            return self.__handle_order(method=method, params=params)
+
+        if path in ("/api/v3/openOrders", "/api/v3/userDataStream"):
+            return 200, json.dumps({"listenKey": "replay"} if method == "POST" else {})
+
+        return 404, json.dumps({"code": -1, "msg": f"Unknown endpoint {path}"})
+
+    def __handle_order(self, method, params):
+        if method == "POST":
+            order = {
+                "symbol": params["symbol"],
+                "orderId": next(self.__order_ids),
+                "clientOrderId": params.get("newClientOrderId", ""),
+                "price": params.get("price", "0"),
+                "origQty": params["quantity"],
+                "executedQty": params["quantity"],
+                "cummulativeQuoteQty": f"{float(params.get('price', 0)) * float(params['quantity']):.8f}",
+                "status": "FILLED",
+                "updateTime": int(time.time() * 1000),
+                "type": params["type"],
+                "side": params["side"],
+            }
+            with self.__lock:
+                self.__orders[order["orderId"]] = order
+                self.__orders[order["clientOrderId"]] = order
+            return 200, json.dumps(order)
+
+        with self.__lock:
+            order = self.__orders.get(int(params["orderId"]) if "orderId" in params else
+                                      params.get("origClientOrderId"))
+
+        if order is None:
+            return 400, json.dumps({"code": -2013, "msg": "Order does not exist."})
+        return 200, json.dumps(order if method == "GET" else dict(order, status="CANCELED"))
+
+    def __create_handler(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def __respond(self, method):
+                url = urlsplit(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, body = server.handle(method=method, path=url.path, params=params)
+
+                body = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self.__respond("GET")
+
+            def do_POST(self):
+                self.__respond("POST")
+
+            def do_PUT(self):
+                self.__respond("PUT")
+
+            def do_DELETE(self):
+                self.__respond("DELETE")
+
+            def log_message(self, *args):
+                pass
+
+        return ReplayHandler
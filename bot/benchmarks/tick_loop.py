@@ -0,0 +1,243 @@
+"""
+Times full ticks of the TraderBot against the replay server for a number of symbols. Every symbol count runs in its
+own process with its own database, so the results don't influence each other.
+
+Run from the bot folder: python -m benchmarks.tick_loop --symbols 1 10 100 500 --save baseline.json
+Compare with a baseline: python -m benchmarks.tick_loop --compare baseline.json
+Time the ShardedTraderBot with 4 worker processes: python -m benchmarks.tick_loop --symbols 100 500 --shards 4
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from contextlib import redirect_stdout
+from benchmarks.replay_server import Recording, ReplayServer
+
+KINDS = ("signal", "stop_loss")
+
+
+def create_config(url, db_path, cryptos):
+    """The settings of the bot, pointed at the replay server"""
+    config = types.ModuleType("config")
+    config.API_URL = url
+    config.header = {"X-MBX-APIKEY": "replay"}
+    config.apiKey = "replay"
+    config.apiSecret = "replay"
+    config.command = ""
+    config.db_path = db_path
+    config.FIAT_MARKET = "eur"
+    config.CRYPTOS = {crypto: crypto for crypto in cryptos}
+    config.USER = "benchmark"
+    config.BOT_NAME = "benchmark"
+    config.WEIGHT_LIMIT = 10 ** 9
+    config.MARKET_STREAM = False
+    config.USER_DATA_STREAM = False
+    return config
+
+
+def measure_tick(bot, server, check_signal, clock, pause=0.0, trace=False):
+    # The ticks of the bot are a minute apart, so the base candles of every symbol are downloaded again. The workers
+    # of the shards keep their candles for a second of real time.
+    clock.advance(60)
+    time.sleep(pause)
+    server.reset_counts()
+    if trace:
+        tracemalloc.start()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        bot.tick(check_signal=check_signal)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return wall, cpu, peak, server.counts
+
+
+def run_symbols(symbols, repeat, shards=None):
+    """
+    Sets up the bot like main.py does and times its ticks.
+
+    :param symbols: (int) The number of symbols to trade.
+    :param repeat: (int) The number of measured ticks per kind.
+    :param shards: (int) The number of worker processes of the ShardedTraderBot. Default is the TraderBot.
+    :return: (dict) The results.
+    """
+
+    cryptos = [f"c{i}" for i in range(symbols)]
+    # The 1000 4h candles of the strategies are resampled from 8000 30m candles, the only interval that's downloaded.
+    recording = Recording.create(symbols=cryptos, candles=8000, intervals=("30m",))
+    server = ReplayServer(recording=recording).start()
+    directory = tempfile.mkdtemp(prefix="tick-benchmark-")
+    config = create_config(url=server.url, db_path=os.path.join(directory, "trades.db"), cryptos=cryptos)
+    sys.modules["config"] = config
+
+    # The workers of the shards import the config again, so it's also written to a file they can find.
+    with open(os.path.join(directory, "config.py"), "w", encoding="utf-8") as file:
+        file.write("".join(f"{name} = {value!r}\n" for name, value in vars(config).items()
+                           if not name.startswith("__")))
+    sys.path.insert(0, directory)
+
+    from database import Base, get_engine
+    from class_blueprints.clock import SimulatedClock
+    from class_blueprints.crypto import Crypto
+    from class_blueprints.portfolio import Portfolio
+    from class_blueprints.kline_store import KlineStore
+    from class_blueprints.prices import PriceSnapshot
+    from class_blueprints.stop_loss import book as stop_loss_book
+    from class_blueprints.strategies import Strategy
+    from class_blueprints.timeframes import MultiTimeframeStore
+    from trader_bot import TraderBot
+    from sharded_bot import ShardedTraderBot
+
+    Base.metadata.create_all(get_engine())
+    clock = SimulatedClock(start=time.time())
+    server.reset_counts()
+    start = time.perf_counter()
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        portfolio = Portfolio(owner="benchmark", fiat="eur",
+                              cryptos=[Crypto(crypto=crypto, fiat="eur", name=crypto) for crypto in cryptos])
+        kline_store = MultiTimeframeStore(kline_store=KlineStore(), base_interval="30m", clock=clock)
+        prices = PriceSnapshot(symbols=portfolio.crypto_balances.keys())
+        prices.refresh()
+        stop_loss_book.load()
+        strategies = [Strategy(symbol=symbol, name="Golden Cross", crypto=crypto,
+                               kline_store=None if shards else kline_store, prices=prices)
+                      for symbol, crypto in portfolio.crypto_balances.items()]
+
+        if shards:
+            bot = ShardedTraderBot(name="benchmark", strategies=strategies, portfolio=portfolio, prices=prices,
+                                   shards=shards)
+            bot.start_workers()
+        else:
+            bot = TraderBot(name="benchmark", strategies=strategies, portfolio=portfolio, prices=prices)
+
+    bootstrap = time.perf_counter() - start
+    bootstrap_requests = sum(server.counts.values())
+
+    # The strategies download the history of the base interval when they are made, the other intervals are resampled
+    # from it. The first signal tick downloads the rest.
+    pause = 1.0 if shards else 0.0
+    *_, first_tick = measure_tick(bot=bot, server=server, check_signal=True, clock=clock)
+
+    results = {"symbols": symbols, "shards": shards, "bootstrap_seconds": bootstrap,
+               "cold_start_requests": bootstrap_requests + sum(first_tick.values()), "ticks": {}}
+    for kind in KINDS:
+        check_signal = kind == "signal"
+        samples = [measure_tick(bot=bot, server=server, check_signal=check_signal, clock=clock, pause=pause)
+                   for _ in range(repeat)]
+        *_, peak, _ = measure_tick(bot=bot, server=server, check_signal=check_signal, clock=clock, pause=pause,
+                                   trace=True)
+        requests = samples[-1][3]
+
+        results["ticks"][kind] = {
+            "wall_p50": statistics.median(sample[0] for sample in samples),
+            "wall_max": max(sample[0] for sample in samples),
+            "cpu_mean": statistics.mean(sample[1] for sample in samples),
+            "peak_allocated_bytes": peak,
+            "requests": sum(requests.values()),
+            "requests_by_endpoint": requests,
+        }
+
+    if shards:
+        bot.stop_workers()
+    server.stop()
+    return results
+
+
+def run(symbol_counts, repeat, shards=None):
+    results = []
+    options = ["--shards", str(shards)] if shards else []
+
+    for symbols in symbol_counts:
+        process = subprocess.run([sys.executable, "-m", "benchmarks.tick_loop", "--child", str(symbols),
+                                  "--repeat", str(repeat), *options], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        if process.returncode:
+            sys.exit(f"The benchmark with {symbols} symbols failed:\n{process.stderr}")
+        results.append(json.loads(process.stdout.splitlines()[-1]))
+    return results
+
+
+def print_results(results, baseline=None, threshold=0.2):
+    """
+    Prints the results, and the change of the wall time compared to a baseline with the same number of shards.
+
+    :return: (bool) True when a tick got slower than the threshold allows.
+    """
+
+    previous = {(result["symbols"], result.get("shards"), kind): result["ticks"][kind]
+                for result in (baseline or {}).get("results", []) for kind in KINDS}
+    regression = False
+
+    print(f"{'symbols':>8}{'shards':>8}{'tick':>11}{'wall p50':>12}{'wall max':>12}{'cpu':>10}{'peak alloc':>13}"
+          f"{'requests':>10}{'change':>10}")
+
+    for result in results:
+        for kind in KINDS:
+            tick = result["ticks"][kind]
+            key = (result["symbols"], result.get("shards"), kind)
+            change = ""
+
+            if key in previous:
+                ratio = tick["wall_p50"] / previous[key]["wall_p50"] - 1
+                change = f"{ratio:+.0%}"
+                if ratio > threshold:
+                    change += " !"
+                    regression = True
+
+            print(f"{result['symbols']:>8}{result.get('shards') or '-':>8}{kind:>11}"
+                  f"{tick['wall_p50'] * 1000:>10.1f}ms{tick['wall_max'] * 1000:>10.1f}ms"
+                  f"{tick['cpu_mean'] * 1000:>8.1f}ms{tick['peak_allocated_bytes'] / 1e6:>11.1f}MB"
+                  f"{tick['requests']:>10}{change:>10}")
+
+    for result in results:
+        print(f"{result['symbols']} symbols: {result['cold_start_requests']} requests to start on an empty database.")
+
+    return regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the tick loop against a replay of the Binance API.")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10, 100, 500], help="Symbol counts to run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured ticks per kind.")
+    parser.add_argument("--save", help="Saves the results as a JSON baseline.")
+    parser.add_argument("--compare", help="Compares the results with a JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown compared to the baseline.")
+    parser.add_argument("--shards", type=int, help="Runs the ShardedTraderBot with this number of worker processes.")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child is not None:
+        print(json.dumps(run_symbols(symbols=arguments.child, repeat=arguments.repeat, shards=arguments.shards)))
+        return
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = run(symbol_counts=arguments.symbols, repeat=arguments.repeat, shards=arguments.shards)
+    regression = print_results(results=results, baseline=baseline, threshold=arguments.threshold)
+
+    if arguments.save:
+        with open(arguments.save, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "time": time.time(),
+                       "results": results}, file, indent=2)
+
+    if regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
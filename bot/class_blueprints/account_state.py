@@ -0,0 +1,165 @@
+import threading
+import time
+
+
+class AccountState:
+
+    def __init__(self, fiat, fetch, resync_interval=3600, fee=0.001, tolerance=0.01, clock=None):
+        """
+        Keeps the free and locked balance of every asset of the account, so the portfolio doesn't have to ask the
+        Binance API for all balances after every order. The balances are changed by the filled orders and by the
+        balance updates of the user data stream. All balances are only downloaded again on a timer, or when the
+        balances have drifted from the ones the exchange reports.
+
+        :param fiat: (str) The fiat of the symbols ie. "eur", the quote asset of every order.
+        :param fetch: (function) Returns the response of the Account Information endpoint of the Binance API.
+        :param resync_interval: (float) Seconds after which all balances are downloaded again.
+        :param fee: (float) The fee per trade that is paid in the asset that is received. The actual fee isn't in
+        the receipt, an estimate that is too high only leaves some dust until the next resync.
+        :param tolerance: (float) Relative difference between a reported balance and the balance that was
+        calculated from the fills, above which all balances are downloaded again.
+        :param clock: (Clock) The clock that tells when a resync is due. Default is real time.
+        """
+
+        self._fiat = fiat.lower()
+        self._fetch = fetch
+        self._resync_interval = resync_interval
+        self._fee = fee
+        self._tolerance = tolerance
+        self._monotonic = clock.monotonic if clock is not None else time.monotonic
+        self.__balances = {}
+        self.__updated_at = {}
+        self.__estimated = set()
+        self.__synced_at = None
+        self.__stale = True
+        self.__lock = threading.Lock()
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def stale(self):
+        return self.__stale
+
+    # ----- CLASS METHODS ----- #
+
+    def get_balance(self, asset):
+        """
+        :param asset: (str) The asset ie. "btc".
+        :return: (float) The free balance of the asset, 0 when the account doesn't hold it. The balance that is
+        locked in open orders can't be traded.
+        """
+
+        return self.__balances.get(asset.lower(), (0.0, 0.0))[0]
+
+    def refresh(self):
+        """
+        Downloads all balances when the resync interval has passed or the balances have drifted.
+
+        :return: (bool) True when the balances were downloaded.
+        """
+
+        if not self.__stale and self._monotonic() - self.__synced_at < self._resync_interval:
+            return False
+
+        self.resync()
+        return True
+
+    def resync(self):
+        """
+        Replaces all balances with the ones of the Account Information endpoint.
+        """
+
+        data = self._fetch()
+        updated_at = int(data.get("updateTime", 0))
+        balances = {balance["asset"].lower(): [float(balance["free"]), float(balance["locked"])]
+                    for balance in data["balances"]}
+
+        with self.__lock:
+            self.__balances = balances
+            self.__updated_at = dict.fromkeys(balances, updated_at)
+            self.__estimated.clear()
+            self.__synced_at = self._monotonic()
+            self.__stale = False
+
+    def apply_fill(self, receipt):
+        """
+        Changes the balances of both assets of a final order by the executed quantity. The amount the order locked
+        when it was placed is released, the part that was spent is taken from it. A fill that happened before the
+        last balances that were reported for an asset is already in them and is skipped.
+
+        :param receipt: (dict) The receipt of the order as given by the Binance API, or the one the order tracker
+        made from an execution report.
+        """
+
+        quantity = float(receipt.get("executedQty", 0))
+        if quantity <= 0:
+            return
+
+        # Only the time of the exchange can be compared with the time of the balance updates.
+        transaction_time = receipt.get("updateTime") or receipt.get("transactTime")
+        if transaction_time is None:
+            print("The receipt of the order has no time. Downloading the balances again.")
+            self.__stale = True
+            return
+
+        transaction_time = int(transaction_time)
+        quote_quantity = float(receipt["cummulativeQuoteQty"])
+        crypto = receipt["symbol"].lower()[:-len(self._fiat)]
+
+        if receipt["side"].upper() == "BUY":
+            order_lock = float(receipt["price"]) * float(receipt["origQty"])
+            spent_asset, spent = self._fiat, quote_quantity
+            received_asset, received = crypto, quantity * (1 - self._fee)
+        else:
+            order_lock = float(receipt["origQty"])
+            spent_asset, spent = crypto, quantity
+            received_asset, received = self._fiat, quote_quantity * (1 - self._fee)
+
+        with self.__lock:
+            if transaction_time > self.__updated_at.get(spent_asset, -1):
+                balance = self.__balances.setdefault(spent_asset, [0.0, 0.0])
+
+                # The lock is only in the balances when its placement was reported, otherwise it's still free.
+                released = min(balance[1], order_lock)
+                free = balance[0] + released - spent
+                balance[0], balance[1] = max(free, 0.0), balance[1] - released
+                self.__mark_estimated(asset=spent_asset, transaction_time=transaction_time)
+
+                # More was spent than the account held, so the balances are off.
+                if free < -1e-8:
+                    self.__stale = True
+
+            if transaction_time > self.__updated_at.get(received_asset, -1):
+                self.__balances.setdefault(received_asset, [0.0, 0.0])[0] += received
+                self.__mark_estimated(asset=received_asset, transaction_time=transaction_time)
+
+    def apply_balances(self, event):
+        """
+        Replaces the balances of the assets in an account update of the user data stream, ie. after an order was
+        placed or filled. When the total of such a balance differs from the one that was calculated from the
+        fills, the other calculated balances can't be trusted either and all balances are downloaded at the next
+        refresh.
+
+        :param event: (dict) The outboundAccountPosition event.
+        """
+
+        updated_at = int(event["u"])
+
+        with self.__lock:
+            for balance in event["B"]:
+                asset, free, locked = balance["a"].lower(), float(balance["f"]), float(balance["l"])
+                if updated_at < self.__updated_at.get(asset, -1):
+                    continue
+
+                if asset in self.__estimated:
+                    calculated = sum(self.__balances.get(asset, (0.0, 0.0)))
+                    if abs(free + locked - calculated) > self._tolerance * max(free + locked, calculated):
+                        self.__stale = True
+                    self.__estimated.discard(asset)
+
+                self.__balances[asset] = [free, locked]
+                self.__updated_at[asset] = updated_at
+
+    def __mark_estimated(self, asset, transaction_time):
+        self.__updated_at[asset] = transaction_time
+        self.__estimated.add(asset)
@@ -0,0 +1,309 @@
+import numpy as np
+
+HALF_HOUR = 1_800_000
+HOUR = 3_600_000
+FOUR_HOURS = 14_400_000
+
+DEFAULT_PARAMETERS = {
+    "market_fast": 50,
+    "market_slow": 200,
+    "bull_fast": 8,
+    "bull_slow": 21,
+    "rsi_length": 14,
+    "rsi_candles": 50,
+    "rsi_buy": 30,
+    "rsi_sell": 40,
+    "bull_trail_ratio": 0.95,
+    "bear_trail_ratio": 0.95,
+    "buy_markup": 1.001,
+    "sell_markdown": 0.999,
+    "fee": 0.001,
+}
+
+
+def candles_from_klines(klines):
+    """
+    Turns klines from the Binance API or the kline store into NumPy columns.
+
+    :param klines: (list) Klines as lists that start with open time, open, high, low and close.
+    :return: (dict) Arrays for "open_time", "open", "high", "low" and "close".
+    """
+
+    columns = list(zip(*klines))
+    candles = {"open_time": np.array(columns[0], dtype=np.int64)}
+    for position, name in enumerate(("open", "high", "low", "close"), start=1):
+        candles[name] = np.array(columns[position], dtype=np.float64)
+    return candles
+
+
+def exponential_moving_average(values, window):
+    """
+    Calculates the EMA of a whole series at once, equal to pandas' ewm(span=window, adjust=False).
+
+    The recursion y = decay * y + alpha * x is written out as decay ** t * (y0 + alpha * cumsum(x / decay ** s)).
+    The series is handled in blocks so decay ** -s stays far away from overflowing.
+
+    :param values: (array) The prices.
+    :param window: (int) The length of the EMA.
+    :return: (array) The EMA for every price.
+    """
+
+    alpha = 2 / (window + 1)
+    decay = 1 - alpha
+    block = max(1, int(100 / -np.log10(decay)))
+    ema = np.empty(len(values), dtype=np.float64)
+    last = values[0] if len(values) else 0.0
+
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        ema[start:start + block] = powers * (last + alpha * np.cumsum(chunk / powers))
+        last = ema[start + len(chunk) - 1]
+    return ema
+
+
+def peek_exponential_moving_average(ema, price, window):
+    """
+    Returns the EMA including an open candle, like the live bot sees it.
+
+    :param ema: (array) The EMA over the closed candles.
+    :param price: (array) The price of the open candle.
+    :param window: (int) The length of the EMA.
+    :return: (array) The EMA including the open candle.
+    """
+
+    alpha = 2 / (window + 1)
+    return (1 - alpha) * ema + alpha * price
+
+
+def peek_relative_strength_index(closes, last_closed, price, length, candles):
+    """
+    Returns the RSI over a frame of closed candles plus the open candle, equal to pandas_ta.rsi over the frame
+    that the live bot downloads.
+
+    :param closes: (array) Close prices of the closed candles.
+    :param last_closed: (array) Index of the last closed candle for every decision.
+    :param price: (array) Price of the open candle for every decision.
+    :param length: (int) The length of the RSI.
+    :param candles: (int) The number of candles in the frame, including the open candle.
+    :return: (array) The RSI for every decision. NaN when there isn't enough data.
+    """
+
+    decay = 1 - 1 / length
+    changes = np.diff(closes)
+    gains = np.maximum(changes, 0.0)
+    losses = np.maximum(-changes, 0.0)
+
+    # Weighted sums of the closed changes in the frame, the newest change has weight 1.
+    weights = decay ** np.arange(candles - 2)
+    gain_sums = np.convolve(gains, weights)[:len(gains)]
+    loss_sums = np.convolve(losses, weights)[:len(losses)]
+
+    valid = last_closed >= candles - 2
+    index = np.clip(last_closed, 1, len(closes) - 1)
+    change = price - closes[index]
+    avg_gain = np.maximum(change, 0.0) + decay * gain_sums[index - 1]
+    avg_loss = np.maximum(-change, 0.0) + decay * loss_sums[index - 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 * avg_gain / (avg_gain + avg_loss)
+    rsi[~valid] = np.nan
+    return rsi
+
+
+def get_last_closed(open_times, interval, decision_times):
+    """
+    Returns for every decision time the index of the last candle that was closed at that time.
+
+    :param open_times: (array) Open times of the candles in ms.
+    :param interval: (int) Length of the candles in ms.
+    :param decision_times: (array) Times in ms at which the bot makes a decision.
+    :return: (array) Indexes of the last closed candles, -1 when no candle was closed yet.
+    """
+
+    return np.searchsorted(open_times + interval, decision_times, side="right") - 1
+
+
+class Backtester:
+
+    def __init__(self, candles, parameters=None):
+        """
+        Runs the Golden Cross strategy over history. Every 30 minutes the bot checks for a signal, in between the
+        trailing stop loss is checked against the highs and lows of the 30m candles.
+
+        :param candles: (dict) Candles per interval ("30m", "1h" and "4h") as returned by candles_from_klines.
+        :param parameters: (dict) Parameters that replace the DEFAULT_PARAMETERS.
+        """
+
+        self._candles = candles
+        self._parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+        self._signals = None
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def parameters(self):
+        return self._parameters
+
+    @property
+    def signals(self):
+        if self._signals is None:
+            self._signals = self.get_signals()
+        return self._signals
+
+    # ----- CLASS METHODS ----- #
+
+    def get_signals(self):
+        """
+        Calculates the market state and the signals for every 30 minute decision at once.
+
+        :return: (dict) Arrays with the decision time, price, market state (1 bull, -1 bear, 0 undecided) and the
+        buy and sell signals.
+        """
+
+        p = self._parameters
+        half_hour, hour, four_hours = self._candles["30m"], self._candles["1h"], self._candles["4h"]
+
+        decision_times = half_hour["open_time"] + HALF_HOUR
+        price = half_hour["close"]
+
+        # Market state from the 4h EMA's including the open 4h candle.
+        last_4h = get_last_closed(four_hours["open_time"], FOUR_HOURS, decision_times)
+        index_4h = np.maximum(last_4h, 0)
+        market_fast = peek_exponential_moving_average(
+            exponential_moving_average(four_hours["close"], p["market_fast"])[index_4h], price, p["market_fast"])
+        market_slow = peek_exponential_moving_average(
+            exponential_moving_average(four_hours["close"], p["market_slow"])[index_4h], price, p["market_slow"])
+
+        market_state = np.sign(market_fast - market_slow).astype(np.int8)
+        market_state[last_4h + 1 < p["market_slow"]] = 0
+
+        # Bull scenario: crossing 30m EMA's including the open 30m candle.
+        bull_fast = peek_exponential_moving_average(
+            exponential_moving_average(price, p["bull_fast"]), price, p["bull_fast"])
+        bull_slow = peek_exponential_moving_average(
+            exponential_moving_average(price, p["bull_slow"]), price, p["bull_slow"])
+
+        # Bear scenario: RSI over the 1h frame including the open 1h candle.
+        last_1h = get_last_closed(hour["open_time"], HOUR, decision_times)
+        rsi = peek_relative_strength_index(hour["close"], last_1h, price, p["rsi_length"], p["rsi_candles"])
+
+        bull = market_state == 1
+        bear = market_state == -1
+        return {
+            "time": decision_times,
+            "price": price,
+            "market_state": market_state,
+            "buy": (bull & (bull_fast > bull_slow)) | (bear & (rsi <= p["rsi_buy"])),
+            "bull_sell": bull & (bull_fast < bull_slow),
+            "bear_sell": bear & (rsi >= p["rsi_sell"]),
+        }
+
+    def run(self):
+        """
+        Simulates the trades of the strategy. Only the stretches between a buy and its sell are walked through,
+        the rest is skipped with the precalculated signals.
+
+        :return: (dict) The trades and a summary of the results.
+        """
+
+        buys = np.flatnonzero(self.signals["buy"])
+        trades = []
+        start = 0
+
+        while True:
+            position = np.searchsorted(buys, start)
+            if position == len(buys):
+                break
+
+            trade = self._simulate_trade(entry=buys[position])
+            if trade is None:
+                break
+
+            trades.append(trade)
+
+            # After a stop loss the signal check at the end of the same candle can buy again.
+            start = trade["exit_index"] if trade["reason"] == "stop loss" else trade["exit_index"] + 1
+
+        return self._summarise(trades=trades, fee=self._parameters["fee"])
+
+    def _simulate_trade(self, entry):
+        """
+        Walks from a buy to the first sell signal or triggered stop loss.
+
+        :param entry: (int) Index of the 30m candle at the end of which the buy signal was given.
+        :return: (dict) The trade, or None when the trade is still open at the end of the data.
+        """
+
+        p = self._parameters
+        signals = self.signals
+        half_hour = self._candles["30m"]
+        total = len(half_hour["close"])
+
+        buy_price = signals["price"][entry] * p["buy_markup"]
+        if signals["market_state"][entry] == 1:
+            trail_ratio = p["bull_trail_ratio"]
+        else:
+            trail_ratio = p["bear_trail_ratio"]
+
+        highest = buy_price
+        start = entry + 1
+        size = 256
+
+        while start < total:
+            end = min(start + size, total)
+            highs = half_hour["high"][start:end]
+
+            # The trail during a candle is based on the highest price of the candles before it.
+            highest_before = np.maximum.accumulate(np.concatenate(([highest], highs[:-1])))
+            level = np.minimum(highest_before * trail_ratio, buy_price)
+            stops = np.flatnonzero(half_hour["low"][start:end] < level)
+
+            sells = (signals["bull_sell"][start:end] & (signals["price"][start:end] > buy_price)) \
+                | signals["bear_sell"][start:end]
+            sells = np.flatnonzero(sells)
+
+            stop = stops[0] if len(stops) else None
+            sell = sells[0] if len(sells) else None
+
+            if stop is not None and (sell is None or stop <= sell):
+                exit_index = start + stop
+                exit_price = min(half_hour["open"][exit_index], level[stop]) * p["sell_markdown"]
+                return self._create_trade(entry, exit_index, buy_price, exit_price, "stop loss")
+
+            if sell is not None:
+                exit_index = start + sell
+                exit_price = signals["price"][exit_index] * p["sell_markdown"]
+                return self._create_trade(entry, exit_index, buy_price, exit_price, "signal")
+
+            highest = max(highest, highs.max())
+            start = end
+            size *= 2
+
+    def _create_trade(self, entry, exit_index, buy_price, exit_price, reason):
+        signals = self.signals
+        return {
+            "entry_index": int(entry),
+            "exit_index": int(exit_index),
+            "entry_time": int(signals["time"][entry]),
+            "exit_time": int(self._candles["30m"]["open_time"][exit_index] + HALF_HOUR),
+            "market_state": "bull" if signals["market_state"][entry] == 1 else "bear",
+            "buy_price": float(buy_price),
+            "sell_price": float(exit_price),
+            "reason": reason,
+        }
+
+    @staticmethod
+    def _summarise(trades, fee):
+        returns = np.array([trade["sell_price"] * (1 - fee) / (trade["buy_price"] * (1 + fee)) - 1
+                            for trade in trades])
+        equity = np.cumprod(1 + returns) if len(returns) else np.ones(1)
+        drawdown = 1 - equity / np.maximum.accumulate(np.concatenate(([1.0], equity)))[1:]
+
+        return {
+            "trades": trades,
+            "number_of_trades": len(trades),
+            "total_return": float(equity[-1] - 1),
+            "win_rate": float((returns > 0).mean()) if len(returns) else 0.0,
+            "max_drawdown": float(drawdown.max()) if len(returns) else 0.0,
+        }
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Bootstrapper:
+
+    def __init__(self, workers=10):
+        """
+        Creates the strategies of all symbols at the same time in a bounded pool of threads. Creating a strategy
+        mostly waits on the Binance API, so the threads share the pooled connections of the trader module. Use as
+        many workers as there are pooled connections.
+
+        :param workers: (int) The maximum number of strategies that are created at the same time.
+        """
+
+        self._workers = workers
+        self.__timings = {}
+        self.__total = 0.0
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def total(self):
+        return self.__total
+
+    # ----- CLASS METHODS ----- #
+
+    def run(self, symbols, create):
+        """
+        Creates an object for every symbol and measures how long each one took. When one fails, the error is raised
+        after the others are done.
+
+        :param symbols: (list) The symbols ie. ["btceur", "etheur"].
+        :param create: (function) Creates the object of one symbol, ie. the Strategy.
+        :return: (list) The created objects in the order of the symbols.
+        """
+
+        def timed_create(symbol):
+            start = time.perf_counter()
+            try:
+                return create(symbol)
+            finally:
+                self.__timings[symbol] = time.perf_counter() - start
+
+        self.__timings = {}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="bootstrap") as pool:
+            futures = [pool.submit(timed_create, symbol) for symbol in symbols]
+
+        self.__total = time.perf_counter() - start
+        return [future.result() for future in futures]
+
+    def format_timings(self, limit=None):
+        """
+        Lists how long every symbol took, the slowest first.
+
+        :param limit: (int) The maximum number of symbols that are listed. Default is all symbols.
+        :return: (str) The table.
+        """
+
+        timings = sorted(self.__timings.items(), key=lambda item: item[1], reverse=True)[:limit]
+        lines = [f"{'Symbol':<12}{'Seconds':>10}"]
+        lines.extend(f"{symbol.upper():<12}{seconds:>10.3f}" for symbol, seconds in timings)
+        lines.append(f"{'Sum':<12}{sum(self.__timings.values()):>10.3f}")
+        lines.append(f"{'Wall time':<12}{self.__total:>10.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class Candles:
+
+    def __init__(self, open_times, closes):
+        """
+        Open times and close prices of a series of candles as typed NumPy arrays.
+
+        :param open_times: (array) Open times in ms.
+        :param closes: (array) Close prices.
+        """
+
+        self._open_times = np.asarray(open_times, dtype=np.int64)
+        self._closes = np.asarray(closes, dtype=np.float64)
+
+    def __len__(self):
+        return len(self._open_times)
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def open_times(self):
+        return self._open_times
+
+    @property
+    def closes(self):
+        return self._closes
+
+    @property
+    def nbytes(self):
+        return self._open_times.nbytes + self._closes.nbytes
+
+    # ----- CLASS METHODS ----- #
+
+    @classmethod
+    def from_klines(cls, klines, time_column=0, price_column=4):
+        """
+        Reads the open times and close prices from klines, ie. the response of the Binance API or rows of the kline
+        store. Prices may be strings or floats.
+
+        :param klines: (list) Klines as lists.
+        :param time_column: (int) Position of the open time in a kline.
+        :param price_column: (int) Position of the close price in a kline.
+        :return: (Candles) The candles.
+        """
+
+        count = len(klines)
+        open_times = np.fromiter((kline[time_column] for kline in klines), dtype=np.int64, count=count)
+        closes = np.fromiter((kline[price_column] for kline in klines), dtype=np.float64, count=count)
+        return cls(open_times=open_times, closes=closes)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        """
+        Stops calling an endpoint after it failed a number of times in a row. After the reset timeout one request
+        is let through to test the endpoint; when it succeeds the breaker closes again.
+
+        :param name: (str) The name of the endpoint.
+        :param failure_threshold: (int) The number of failures in a row after which the breaker opens.
+        :param reset_timeout: (float) Seconds after which an open breaker lets a test request through.
+        """
+
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at = None
+        self.__testing = False
+        self.__lock = threading.Lock()
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def state(self):
+        with self.__lock:
+            if self.__opened_at is None:
+                return "closed"
+            if time.monotonic() - self.__opened_at >= self._reset_timeout:
+                return "half-open"
+            return "open"
+
+    # ----- CLASS METHODS ----- #
+
+    def allow(self):
+        """
+        :return: (bool) True when a request may be sent.
+        """
+
+        with self.__lock:
+            if self.__opened_at is None:
+                return True
+
+            if time.monotonic() - self.__opened_at >= self._reset_timeout and not self.__testing:
+                self.__testing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            self.__failures = 0
+            self.__opened_at = None
+            self.__testing = False
+
+    def record_failure(self):
+        with self.__lock:
+            self.__failures += 1
+
+            if self.__testing or self.__failures >= self._failure_threshold:
+                self.__opened_at = time.monotonic()
+            self.__testing = False
@@ -0,0 +1,112 @@
+import requests
+from requests.adapters import HTTPAdapter
+from class_blueprints.exceptions import BinanceRateLimitHit
+from class_blueprints.rate_limiter import get_weight, get_priority
+from class_blueprints.metrics import api_latency, api_requests
+
+
+class BinanceClient:
+
+    def __init__(self, base_url, headers=None, pool_size=10, timeout=10, rate_limiter=None):
+        """
+        Keeps a pool of open connections to the Binance API, so requests don't need a new TCP and TLS handshake.
+
+        :param base_url: (str) The url of the API ie. "https://api.binance.com".
+        :param headers: (dict) Headers that are sent with every request.
+        :param pool_size: (int) The maximum number of connections that are kept open.
+        :param timeout: (float) Seconds to wait for the API before the request fails.
+        :param rate_limiter: (object) Schedules the requests within the request weight limit of the API.
+        """
+
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self.__session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
+        if headers:
+            self.__session.headers.update(headers)
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def base_url(self):
+        return self._base_url
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, new_rate_limiter):
+        self._rate_limiter = new_rate_limiter
+
+    # ----- CLASS METHODS ----- #
+
+    def request(self, method, path, params=None, priority=None):
+        """
+        Sends a request over one of the pooled connections. With a rate limiter the request waits until its weight
+        fits in the limit. When the limit was hit anyway, all requests are held for the time the API asks for. The
+        request isn't sent again here, a signed request needs a new timestamp and signature by then.
+
+        :param method: (str) The HTTP method ie. "GET".
+        :param path: (str) The path of the endpoint ie. "/api/v3/order".
+        :param params: (dict) The query parameters.
+        :param priority: (int) The priority for the rate limiter. Default is the priority of the endpoint.
+        :return: (Response) The response of the API.
+        :raises BinanceRateLimitHit: When the API answered that the limit was hit.
+        """
+
+        if self._rate_limiter is None:
+            response = self.__send(method, path, params=params)
+        else:
+            self._rate_limiter.acquire(weight=get_weight(method, path, params),
+                                       priority=get_priority(path) if priority is None else priority)
+            response = self.__send(method, path, params=params)
+
+            used_weight = response.headers.get("X-MBX-USED-WEIGHT-1M") or response.headers.get("X-MBX-USED-WEIGHT")
+            if used_weight:
+                self._rate_limiter.update(used_weight=int(used_weight))
+
+        # 429 means the limit was hit, 418 means the IP is banned for ignoring 429.
+        if response.status_code in (418, 429):
+            retry_after = float(response.headers.get("Retry-After", 60))
+            if self._rate_limiter is not None:
+                self._rate_limiter.pause(seconds=retry_after)
+            raise BinanceRateLimitHit(f"The request weight limit of the API was hit for {path}.",
+                                      retry_after=retry_after)
+
+        return response
+
+    def __send(self, method, path, params):
+        with api_latency.time(method=method, endpoint=path):
+            response = self.__session.request(method, self._base_url + path, params=params, timeout=self._timeout)
+
+        api_requests.inc(method=method, endpoint=path, status=response.status_code)
+        return response
+
+    def get(self, path, params=None, priority=None):
+        return self.request("GET", path, params=params, priority=priority)
+
+    def post(self, path, params=None, priority=None):
+        return self.request("POST", path, params=params, priority=priority)
+
+    def put(self, path, params=None, priority=None):
+        return self.request("PUT", path, params=params, priority=priority)
+
+    def delete(self, path, params=None, priority=None):
+        return self.request("DELETE", path, params=params, priority=priority)
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+
+        self.__session.close()
@@ -0,0 +1,54 @@
+import time
+
+
+class Clock:
+    """
+    The time of the bot. The bot asks the clock instead of the time module, so it can also run on simulated time.
+    """
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulatedClock(Clock):
+
+    def __init__(self, start, speed=None):
+        """
+        Time that only moves when the bot sleeps or when it's moved forward, ie. to replay history.
+
+        :param start: (float) The start time in seconds since the epoch.
+        :param speed: (float) How many times faster than real time the clock runs while sleeping. Default is as
+        fast as possible.
+        """
+
+        self._now = float(start)
+        self._speed = speed
+
+    def time(self):
+        return self._now
+
+    def monotonic(self):
+        return self._now
+
+    def sleep(self, seconds):
+        if self._speed:
+            time.sleep(seconds / self._speed)
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self._now += max(seconds, 0)
+
+    def set(self, timestamp):
+        """
+        Moves the clock forward to a point in time. The clock never moves back.
+
+        :param timestamp: (float) Time in seconds since the epoch.
+        """
+
+        self._now = max(self._now, float(timestamp))
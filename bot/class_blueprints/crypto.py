@@ -34,13 +34,10 @@ class Crypto:
         """Combines the crypto and fiat to return symbol used for trades."""
         return self._crypto + self.__fiat
 
-    def update_balance(self, data):
+    def update_balance(self, account_state):
         """
         Updates the balance of the crypto currently in the user's account.
 
-        :param data: (dict) Takes a response from Account Information endpoint of the Binance API. It will search for
-        the crypto in the response and update the class attribute.
+        :param account_state: (AccountState) The balances of the account by asset.
         """
-        for balance in data["balances"]:
-            if balance["asset"].lower() == self._crypto:
-                self._balance = float(balance["free"])
+        self._balance = account_state.get_balance(self._crypto)
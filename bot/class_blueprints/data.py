@@ -1,52 +1,108 @@
 import pandas as pd
-import pandas_ta as pta
+from class_blueprints.indicators import ExponentialMovingAverage, SimpleMovingAverage, RelativeStrengthIndex
+from class_blueprints.indicators import IndicatorEngine
+from class_blueprints.candles import Candles
+from class_blueprints.metrics import data_latency, indicator_latency
 
 
 class Data:
 
-    def __init__(self, data):
-        self._df = pd.DataFrame(data)
-        self._clean_data()
+    def __init__(self, data, indicators=None):
+        """
+        Latest candles of an asset with the latest values of the indicators.
+
+        :param data: (list) Klines from the Binance API or the kline store, or a Candles object.
+        :param indicators: (object) The IndicatorEngine of the symbol and interval.
+        """
+
+        with data_latency.time():
+            self._candles = data if isinstance(data, Candles) else Candles.from_klines(data)
+            self._values = {}
+            self._df = None
+
+            # Indicators keep their state between ticks, so only new candles have to be added. That's the work of
+            # every tick, the indicators of the engine are updated together.
+            self._indicators = IndicatorEngine() if indicators is None else indicators
+            with indicator_latency.time(indicator="update"):
+                self._indicators.update(open_times=self._candles.open_times, prices=self._candles.closes)
 
     # ----- GETTERS / SETTERS ----- #
 
+    @property
+    def candles(self):
+        return self._candles
+
+    @property
+    def price(self):
+        return float(self._candles.closes[-1])
+
+    @property
+    def values(self):
+        """
+        :return: (dict) The latest value of every indicator that was set.
+        """
+
+        return dict(self._values)
+
     @property
     def df(self):
+        """
+        DataFrame of the candles and the indicators, for display only. It's created the first time it's used.
+        """
+
+        if self._df is None:
+            self._df = pd.DataFrame({"Price": self._candles.closes},
+                                    index=pd.to_datetime(self._candles.open_times, unit="ms").rename("Open Time"))
+            for name, value in self._values.items():
+                self._df[name] = float("nan")
+                self._df.iloc[-1, self._df.columns.get_loc(name)] = value
         return self._df
 
     # ----- CLASS METHODS ----- #
 
-    def _clean_data(self):
+    def latest(self, name):
         """
-        Cleans the data retrieved from the Binance API so it's usable by the bot.
+        :param name: (str) The name of the indicator ie. "EMA_50".
+        :return: (float) The latest value of the indicator.
         """
 
-        self._df = self._df.drop(columns=self._df.columns[[1, 2, 3, 5, 6, 7, 8, 9, 10, 11]], axis=1)
-        self._df.columns = ["Open Time", "Price"]
-        self._df = self._df.set_index("Open Time")
-        self._df.index = pd.to_datetime(self._df.index, unit="ms")
-        self._df = self._df.astype(float)
+        return self._values[name]
+
+    def _set_indicator(self, name, indicator):
+        """
+        Sets the latest value of an indicator.
+
+        :param name: (str) The name of the indicator.
+        :param indicator: (object) The indicator that is used when the engine doesn't track it yet.
+        """
+
+        with indicator_latency.time(indicator=name):
+            self._indicators.add(name=name, indicator=indicator, open_times=self._candles.open_times,
+                                 prices=self._candles.closes)
+            self._values[name] = self._indicators.latest(name)
+        self._df = None
 
     def set_sma(self, window):
         """
-        Adds a column to the DataFrame with an SMA.
+        Sets the latest value of an SMA.
 
         :param window: (int) The length of that the SMA needs to use.
         """
 
-        self._df[f"SMA_{window}"] = self._df["Price"].rolling(window=window).mean()
+        self._set_indicator(name=f"SMA_{window}", indicator=SimpleMovingAverage(window=window))
 
     def set_rsi(self):
         """
-        Adds a column to the DataFrame with RSI indicator.
+        Sets the latest value of the RSI indicator.
         """
 
-        self._df["RSI"] = pta.rsi(self._df["Price"], length=14)
+        self._set_indicator(name="RSI", indicator=RelativeStrengthIndex(length=14, window=len(self._candles) - 1))
 
     def set_ema(self, window):
         """
-        Adds a column to the DataFrame with an EMA.
+        Sets the latest value of an EMA.
 
         :param window: (int) The length of that the EMA needs to use.
         """
-        self._df[f"EMA_{window}"] = self._df["Price"].ewm(span=window, adjust=False).mean()
+
+        self._set_indicator(name=f"EMA_{window}", indicator=ExponentialMovingAverage(window=window))
@@ -1,2 +1,13 @@
 class BinanceAccountIssue(Exception):
     pass
+
+
+class BinanceConnectionIssue(Exception):
+    pass
+
+
+class BinanceRateLimitHit(BinanceConnectionIssue):
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,74 @@
+from class_blueprints.trader import get_exchange_info
+from class_blueprints.clock import Clock
+from class_blueprints.exceptions import BinanceConnectionIssue
+
+
+class SymbolFilters:
+
+    def __init__(self, symbols, ttl=3600, clock=None):
+        """
+        Caches the trading rules of all symbols, so orders can be prepared without asking the API for them.
+
+        :param symbols: (list) The symbols that are traded.
+        :param ttl: (int) Seconds before the rules are loaded again.
+        :param clock: (Clock) The clock that tells the age of the rules. Default is real time.
+        """
+
+        self._symbols = [symbol.lower() for symbol in symbols]
+        self._ttl = ttl
+        self._clock = clock or Clock()
+        self.__filters = {}
+        self.__unknown = set()
+        self.__loaded_at = None
+        self.refresh()
+
+    # ----- CLASS METHODS ----- #
+
+    def refresh(self):
+        """
+        Loads the filters of all symbols in one request.
+        """
+
+        data = get_exchange_info(assets=self._symbols)
+        self.__filters = {
+            symbol_info["symbol"].lower(): {rule["filterType"]: rule for rule in symbol_info["filters"]}
+            for symbol_info in data["symbols"]
+        }
+        self.__unknown.clear()
+        self.__loaded_at = self._clock.monotonic()
+
+    def get_filter(self, symbol, filter_type):
+        """
+        Returns a filter of a symbol ie. "PRICE_FILTER" or "LOT_SIZE". The rules are loaded again when the ttl has
+        passed. When that fails, the old rules are used until the next call.
+
+        :param symbol: (str) The symbol of the asset.
+        :param filter_type: (str) The filterType of the filter.
+        :return: (dict) The filter as given by the Binance API.
+        :raises ValueError: When the Binance API has no rules for the symbol.
+        """
+
+        symbol = symbol.lower()
+        refreshed = False
+
+        if self._clock.monotonic() - self.__loaded_at > self._ttl:
+            try:
+                self.refresh()
+                refreshed = True
+            except BinanceConnectionIssue as error:
+                print(f"{error} Using the trading rules that were loaded before.")
+
+        # A missing symbol is loaded again once, ie. it wasn't listed yet. After that it isn't asked for again.
+        if symbol not in self.__filters and symbol not in self.__unknown and not refreshed:
+            self.refresh()
+
+        if symbol not in self.__filters:
+            self.__unknown.add(symbol)
+            raise ValueError(f"The Binance API has no trading rules for {symbol.upper()}.")
+        return self.__filters[symbol][filter_type]
+
+    def get_tick_size(self, symbol):
+        return self.get_filter(symbol=symbol, filter_type="PRICE_FILTER")["tickSize"]
+
+    def get_step_size(self, symbol):
+        return self.get_filter(symbol=symbol, filter_type="LOT_SIZE")["stepSize"]
@@ -0,0 +1,22 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads = json.loads if orjson is None else orjson.loads
+
+
+def decode_klines(content):
+    """
+    Decodes a klines response of the Binance API with the prices as numbers instead of strings. All fields of a
+    kline are numeric, so the quotes are removed from the raw bytes and the JSON parser reads the numbers right
+    away. Uses orjson when it's installed.
+
+    :param content: (bytes) The body of the response.
+    :return: (list) Klines as lists of numbers.
+    """
+
+    return loads(content.translate(None, b'"'))
+
@@ -0,0 +1,195 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert
+from database import Kline, get_engine
+from class_blueprints.trader import get_history
+from class_blueprints.candles import Candles
+from class_blueprints.clock import Clock
+
+INTERVALS_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+}
+
+
+class KlineStore:
+
+    __MAX_LIMIT = 1000
+
+    def __init__(self, engine=None, clock=None):
+        """
+        Stores the candles of all assets, so only the newest candles need to be downloaded.
+
+        :param engine: (Engine) The engine to use. Default is the engine that is shared by the bot.
+        :param clock: (Clock) The clock that tells which candles are missing. Default is real time.
+        """
+
+        self.__engine = engine or get_engine()
+        self._clock = clock or Clock()
+        Kline.__table__.create(self.__engine, checkfirst=True)
+
+    # ----- CLASS METHODS ----- #
+
+    def get_history(self, symbol, interval, limit):
+        """
+        Returns the latest candles of an asset. Only the candles that are newer than the last stored candle are
+        downloaded from the Binance API, the rest is read from the local store.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles ie. "4h".
+        :param limit: (int) The number of candles that needs to be returned.
+        :return: (list) Candles as lists of open time, open, high, low, close, volume and close time.
+        """
+
+        symbol = symbol.lower()
+        self._update(symbol=symbol, interval=interval, limit=limit)
+        return self._load(symbol=symbol, interval=interval, limit=limit)
+
+    def get_candles(self, symbol, interval, limit):
+        """
+        Same as get_history, but only reads the open times and close prices from the store.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles ie. "4h".
+        :param limit: (int) The number of candles that needs to be returned.
+        :return: (Candles) The candles.
+        """
+
+        symbol = symbol.lower()
+        self._update(symbol=symbol, interval=interval, limit=limit)
+
+        query = select(Kline.open_time, Kline.close) \
+            .where(Kline.symbol == symbol, Kline.interval == interval) \
+            .order_by(Kline.open_time.desc()) \
+            .limit(limit)
+
+        with self.__engine.connect() as connection:
+            rows = connection.execute(query).all()
+        return Candles.from_klines(rows[::-1], time_column=0, price_column=1)
+
+    def download(self, symbol, interval, start_time):
+        """
+        Downloads and stores all candles from start_time until now, ie. to run a backtest over.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles.
+        :param start_time: (int) Open time in ms of the first candle.
+        :return: (list) The downloaded candles.
+        """
+
+        symbol = symbol.lower()
+        klines = self._fetch_since(symbol=symbol, interval=interval, start_time=start_time)
+        self._save(symbol=symbol, interval=interval, klines=klines)
+        return klines
+
+    def load(self, symbol, interval):
+        """
+        Returns all stored candles of an asset.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles.
+        :return: (list) Candles as lists of open time, open, high, low, close, volume and close time.
+        """
+
+        return self._load(symbol=symbol.lower(), interval=interval, limit=None)
+
+    def _update(self, symbol, interval, limit):
+        last_open_time, stored = self._get_stored_range(symbol=symbol, interval=interval)
+
+        if last_open_time is None or stored < limit:
+            if limit <= self.__MAX_LIMIT:
+                klines = get_history(symbol=symbol, interval=interval, limit=limit)
+            else:
+                # More candles than fit in one request are downloaded in pages.
+                length = INTERVALS_MS[interval]
+                start_time = int(self._clock.time() * 1000) // length * length - (limit - 1) * length
+                klines = self._fetch_since(symbol=symbol, interval=interval, start_time=start_time)
+        else:
+            klines = self._fetch_since(symbol=symbol, interval=interval, start_time=last_open_time)
+
+        self._save(symbol=symbol, interval=interval, klines=klines)
+
+    def _fetch_since(self, symbol, interval, start_time):
+        """
+        Downloads all candles from start_time onwards. The candle at start_time is downloaded again because it may
+        not have been closed when it was stored.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles.
+        :param start_time: (int) Open time in ms of the last stored candle.
+        :return: (list) Raw klines from the Binance API.
+        """
+
+        missing = int((self._clock.time() * 1000 - start_time) // INTERVALS_MS[interval]) + 1
+        klines = []
+
+        while True:
+            limit = min(max(missing, 1), self.__MAX_LIMIT)
+            batch = get_history(symbol=symbol, interval=interval, limit=limit, start_time=start_time)
+            klines.extend(batch)
+
+            if len(batch) < limit or limit < self.__MAX_LIMIT:
+                return klines
+
+            # A full page that ends at the open candle would otherwise be followed by an empty request.
+            missing -= len(batch)
+            if missing <= 0:
+                return klines
+            start_time = batch[-1][0] + 1
+
+    def _get_stored_range(self, symbol, interval):
+        query = select(func.max(Kline.open_time), func.count()).where(Kline.symbol == symbol,
+                                                                       Kline.interval == interval)
+
+        with self.__engine.connect() as connection:
+            last_open_time, stored = connection.execute(query).one()
+        return last_open_time, stored
+
+    def _save(self, symbol, interval, klines):
+        if not klines:
+            return
+
+        rows = [
+            {
+                "symbol": symbol,
+                "interval": interval,
+                "open_time": kline[0],
+                "open": kline[1],
+                "high": kline[2],
+                "low": kline[3],
+                "close": kline[4],
+                "volume": kline[5],
+                "close_time": kline[6],
+            }
+            for kline in klines
+        ]
+
+        statement = insert(Kline)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Kline.symbol, Kline.interval, Kline.open_time],
+            set_={column: statement.excluded[column] for column in ("open", "high", "low", "close", "volume",
+                                                                     "close_time")}
+        )
+
+        with self.__engine.begin() as connection:
+            connection.execute(statement, rows)
+
+    def _load(self, symbol, interval, limit):
+        query = select(Kline.open_time, Kline.open, Kline.high, Kline.low, Kline.close, Kline.volume,
+                       Kline.close_time) \
+            .where(Kline.symbol == symbol, Kline.interval == interval) \
+            .order_by(Kline.open_time.desc()) \
+            .limit(limit)
+
+        with self.__engine.connect() as connection:
+            rows = connection.execute(query).all()
+        return [list(row) for row in reversed(rows)]
@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+import websocket
+
+
+class MarketStream:
+
+    def __init__(self, symbols, url="wss://stream.binance.com:9443", kline_interval="1m", reconnect_delay=5):
+        """
+        Listens to the bookTicker and kline streams of the Binance API in a background thread. Prices are collected
+        per symbol as the lowest, highest and last price since they were last read, so no wick is missed between
+        two reads.
+
+        :param symbols: (list) The symbols that are traded.
+        :param url: (str) The url of the websocket API.
+        :param kline_interval: (str) The interval of the kline stream.
+        :param reconnect_delay: (float) Seconds to wait before connecting again after the connection was lost.
+        """
+
+        self._symbols = [symbol.lower() for symbol in symbols]
+        streams = [f"{symbol}@{stream}" for symbol in self._symbols
+                   for stream in ("bookTicker", f"kline_{kline_interval}")]
+        self._url = f"{url.rstrip('/')}/stream?streams={'/'.join(streams)}"
+        self._reconnect_delay = reconnect_delay
+        self._connected = False
+        self.__ranges = {}
+        self.__lock = threading.Lock()
+        self.__new_prices = threading.Event()
+        self.__running = False
+        self.__app = None
+        self.__thread = None
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def connected(self):
+        return self._connected
+
+    # ----- CLASS METHODS ----- #
+
+    def start(self):
+        """
+        Connects to the stream in a background thread. The stream connects again when the connection is lost.
+        """
+
+        self.__running = True
+        self.__thread = threading.Thread(target=self._run, name="market-stream", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Closes the connection and stops the background thread.
+        """
+
+        self.__running = False
+        if self.__app is not None:
+            self.__app.close()
+        if self.__thread is not None:
+            self.__thread.join(timeout=5)
+
+    def wait(self, timeout=None):
+        """
+        Waits for new prices and returns everything that came in since the last call.
+
+        :param timeout: (float) The maximum number of seconds to wait.
+        :return: (dict) Per symbol a tuple of the lowest, highest and last price.
+        """
+
+        self.__new_prices.wait(timeout)
+
+        with self.__lock:
+            ranges, self.__ranges = self.__ranges, {}
+            self.__new_prices.clear()
+        return {symbol: tuple(prices) for symbol, prices in ranges.items()}
+
+    def _run(self):
+        while self.__running:
+            self.__app = websocket.WebSocketApp(self._url, on_open=self._handle_open, on_message=self._handle_message,
+                                                on_close=self._handle_close, on_error=self._handle_error)
+            self.__app.run_forever(ping_interval=60, ping_timeout=10)
+            self._connected = False
+
+            if self.__running:
+                print(f"Market stream disconnected. Connecting again in {self._reconnect_delay} seconds.")
+                time.sleep(self._reconnect_delay)
+
+    def _handle_open(self, app):
+        self._connected = True
+
+    def _handle_close(self, app, status_code, message):
+        self._connected = False
+
+    def _handle_error(self, app, error):
+        print(f"There's an issue with the market stream: {error}")
+
+    def _handle_message(self, app, message):
+        data = json.loads(message)
+        data = data.get("data", data)
+        symbol = data["s"].lower()
+
+        if data.get("e") == "kline":
+            self._record_price(symbol=symbol, price=float(data["k"]["c"]))
+
+        elif "b" in data:
+            # The best bid is the price a sell order would get.
+            self._record_price(symbol=symbol, price=float(data["b"]))
+
+    def _record_price(self, symbol, price):
+        with self.__lock:
+            prices = self.__ranges.get(symbol)
+
+            if prices is None:
+                self.__ranges[symbol] = [price, price, price]
+            else:
+                prices[0] = min(prices[0], price)
+                prices[1] = max(prices[1], price)
+                prices[2] = price
+
+            self.__new_prices.set()
@@ -0,0 +1,280 @@
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the latency buckets in seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{str(value)}"' for key, value in items) + "}"
+
+
+def _format_value(value):
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class Counter:
+
+    def __init__(self, name, description):
+        """
+        Counts events per set of labels.
+
+        :param name: (str) The name of the metric.
+        :param description: (str) What is counted.
+        """
+
+        self._name = name
+        self._description = description
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self._name
+
+    # ----- CLASS METHODS ----- #
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.__values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self):
+        lines = [f"# HELP {self._name} {self._description}", f"# TYPE {self._name} counter"]
+        with self.__lock:
+            for key, value in sorted(self.__values.items()):
+                lines.append(f"{self._name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+    def to_dict(self):
+        with self.__lock:
+            return [{"labels": dict(key), "value": value} for key, value in sorted(self.__values.items())]
+
+
+class Histogram:
+
+    def __init__(self, name, description, buckets=DEFAULT_BUCKETS, samples=1024):
+        """
+        Collects durations per set of labels in buckets, and keeps the latest samples to calculate percentiles.
+
+        :param name: (str) The name of the metric.
+        :param description: (str) What is measured.
+        :param buckets: (tuple) The upper bounds of the buckets.
+        :param samples: (int) The number of latest samples that are kept per set of labels.
+        """
+
+        self._name = name
+        self._description = description
+        self._buckets = tuple(buckets) + (math.inf, )
+        self._samples = samples
+        self.__series = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self._name
+
+    # ----- CLASS METHODS ----- #
+
+    def observe(self, value, **labels):
+        """
+        Adds a measurement.
+
+        :param value: (float) The measured duration in seconds.
+        """
+
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = {"buckets": [0] * len(self._buckets), "sum": 0.0, "count": 0,
+                                               "samples": deque(maxlen=self._samples)}
+
+            series["buckets"][bisect.bisect_left(self._buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["samples"].append(value)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Measures the duration of a with block.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def quantile(self, q, **labels):
+        """
+        Returns a percentile of the latest samples.
+
+        :param q: (float) The quantile ie. 0.99.
+        :return: (float) The duration, or nan when nothing was measured.
+        """
+
+        with self.__lock:
+            series = self.__series.get(tuple(sorted(labels.items())))
+            samples = sorted(series["samples"]) if series else []
+
+        if not samples:
+            return math.nan
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def render(self):
+        lines = [f"# HELP {self._name} {self._description}", f"# TYPE {self._name} histogram"]
+        with self.__lock:
+            for key, series in sorted(self.__series.items()):
+                cumulative = 0
+                for bound, count in zip(self._buckets, series["buckets"]):
+                    cumulative += count
+                    lines.append(f"{self._name}_bucket{_format_labels(key, le=_format_value(bound))} {cumulative}")
+                lines.append(f"{self._name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{self._name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+    def to_dict(self):
+        with self.__lock:
+            keys = sorted(self.__series)
+            counts = {key: (self.__series[key]["count"], self.__series[key]["sum"]) for key in keys}
+
+        return [{"labels": dict(key), "count": counts[key][0], "sum": counts[key][1],
+                 "p50": self.quantile(0.5, **dict(key)), "p99": self.quantile(0.99, **dict(key))} for key in keys]
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        """
+        Holds all metrics of the bot and exports them as Prometheus text or JSON.
+        """
+
+        self.__metrics = {}
+        self.__lock = threading.Lock()
+
+    # ----- CLASS METHODS ----- #
+
+    def counter(self, name, description):
+        return self.__get_or_create(Counter, name, description)
+
+    def histogram(self, name, description, buckets=DEFAULT_BUCKETS):
+        return self.__get_or_create(Histogram, name, description, buckets=buckets)
+
+    def render(self):
+        """
+        :return: (str) All metrics in the Prometheus text format.
+        """
+
+        lines = []
+        for metric in self.__list():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        return {metric.name: metric.to_dict() for metric in self.__list()}
+
+    def dump(self, path):
+        """
+        Writes all metrics to a JSON file. The file is replaced at once, so a reader never sees half a dump.
+
+        :param path: (str) The path of the JSON file.
+        """
+
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"time": time.time(), "metrics": self.to_dict()}, file)
+        os.replace(temporary_path, path)
+
+    def start_dump(self, path, interval=60):
+        """
+        Dumps all metrics to a JSON file every interval in a background thread.
+
+        :param path: (str) The path of the JSON file.
+        :param interval: (float) Seconds between the dumps.
+        """
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.dump(path)
+                except OSError as error:
+                    print(f"Can't write the metrics to {path}: {error}")
+
+        threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serves the metrics over HTTP in a background thread: /metrics in the Prometheus text format and
+        /metrics.json as JSON.
+
+        :param port: (int) The port to listen on.
+        :param host: (str) The address to listen on.
+        :return: (ThreadingHTTPServer) The server.
+        """
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.render().encode(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.to_dict()).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+    def __get_or_create(self, metric_type, name, description, **kwargs):
+        with self.__lock:
+            if name not in self.__metrics:
+                self.__metrics[name] = metric_type(name, description, **kwargs)
+            return self.__metrics[name]
+
+    def __list(self):
+        with self.__lock:
+            return list(self.__metrics.values())
+
+
+registry = MetricsRegistry()
+
+api_latency = registry.histogram("api_request_seconds", "Duration of the requests to the Binance API.")
+api_requests = registry.counter("api_requests_total", "Requests to the Binance API by status code.")
+api_retries = registry.counter("api_retries_total", "Requests to the Binance API that were tried again.")
+tick_latency = registry.histogram("tick_seconds", "Duration of handling one symbol, by tick, stream or shard.")
+signal_latency = registry.histogram("strategy_check_seconds", "Duration of Strategy.check_for_signal.")
+data_latency = registry.histogram("data_build_seconds", "Duration of building a Data object from the klines.")
+indicator_latency = registry.histogram("indicator_seconds", "Duration of calculating an indicator.")
+stop_loss_write_latency = registry.histogram("stop_loss_write_seconds", "Duration of writing the stop losses.")
+order_latency = registry.histogram("order_seconds", "Duration of the stages of a limit order.")
+orders = registry.counter("orders_total", "Limit orders by side and final status.")
+missed_deadlines = registry.counter("missed_deadlines_total", "Ticks that were skipped while the bot was busy.")
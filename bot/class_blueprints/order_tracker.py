@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from class_blueprints.clock import Clock
+from class_blueprints.trader import query_order
+
+FINAL_STATUSES = ("FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH")
+
+
+def receipt_from_execution_report(report):
+    """
+    Converts an execution report of the user data stream to the receipt that query_order returns.
+
+    :param report: (dict) The executionReport event.
+    :return: (dict) The receipt of the order.
+    """
+
+    return {
+        "symbol": report["s"],
+        "orderId": report["i"],
+        "clientOrderId": report["C"] if report["X"] == "CANCELED" and report.get("C") else report["c"],
+        "price": report["p"],
+        "origQty": report["q"],
+        "executedQty": report["z"],
+        "cummulativeQuoteQty": report["Z"],
+        "status": report["X"],
+        "type": report["o"],
+        "side": report["S"],
+        "updateTime": report["T"],
+    }
+
+
+class OrderTracker:
+
+    def __init__(self, fill_source=None, timeout=10, poll_interval=5, clock=None):
+        """
+        Keeps track of the placed orders and resolves a future as soon as an order is filled, cancelled or rejected.
+        The fills come from a fill source, ie. the user data stream. Without a connected fill source the orders
+        are polled with query_order.
+
+        :param fill_source: (object) Calls the handlers given to on_execution_report with every order update.
+        :param timeout: (float) Seconds to wait for a fill before the order is cancelled.
+        :param poll_interval: (float) Seconds between polls when there's no connected fill source.
+        :param clock: (Clock) The clock to wait on while polling. Default is real time.
+        """
+
+        self.__fill_source = None
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        self._clock = clock or Clock()
+        self.__orders = {}
+        self.__lock = threading.Lock()
+
+        if fill_source is not None:
+            self.attach(fill_source)
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def fill_source(self):
+        return self.__fill_source
+
+    @property
+    def streaming(self):
+        return self.__fill_source is not None and self.__fill_source.connected
+
+    # ----- CLASS METHODS ----- #
+
+    def attach(self, fill_source):
+        """
+        Uses a fill source for the order updates.
+
+        :param fill_source: (object) Calls the handlers given to on_execution_report with every order update.
+        """
+
+        self.__fill_source = fill_source
+        fill_source.on_execution_report(self.handle_execution_report)
+
+    def start(self):
+        if self.__fill_source is not None:
+            self.__fill_source.start()
+
+    def track(self):
+        """
+        Registers a new order before it's placed, so a fill that arrives before the order is confirmed isn't missed.
+
+        :return: (str) The client order id to place the order with.
+        """
+
+        client_order_id = uuid.uuid4().hex
+        with self.__lock:
+            self.__orders[client_order_id] = Future()
+        return client_order_id
+
+    def forget(self, client_order_id):
+        with self.__lock:
+            self.__orders.pop(client_order_id, None)
+
+    def get_future(self, client_order_id):
+        """
+        :param client_order_id: (str) The client order id of a tracked order.
+        :return: (Future) Resolves with the receipt of the order when it's filled, cancelled or rejected.
+        """
+
+        return self.__orders[client_order_id]
+
+    def handle_execution_report(self, report):
+        """
+        Resolves the future of an order when the order update is final.
+
+        :param report: (dict) The executionReport event of the user data stream.
+        """
+
+        if report["X"] not in FINAL_STATUSES:
+            return
+
+        receipt = receipt_from_execution_report(report)
+        with self.__lock:
+            future = self.__orders.get(receipt["clientOrderId"])
+
+        if future is not None and not future.done():
+            future.set_result(receipt)
+
+    def wait(self, symbol, order_id, client_order_id):
+        """
+        Waits until an order is filled or the timeout has passed.
+
+        :param symbol: (str) The symbol of the asset.
+        :param order_id: (int) The order id that was given by the Binance API.
+        :param client_order_id: (str) The client order id the order was placed with.
+        :return: (dict) The latest receipt of the order.
+        """
+
+        if self.streaming:
+            try:
+                return self.get_future(client_order_id).result(timeout=self._timeout)
+            except FutureTimeoutError:
+                # The update might have been sent while the stream was reconnecting.
+                return query_order(asset_symbol=symbol, order_id=order_id)
+
+        deadline = self._clock.monotonic() + self._timeout
+        confirmation = query_order(asset_symbol=symbol, order_id=order_id)
+
+        while confirmation["status"].lower() != "filled" and self._clock.monotonic() < deadline:
+            self._clock.sleep(self._poll_interval)
+            confirmation = query_order(asset_symbol=symbol, order_id=order_id)
+        return confirmation
+
+    async def wait_async(self, symbol, order_id, client_order_id):
+        """
+        Waits until an order is filled or the timeout has passed, without blocking the event loop.
+
+        :param symbol: (str) The symbol of the asset.
+        :param order_id: (int) The order id that was given by the Binance API.
+        :param client_order_id: (str) The client order id the order was placed with.
+        :return: (dict) The latest receipt of the order.
+        """
+
+        if self.streaming:
+            fill = asyncio.wrap_future(self.get_future(client_order_id))
+            try:
+                return await asyncio.wait_for(asyncio.shield(fill), timeout=self._timeout)
+            except asyncio.TimeoutError:
+                return await asyncio.to_thread(query_order, asset_symbol=symbol, order_id=order_id)
+
+        deadline = time.monotonic() + self._timeout
+        confirmation = await asyncio.to_thread(query_order, asset_symbol=symbol, order_id=order_id)
+
+        while confirmation["status"].lower() != "filled" and time.monotonic() < deadline:
+            await asyncio.sleep(self._poll_interval)
+            confirmation = await asyncio.to_thread(query_order, asset_symbol=symbol, order_id=order_id)
+        return confirmation
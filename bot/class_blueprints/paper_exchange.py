@@ -0,0 +1,369 @@
+import itertools
+import json
+import numpy as np
+
+INTERVALS_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+}
+
+
+class PaperResponse:
+
+    def __init__(self, status_code, data):
+        """
+        Response of the paper exchange with the parts of requests.Response that the bot uses.
+
+        :param status_code: (int) The HTTP status code.
+        :param data: (object) The body, ie. a dict.
+        """
+
+        self.status_code = status_code
+        self.headers = {}
+        self.__data = data
+        self.__content = None
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content(self):
+        if self.__content is None:
+            self.__content = json.dumps(self.__data, separators=(",", ":")).encode()
+        return self.__content
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return self.__data
+
+
+class PaperExchange:
+
+    def __init__(self, candles, clock, balances, fiat, base_interval="1m", fee=0.001, symbol_info=None):
+        """
+        Simulates the Binance REST API on stored candles, with the same interface as the BinanceClient. Higher
+        intervals are resampled from the candles of the base interval, and only candles that exist at the time of the
+        clock are returned. Limit orders are filled against the highs and lows of the base candles.
+
+        :param candles: (dict) Per symbol the candles of the base interval as lists of open time, open, high, low,
+        close and volume, ie. from KlineStore.load.
+        :param clock: (object) The clock that gives the time of the exchange.
+        :param balances: (dict) The free balance per asset ie. {"eur": 1000}.
+        :param fiat: (str) The fiat market ie. "eur".
+        :param base_interval: (str) The interval of the candles.
+        :param fee: (float) The fee per trade, paid in the asset that is received.
+        :param symbol_info: (dict) Per symbol the symbols entry of the exchange info, ie. to use the filters of
+        Binance. Symbols without an entry get a tick size of 0.01 and a step size of 0.00001.
+        """
+
+        self._clock = clock
+        self._fiat = fiat.lower()
+        self._base_ms = INTERVALS_MS[base_interval]
+        self._fee = fee
+        self._symbol_info = {symbol.upper(): info for symbol, info in (symbol_info or {}).items()}
+        self.__candles = {symbol.upper(): np.array(rows, dtype=np.float64)[:, :6] for symbol, rows in candles.items()}
+        self.__resampled = {}
+        self.__balances = {asset.lower(): {"free": float(balance), "locked": 0.0} for asset, balance in balances.items()}
+        self.__orders = {}
+        self.__open_orders = {}
+        self.__order_ids = itertools.count(1)
+        self.__last_match = self.__now()
+        self.__updated_at = self.__now()
+        self.__trades = []
+        self.__requests = 0
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def base_url(self):
+        return "paper://"
+
+    @property
+    def trades(self):
+        return self.__trades
+
+    @property
+    def requests(self):
+        return self.__requests
+
+    @property
+    def end_time(self):
+        """
+        :return: (float) Time in seconds when the last base candle of all symbols is closed.
+        """
+
+        return min(rows[-1, 0] + self._base_ms for rows in self.__candles.values()) / 1000
+
+    @property
+    def start_time(self):
+        return max(rows[0, 0] for rows in self.__candles.values()) / 1000
+
+    # ----- CLASS METHODS ----- #
+
+    def get_balance(self, asset):
+        balance = self.__balances.get(asset.lower(), {"free": 0.0, "locked": 0.0})
+        return balance["free"] + balance["locked"]
+
+    def get_price(self, symbol):
+        """
+        :param symbol: (str) The symbol of the asset.
+        :return: (float) The close price of the last closed base candle.
+        """
+
+        rows = self.__candles[symbol.upper()]
+        position = max(np.searchsorted(rows[:, 0] + self._base_ms, self.__now(), side="right") - 1, 0)
+        return float(rows[position, 4])
+
+    def request(self, method, path, params=None, priority=None):
+        """
+        Handles a request like the Binance API would.
+
+        :param method: (str) The HTTP method ie. "GET".
+        :param path: (str) The path of the endpoint ie. "/api/v3/order".
+        :param params: (dict) The query parameters.
+        :param priority: (int) Not used, the paper exchange has no rate limit.
+        :return: (PaperResponse) The response.
+        """
+
+        params = params or {}
+        self.__requests += 1
+        self.__match()
+
+        if path == "/api/v3/klines":
+            return PaperResponse(200, self.__get_klines(symbol=params["symbol"], interval=params["interval"],
+                                                        limit=int(params.get("limit", 500)),
+                                                        start_time=params.get("startTime")))
+
+        if path == "/api/v3/ticker/price":
+            if "symbol" in params:
+                return PaperResponse(200, self.__get_ticker(params["symbol"]))
+            symbols = json.loads(params["symbols"]) if "symbols" in params else list(self.__candles)
+            return PaperResponse(200, [self.__get_ticker(symbol) for symbol in symbols])
+
+        if path == "/api/v3/exchangeInfo":
+            symbols = json.loads(params["symbols"]) if "symbols" in params else [params["symbol"]]
+            return PaperResponse(200, {"symbols": [self.__get_symbol_info(symbol) for symbol in symbols]})
+
+        if path == "/api/v3/account":
+            return PaperResponse(200, {"updateTime": self.__updated_at, "balances": [
+                {"asset": asset.upper(), "free": f"{balance['free']:.8f}", "locked": f"{balance['locked']:.8f}"}
+                for asset, balance in self.__balances.items()]})
+
+        if path == "/api/v3/order":
+            if method == "POST":
+                return self.__post_order(params)
+            order = self.__get_order(params)
+            if order is None:
+                return PaperResponse(400, {"code": -2013, "msg": "Order does not exist."})
+            if method == "DELETE":
+                self.__cancel(order)
+            return PaperResponse(200, dict(order))
+
+        if path == "/api/v3/openOrders" and method == "DELETE":
+            symbol = params["symbol"].upper()
+            orders = [order for order in list(self.__open_orders.values()) if order["symbol"] == symbol]
+            for order in orders:
+                self.__cancel(order)
+            return PaperResponse(200, [dict(order) for order in orders])
+
+        if path == "/api/v3/userDataStream":
+            return PaperResponse(200, {"listenKey": "paper"} if method == "POST" else {})
+
+        return PaperResponse(404, {"code": -1100, "msg": f"Unknown endpoint {method} {path}."})
+
+    def get(self, path, params=None, priority=None):
+        return self.request("GET", path, params=params)
+
+    def post(self, path, params=None, priority=None):
+        return self.request("POST", path, params=params)
+
+    def put(self, path, params=None, priority=None):
+        return self.request("PUT", path, params=params)
+
+    def delete(self, path, params=None, priority=None):
+        return self.request("DELETE", path, params=params)
+
+    def close(self):
+        pass
+
+    def __now(self):
+        return int(self._clock.time() * 1000)
+
+    # ----- MARKET DATA ----- #
+
+    def __get_resampled(self, symbol, interval):
+        """
+        Resamples all base candles of a symbol to an interval once. The last candle may still be open at the time
+        of the clock, that's handled in __get_klines.
+        """
+
+        key = (symbol, interval)
+        if key not in self.__resampled:
+            rows = self.__candles[symbol]
+            length = INTERVALS_MS[interval]
+            buckets = rows[:, 0].astype(np.int64) // length * length
+            starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+            ends = np.append(starts[1:], len(rows)) - 1
+
+            self.__resampled[key] = np.column_stack((
+                buckets[starts], rows[starts, 1], np.maximum.reduceat(rows[:, 2], starts),
+                np.minimum.reduceat(rows[:, 3], starts), rows[ends, 4], np.add.reduceat(rows[:, 5], starts)))
+        return self.__resampled[key]
+
+    def __get_klines(self, symbol, interval, limit, start_time=None):
+        symbol = symbol.upper()
+        length = INTERVALS_MS[interval]
+        now = self.__now()
+        candles = self.__get_resampled(symbol=symbol, interval=interval)
+        closed = np.searchsorted(candles[:, 0] + length, now, side="right")
+        selected = [candles[:closed]]
+
+        # The open candle only contains the base candles that are closed at the time of the clock.
+        rows = self.__candles[symbol]
+        open_time = now // length * length
+        first = np.searchsorted(rows[:, 0], open_time)
+        last = np.searchsorted(rows[:, 0] + self._base_ms, now, side="right")
+        if last > first:
+            part = rows[first:last]
+            selected.append([[open_time, part[0, 1], part[:, 2].max(), part[:, 3].min(), part[-1, 4],
+                              part[:, 5].sum()]])
+
+        klines = np.concatenate(selected) if len(selected) > 1 else selected[0]
+        if start_time is not None:
+            klines = klines[np.searchsorted(klines[:, 0], int(start_time)):][:limit]
+        else:
+            klines = klines[-limit:]
+
+        return [[int(row[0]), f"{row[1]:.8f}", f"{row[2]:.8f}", f"{row[3]:.8f}", f"{row[4]:.8f}", f"{row[5]:.8f}",
+                 int(row[0]) + length - 1, "0", 0, "0", "0", "0"] for row in klines]
+
+    def __get_ticker(self, symbol):
+        return {"symbol": symbol.upper(), "price": f"{self.get_price(symbol):.8f}"}
+
+    def __get_symbol_info(self, symbol):
+        symbol = symbol.upper()
+        if symbol in self._symbol_info:
+            return self._symbol_info[symbol]
+        return {"symbol": symbol, "filters": [{"filterType": "PRICE_FILTER", "tickSize": "0.01000000"},
+                                              {"filterType": "LOT_SIZE", "stepSize": "0.00001000"}]}
+
+    # ----- ORDERS ----- #
+
+    def __split_symbol(self, symbol):
+        return symbol.lower()[:-len(self._fiat)], self._fiat
+
+    def __post_order(self, params):
+        symbol = params["symbol"].upper()
+        side = params["side"].upper()
+        quantity = float(params["quantity"])
+        price = float(params.get("price") or self.get_price(symbol))
+        base, quote = self.__split_symbol(symbol)
+
+        # The funds of an open order are locked until it's filled or cancelled.
+        asset, amount = (quote, price * quantity) if side == "BUY" else (base, quantity)
+        balance = self.__balances.setdefault(asset, {"free": 0.0, "locked": 0.0})
+        if balance["free"] < amount - 1e-12:
+            return PaperResponse(400, {"code": -2010, "msg": "Account has insufficient balance for requested action."})
+
+        balance["free"] -= amount
+        balance["locked"] += amount
+        self.__updated_at = self.__now()
+
+        order = {
+            "symbol": symbol,
+            "orderId": next(self.__order_ids),
+            "clientOrderId": params.get("newClientOrderId") or f"paper{len(self.__orders)}",
+            "transactTime": self.__now(),
+            "updateTime": self.__now(),
+            "price": f"{price:.8f}",
+            "origQty": f"{quantity:.8f}",
+            "executedQty": "0.00000000",
+            "cummulativeQuoteQty": "0.00000000",
+            "status": "NEW",
+            "timeInForce": "GTC",
+            "type": params["type"].upper(),
+            "side": side,
+        }
+        self.__orders[order["orderId"]] = order
+        self.__orders[order["clientOrderId"]] = order
+        self.__open_orders[order["orderId"]] = order
+
+        # A limit order that crosses the current price is filled right away.
+        current = self.get_price(symbol)
+        if (side == "BUY" and price >= current) or (side == "SELL" and price <= current):
+            self.__fill(order)
+        return PaperResponse(200, dict(order))
+
+    def __get_order(self, params):
+        if "orderId" in params:
+            return self.__orders.get(int(params["orderId"]))
+        return self.__orders.get(params.get("origClientOrderId"))
+
+    def __match(self):
+        """
+        Fills the open orders that the base candles closed since the last match have crossed.
+        """
+
+        now = self.__now()
+        if self.__open_orders and now > self.__last_match:
+            for order in list(self.__open_orders.values()):
+                rows = self.__candles[order["symbol"]]
+                close_times = rows[:, 0] + self._base_ms
+                first = np.searchsorted(close_times, self.__last_match, side="right")
+                last = np.searchsorted(close_times, now, side="right")
+                if last <= first:
+                    continue
+
+                price = float(order["price"])
+                if order["side"] == "BUY" and rows[first:last, 3].min() <= price:
+                    self.__fill(order)
+                elif order["side"] == "SELL" and rows[first:last, 2].max() >= price:
+                    self.__fill(order)
+
+        self.__last_match = max(self.__last_match, now)
+
+    def __fill(self, order):
+        base, quote = self.__split_symbol(order["symbol"])
+        price, quantity = float(order["price"]), float(order["origQty"])
+
+        if order["side"] == "BUY":
+            self.__balances[quote]["locked"] -= price * quantity
+            received, amount = base, quantity * (1 - self._fee)
+        else:
+            self.__balances[base]["locked"] -= quantity
+            received, amount = quote, price * quantity * (1 - self._fee)
+
+        self.__balances.setdefault(received, {"free": 0.0, "locked": 0.0})["free"] += amount
+        self.__updated_at = self.__now()
+        order.update(status="FILLED", executedQty=order["origQty"], cummulativeQuoteQty=f"{price * quantity:.8f}",
+                     updateTime=self.__updated_at)
+        del self.__open_orders[order["orderId"]]
+        self.__trades.append({"time": self.__now(), "symbol": order["symbol"], "side": order["side"],
+                              "price": price, "quantity": quantity})
+
+    def __cancel(self, order):
+        if order["orderId"] not in self.__open_orders:
+            return
+
+        base, quote = self.__split_symbol(order["symbol"])
+        price, quantity = float(order["price"]), float(order["origQty"])
+        asset, amount = (quote, price * quantity) if order["side"] == "BUY" else (base, quantity)
+        self.__balances[asset]["locked"] -= amount
+        self.__balances[asset]["free"] += amount
+        self.__updated_at = self.__now()
+        order.update(status="CANCELED", updateTime=self.__updated_at)
+        del self.__open_orders[order["orderId"]]
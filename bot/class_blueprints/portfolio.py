@@ -1,15 +1,22 @@
 from functions import format_border
 from class_blueprints.trader import get_balance
+from class_blueprints.account_state import AccountState
 import psutil
 
 
 class Portfolio:
 
-    def __init__(self, owner, fiat, cryptos):
+    def __init__(self, owner, fiat, cryptos, account_state=None):
+        """
+        :param account_state: (AccountState) The balances of the account by asset. Default downloads all balances
+        every hour.
+        """
+
         self._owner = owner
         self._fiat = fiat
         self._fiat_balance = 0
         self._crypto_balances = {crypto.get_symbol(): crypto for crypto in cryptos}
+        self._account_state = account_state or AccountState(fiat=fiat, fetch=get_balance)
         self.update_portfolio()
 
     # ----- GETTERS / SETTERS ----- #
@@ -37,21 +44,33 @@ class Portfolio:
     def crypto_balances(self):
         return self._crypto_balances
 
+    @property
+    def account_state(self):
+        return self._account_state
+
     # ----- CLASS METHODS ----- #
 
     def update_portfolio(self):
         """
-        Updates all the crypto balances in the portfolio.
+        Updates all the crypto balances in the portfolio from the account state. The Binance API is only asked for
+        all balances when a resync is due.
         """
 
-        data = get_balance()
-
-        for balance in data["balances"]:
-            if balance["asset"].lower() == self._fiat:
-                self._fiat_balance = float(balance["free"])
+        self._account_state.refresh()
+        self._fiat_balance = self._account_state.get_balance(self._fiat)
 
         for symbol, crypto in self._crypto_balances.items():
-            crypto.update_balance(data=data)
+            crypto.update_balance(account_state=self._account_state)
+
+    def process_fill(self, receipt):
+        """
+        Updates the balances with a filled order.
+
+        :param receipt: (dict) The receipt of the order from the Binance API.
+        """
+
+        self._account_state.apply_fill(receipt)
+        self.update_portfolio()
 
     def query_crypto_balance(self, crypto):
         """
@@ -88,4 +107,5 @@ class Portfolio:
         for symbol, crypto in self._crypto_balances.items():
             print(f"Current {crypto.name.title()} balance: {crypto.balance}.")
 
-        print(f"Current CPU usage: {psutil.cpu_percent(4)}.\n")
+        # Usage since the last call, measuring over a fixed interval would block the bot for that interval.
+        print(f"Current CPU usage: {psutil.cpu_percent()}.\n")
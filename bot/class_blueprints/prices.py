@@ -0,0 +1,47 @@
+from class_blueprints.trader import get_latest_prices
+
+
+class PriceSnapshot:
+
+    def __init__(self, symbols):
+        self._symbols = [symbol.lower() for symbol in symbols]
+        self._prices = {}
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def symbols(self):
+        return self._symbols
+
+    # ----- CLASS METHODS ----- #
+
+    def refresh(self):
+        """
+        Fetches the latest prices of all symbols in one request.
+        """
+
+        data = get_latest_prices(assets=self._symbols)
+        self._prices = {ticker["symbol"].lower(): float(ticker["price"]) for ticker in data}
+
+    def update(self, symbol, price):
+        """
+        Sets the price of a symbol, ie. from the market stream.
+
+        :param symbol: (str) The symbol of the asset.
+        :param price: (float) The latest price.
+        """
+
+        self._prices[symbol.lower()] = price
+
+    def get_price(self, symbol):
+        """
+        Returns the price of a symbol from the latest snapshot. The snapshot is refreshed when the symbol isn't in it.
+
+        :param symbol: (str) The symbol of the asset.
+        :return: (float) The latest price.
+        """
+
+        symbol = symbol.lower()
+        if symbol not in self._prices:
+            self.refresh()
+        return self._prices[symbol]
@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import threading
+import time
+
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+# Request weights of the endpoints that the bot uses, by method and path.
+ENDPOINT_WEIGHTS = {
+    ("GET", "/api/v3/klines"): 2,
+    ("GET", "/api/v3/exchangeInfo"): 20,
+    ("GET", "/api/v3/account"): 20,
+    ("GET", "/api/v3/order"): 4,
+    ("POST", "/api/v3/order"): 1,
+    ("DELETE", "/api/v3/order"): 1,
+    ("DELETE", "/api/v3/openOrders"): 1,
+    ("POST", "/api/v3/userDataStream"): 2,
+    ("PUT", "/api/v3/userDataStream"): 2,
+    ("DELETE", "/api/v3/userDataStream"): 2,
+}
+
+# Orders come first, price data for the stop losses second and history downloads last.
+ENDPOINT_PRIORITIES = {
+    "/api/v3/order": HIGH,
+    "/api/v3/openOrders": HIGH,
+    "/api/v3/userDataStream": HIGH,
+    "/api/v3/klines": LOW,
+    "/api/v3/exchangeInfo": LOW,
+}
+
+
+def get_weight(method, path, params=None):
+    """
+    Returns the request weight of an endpoint.
+
+    :param method: (str) The HTTP method ie. "GET".
+    :param path: (str) The path of the endpoint ie. "/api/v3/order".
+    :param params: (dict) The query parameters.
+    :return: (int) The request weight.
+    """
+
+    if path == "/api/v3/ticker/price":
+        return 2 if params and "symbol" in params else 4
+    return ENDPOINT_WEIGHTS.get((method, path), 1)
+
+
+def get_priority(path):
+    return ENDPOINT_PRIORITIES.get(path, NORMAL)
+
+
+class RateLimiter:
+
+    def __init__(self, weight_limit=1200, interval=60, reserve=0.1, share=1.0):
+        """
+        Token bucket for the request weight of the Binance API. The bucket refills at the weight limit per interval
+        and is corrected with the used weight that the API reports. Requests that have to wait are served by
+        priority, and requests that aren't high priority leave a reserve in the bucket for the orders.
+
+        :param weight_limit: (int) The request weight that may be used per interval.
+        :param interval: (float) The length of the interval in seconds.
+        :param reserve: (float) Part of the weight limit that is kept for high priority requests.
+        :param share: (float) Part of the weight limit this process may use, when several processes use the same
+        key. The used weight that the API reports is for all of them, this process gets its share of what's left.
+        """
+
+        self._weight_limit = weight_limit
+        self._share = share
+        self._capacity = weight_limit * share
+        self._rate = self._capacity / interval
+        self._reserve = self._capacity * reserve
+        self.__tokens = float(self._capacity)
+        self.__last_refill = time.monotonic()
+        self.__paused_until = 0.0
+        self.__waiters = []
+        self.__counter = itertools.count()
+        self.__condition = threading.Condition()
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def weight_limit(self):
+        return self._weight_limit
+
+    @property
+    def share(self):
+        return self._share
+
+    @property
+    def available(self):
+        with self.__condition:
+            self.__refill()
+            return self.__tokens
+
+    # ----- CLASS METHODS ----- #
+
+    def acquire(self, weight, priority=NORMAL):
+        """
+        Blocks until the weight of a request can be used.
+
+        :param weight: (int) The request weight.
+        :param priority: (int) HIGH, NORMAL or LOW.
+        """
+
+        entry = (priority, next(self.__counter))
+
+        with self.__condition:
+            heapq.heappush(self.__waiters, entry)
+
+            try:
+                while True:
+                    self.__refill()
+                    now = time.monotonic()
+
+                    if now < self.__paused_until:
+                        timeout = self.__paused_until - now
+                    elif self.__waiters[0] is entry:
+                        floor = 0 if priority == HIGH else self._reserve
+                        needed = min(weight + floor, self._capacity)
+
+                        if self.__tokens >= needed:
+                            self.__tokens -= weight
+                            return
+                        timeout = (needed - self.__tokens) / self._rate
+                    else:
+                        timeout = None
+
+                    self.__condition.wait(timeout)
+            finally:
+                self.__waiters.remove(entry)
+                heapq.heapify(self.__waiters)
+                self.__condition.notify_all()
+
+    def update(self, used_weight):
+        """
+        Corrects the bucket with the weight that the API has counted, ie. when other processes use the same key.
+
+        :param used_weight: (int) The used weight of the current interval.
+        """
+
+        with self.__condition:
+            self.__refill()
+            self.__tokens = min(self.__tokens, (self._weight_limit - used_weight) * self._share)
+
+    def pause(self, seconds):
+        """
+        Holds all requests, ie. after the API answered with 429 or 418.
+
+        :param seconds: (float) The number of seconds to wait.
+        """
+
+        with self.__condition:
+            self.__paused_until = max(self.__paused_until, time.monotonic() + seconds)
+            self.__tokens = min(self.__tokens, 0.0)
+            self.__condition.notify_all()
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(self._capacity, self.__tokens + (now - self.__last_refill) * self._rate)
+        self.__last_refill = now
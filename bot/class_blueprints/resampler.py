@@ -0,0 +1,108 @@
+import numpy as np
+
+
+def aggregate(open_times, closes, length):
+    """
+    Resamples candles to a higher interval. The candles are grouped by the multiple of the length since the epoch
+    they open in, the same boundaries Binance uses, and the close of a group is the close of its last candle.
+
+    :param open_times: (array) Open times in ms of the base candles.
+    :param closes: (array) Close prices of the base candles.
+    :param length: (int) Length in ms of the higher interval.
+    :return: (tuple) Open times and close prices of the resampled candles.
+    """
+
+    if len(open_times) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    buckets = open_times // length * length
+    last_of_bucket = np.flatnonzero(np.diff(buckets, append=buckets[-1] + length))
+    return buckets[last_of_bucket], closes[last_of_bucket]
+
+
+class Resampler:
+
+    def __init__(self, base_ms, max_candles):
+        """
+        Keeps the latest candles of one base interval and derives higher intervals from them. When candles are added,
+        only the higher candles from the first new base candle onwards are made again.
+
+        :param base_ms: (int) Length in ms of the base interval.
+        :param max_candles: (int) The number of base candles that are kept.
+        """
+
+        self._base_ms = base_ms
+        self._max_candles = max_candles
+        self._open_times = np.empty(0, dtype=np.int64)
+        self._closes = np.empty(0, dtype=np.float64)
+        self.__derived = {}
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def max_candles(self):
+        return self._max_candles
+
+    @property
+    def last_open_time(self):
+        return int(self._open_times[-1]) if len(self._open_times) else None
+
+    # ----- CLASS METHODS ----- #
+
+    def update(self, open_times, closes):
+        """
+        Adds base candles. Stored candles from the first new open time onwards are replaced, ie. the open candle that
+        has moved on since the last update.
+
+        :param open_times: (array) Open times in ms, in order.
+        :param closes: (array) Close prices.
+        """
+
+        open_times = np.asarray(open_times, dtype=np.int64)
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(open_times) == 0:
+            return
+
+        keep = np.searchsorted(self._open_times, open_times[0])
+        self._open_times = np.concatenate((self._open_times[:keep], open_times))[-self._max_candles:]
+        self._closes = np.concatenate((self._closes[:keep], closes))[-self._max_candles:]
+
+        for length in self.__derived:
+            self.__derived[length] = self.__extend(length=length, first_open_time=int(open_times[0]))
+
+    def get(self, length, limit):
+        """
+        Returns the latest candles of an interval. The last candle is still open when the last base candle is.
+
+        :param length: (int) Length in ms of the interval, a multiple of the base interval.
+        :param limit: (int) The maximum number of candles.
+        :return: (tuple) Open times and close prices.
+        """
+
+        if length == self._base_ms:
+            return self._open_times[-limit:], self._closes[-limit:]
+
+        if length % self._base_ms:
+            raise ValueError(f"An interval of {length} ms can't be made from candles of {self._base_ms} ms.")
+
+        if length not in self.__derived:
+            self.__derived[length] = aggregate(open_times=self._open_times, closes=self._closes, length=length)
+
+        open_times, closes = self.__derived[length]
+        return open_times[-limit:], closes[-limit:]
+
+    def __extend(self, length, first_open_time):
+        open_times, closes = self.__derived[length]
+
+        # The higher candle that the first new base candle falls in is made again, with all its base candles.
+        start = first_open_time // length * length
+        keep = np.searchsorted(open_times, start)
+        base_start = np.searchsorted(self._open_times, start)
+        new_open_times, new_closes = aggregate(open_times=self._open_times[base_start:],
+                                               closes=self._closes[base_start:], length=length)
+        open_times = np.concatenate((open_times[:keep], new_open_times))
+        closes = np.concatenate((closes[:keep], new_closes))
+
+        # Higher candles of which all base candles were dropped are dropped as well.
+        first = np.searchsorted(open_times, self._open_times[0] // length * length)
+        return open_times[first:], closes[first:]
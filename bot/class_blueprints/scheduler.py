@@ -0,0 +1,87 @@
+import heapq
+import itertools
+import math
+from collections import namedtuple
+
+# A deadline that has passed. Missed is the number of later deadlines of the same event that passed as well, they
+# are not run separately.
+DueEvent = namedtuple("DueEvent", ["name", "deadline", "missed"])
+
+
+class Scheduler:
+
+    def __init__(self, clock):
+        """
+        Keeps the deadlines of repeating events in a heap, ie. the close of every 1m and 30m candle. Waiting for the
+        next deadline sleeps instead of polling the time.
+
+        :param clock: (Clock) The clock that tells the time and sleeps.
+        """
+
+        self._clock = clock
+        self.__intervals = {}
+        self.__deadlines = []
+        self.__sequence = itertools.count()
+
+    # ----- CLASS METHODS ----- #
+
+    def add(self, name, interval, offset=0):
+        """
+        Schedules an event at every multiple of the interval since the epoch, so the deadlines are aligned to the
+        candle closes of that interval.
+
+        :param name: (str) The name of the event ie. "30m".
+        :param interval: (float) Seconds between the deadlines.
+        :param offset: (float) Seconds after the candle close that the event is due.
+        """
+
+        self.__intervals[name] = (interval, offset)
+        now = self._clock.time()
+        deadline = math.floor((now - offset) / interval) * interval + interval + offset
+        heapq.heappush(self.__deadlines, (deadline, next(self.__sequence), name))
+
+    def time_until_next(self):
+        """
+        :return: (float) Seconds until the next deadline, 0 when it has already passed.
+        """
+
+        if not self.__deadlines:
+            return math.inf
+        return max(self.__deadlines[0][0] - self._clock.time(), 0)
+
+    def pop_due(self):
+        """
+        Returns the events of which the deadline has passed and schedules their next deadline. When the bot was
+        busy for longer than an interval, the event is due once and the deadlines that were missed are skipped.
+
+        :return: (list) The due events in order of their deadline.
+        """
+
+        now = self._clock.time()
+        due = []
+
+        while self.__deadlines and self.__deadlines[0][0] <= now:
+            deadline, _, name = heapq.heappop(self.__deadlines)
+            interval, offset = self.__intervals[name]
+            missed = int((now - deadline) // interval)
+
+            heapq.heappush(self.__deadlines, (deadline + (missed + 1) * interval, next(self.__sequence), name))
+            due.append(DueEvent(name=name, deadline=deadline, missed=missed))
+        return due
+
+    def wait(self, idle=None):
+        """
+        Waits until at least one event is due.
+
+        :param idle: (function) Waits for a number of seconds, ie. while processing a stream. Default is the sleep
+        of the clock.
+        :return: (list) The due events in order of their deadline.
+        """
+
+        idle = idle or self._clock.sleep
+
+        while True:
+            due = self.pop_due()
+            if due:
+                return due
+            idle(self.time_until_next())
@@ -1,13 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from database import StopLoss
-import config
+from class_blueprints.stop_loss_repository import repository as default_repository
 
 
 class TrailingStopLoss:
 
-    def __init__(self):
-        self.__engine = create_engine(f"sqlite:///{config.db_path}")
+    def __init__(self, repository=None, stop_loss_book=None):
+        self.__repository = repository or default_repository
+        self.__book = stop_loss_book or book
         self.__index = None
         self.__strategy_name = None
         self.__asset = None
@@ -32,21 +30,47 @@ class TrailingStopLoss:
         self.__highest = price
         self.__trail_ratio = trail_ratio
         self._trail = self.__highest * self.__trail_ratio
-        self.__to_sql(update=False)
+        self.__index = self.__repository.add(self)
+        self.__book.register(self)
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def strategy_name(self):
+        return self.__strategy_name
+
+    @property
+    def asset(self):
+        return self.__asset
 
     @property
     def buy_price(self):
         return self._buy_price
 
+    @property
+    def highest(self):
+        return self.__highest
+
+    @property
+    def trail_ratio(self):
+        return self.__trail_ratio
+
     @property
     def trail(self):
         return self._trail
 
+    @property
+    def is_open(self):
+        return self.__open
+
     # ----- CLASS METHODS ----- #
 
     def adjust_stop_loss(self, price):
         """
         Checks if the current price is higher than the current highest and adjusts the trailing stop loss accordingly.
+        The change is written to the database with the next flush of the repository.
 
         :param price: (float) The latest price of the asset.
         """
@@ -54,7 +78,7 @@ class TrailingStopLoss:
         if price > self.__highest:
             self.__highest = price
             self._trail = self.__highest * self.__trail_ratio
-            self.__to_sql(update=True)
+            self.__repository.mark_dirty(self)
 
     def close_stop_loss(self):
         """
@@ -62,60 +86,87 @@ class TrailingStopLoss:
         """
 
         self.__open = False
-        self.__to_sql(update=True)
+        self.__repository.save(self)
+        self.__book.unregister(self)
 
-    def __to_sql(self, update=False):
+    def load(self, symbol):
         """
-        Saves the trailing stop loss in a SQL database for when the bot needs to be rebooted.
-        :param update: (bool) To determine if the trailing stop loss already exists and merely needs to be updated.
+        Loads the trailing stop loss from the database.
+
+        :param symbol: (str) Symbol of the asset that needs to be queried.
         """
 
-        session = sessionmaker(self.__engine)
+        self.restore(row=self.__repository.load(symbol=symbol))
 
-        with session() as connection:
-            if update:
-                stop_loss = connection.query(StopLoss).filter_by(asset=self.__asset, open_stop_loss=True).first()
-                stop_loss.highest = self.__highest
-                stop_loss.trail = self._trail
-                stop_loss.open_stop_loss = self.__open
+    def restore(self, row):
+        """
+        Sets the trailing stop loss from a row of the database.
 
-            else:
-                new_stop_loss = StopLoss(
-                    strategy_name=self.__strategy_name,
-                    asset=self.__asset,
-                    buy_price=self._buy_price,
-                    highest=self.__highest,
-                    trail_ratio=self.__trail_ratio,
-                    trail=self._trail,
-                    open_stop_loss=self.__open
-                )
+        :param row: (object) StopLoss row.
+        """
 
-                connection.add(new_stop_loss)
-                self.__index = new_stop_loss.index
+        self.__index = row.index
+        self.__strategy_name = row.strategy_name
+        self.__asset = row.asset
+        self._buy_price = row.buy_price
+        self.__highest = row.highest
+        self.__trail_ratio = row.trail_ratio
+        self._trail = row.trail
+        self.__open = row.open_stop_loss
 
-            connection.commit()
+    def query(self):
+        return self.__repository.get(index=self.__index)
 
-    def load(self, symbol):
+
+class StopLossBook:
+
+    def __init__(self, repository=None):
         """
-        Loads the trailing stop loss from the database.
+        Keeps the open trailing stop losses in memory by symbol. At runtime the book is leading, the repository
+        persists the changes behind it.
 
-        :param symbol: (str) Symbol of the asset that needs to be queried.
+        :param repository: (object) The repository that persists the stop losses.
         """
 
-        session = sessionmaker(self.__engine)
+        self.__repository = repository or default_repository
+        self.__stop_losses = {}
+        self.__loaded = False
+
+    # ----- CLASS METHODS ----- #
 
-        with session() as connection:
-            result = connection.query(StopLoss).filter_by(asset=symbol, open_stop_loss=True).first()
-            self.__index = result.index
-            self.__strategy_name = result.strategy_name
-            self.__asset = result.asset
-            self._buy_price = result.buy_price
-            self.__highest = result.highest
-            self.__trail_ratio = result.trail_ratio
-            self._trail = result.trail
+    def load(self):
+        """
+        Recovers the journal of the repository and loads all open stop losses with one query.
+        """
+
+        self.__repository.recover()
+        self.__stop_losses = {}
+
+        for row in self.__repository.load_open():
+            stop_loss = TrailingStopLoss(repository=self.__repository, stop_loss_book=self)
+            stop_loss.restore(row=row)
+            self.__stop_losses[stop_loss.asset] = stop_loss
+
+        self.__loaded = True
+
+    def get(self, symbol):
+        """
+        Returns the open trailing stop loss of an asset.
+
+        :param symbol: (str) The symbol of the asset.
+        :return: (object) The trailing stop loss, or None when there's no open stop loss.
+        """
+
+        if not self.__loaded:
+            self.load()
+        return self.__stop_losses.get(symbol)
+
+    def register(self, stop_loss):
+        self.__stop_losses[stop_loss.asset] = stop_loss
+
+    def unregister(self, stop_loss):
+        if self.__stop_losses.get(stop_loss.asset) is stop_loss:
+            del self.__stop_losses[stop_loss.asset]
 
-    def query(self):
-        session = sessionmaker(self.__engine)
 
-        with session() as connection:
-            return connection.query(StopLoss).filter_by(index=self.__index).first()
+book = StopLossBook()
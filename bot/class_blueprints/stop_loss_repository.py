@@ -0,0 +1,285 @@
+import json
+import os
+import threading
+import time
+from sqlalchemy import update, bindparam
+from sqlalchemy.orm import sessionmaker, scoped_session
+from database import StopLoss, get_engine
+from class_blueprints.metrics import stop_loss_write_latency
+import config
+
+
+class StopLossJournal:
+
+    def __init__(self, path):
+        """
+        Append-only file with the latest changes of the trailing stop losses. Changes are written in batches with
+        one fsync per batch.
+
+        :param path: (str) The path of the journal file.
+        """
+
+        self._path = path
+        self.__file = None
+
+    # ----- CLASS METHODS ----- #
+
+    def append(self, changes):
+        """
+        Appends changes to the journal and makes sure they are on disk before returning.
+
+        :param changes: (list) Changes as dictionaries.
+        """
+
+        if self.__file is None:
+            self.__file = open(self._path, "a", encoding="utf-8")
+
+        self.__file.write("".join(json.dumps(change, separators=(",", ":")) + "\n" for change in changes))
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def read(self):
+        """
+        Reads the journal. A line that was only partly written during a crash is skipped.
+
+        :return: (dict) The latest change per stop loss index.
+        """
+
+        changes = {}
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    changes[change["stop_loss_index"]] = change
+        except FileNotFoundError:
+            pass
+        return changes
+
+    def truncate(self):
+        """
+        Empties the journal after its changes were written to the database.
+        """
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+        with open(self._path, "w", encoding="utf-8") as file:
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class StopLossRepository:
+
+    def __init__(self, engine=None, journal_path=None, checkpoint_interval=300):
+        """
+        Stores the trailing stop losses of all strategies. Changes to the highest price and the trail are collected
+        and written to a journal once per tick. The journal is written to the database every checkpoint interval,
+        and when the bot starts.
+
+        :param engine: (Engine) The engine to use. Default is the engine that is shared by the bot.
+        :param journal_path: (str) The path of the journal. Default is next to the database.
+        :param checkpoint_interval: (int) Seconds between writing the journal to the database.
+        """
+
+        self.__engine = engine or get_engine()
+        self.__session = scoped_session(sessionmaker(self.__engine))
+        self.__journal = StopLossJournal(path=journal_path or f"{config.db_path}.journal")
+        self._checkpoint_interval = checkpoint_interval
+        self.__pending = {}
+        self.__journaled = {}
+        self.__last_checkpoint = time.monotonic()
+        # The lock guards the queued changes, the io lock the journal and the database, so queueing a change
+        # never waits on an fsync.
+        self.__lock = threading.Lock()
+        self.__io_lock = threading.Lock()
+
+    # ----- CLASS METHODS ----- #
+
+    def add(self, stop_loss):
+        """
+        Saves a new trailing stop loss right away.
+
+        :param stop_loss: (object) The trailing stop loss.
+        :return: (int) The index of the stop loss in the database.
+        """
+
+        new_stop_loss = StopLoss(
+            strategy_name=stop_loss.strategy_name,
+            asset=stop_loss.asset,
+            buy_price=stop_loss.buy_price,
+            highest=stop_loss.highest,
+            trail_ratio=stop_loss.trail_ratio,
+            trail=stop_loss.trail,
+            open_stop_loss=stop_loss.is_open
+        )
+
+        session = self.__session()
+        try:
+            with stop_loss_write_latency.time(operation="insert"):
+                session.add(new_stop_loss)
+                session.commit()
+            return new_stop_loss.index
+        finally:
+            self.__session.remove()
+
+    def mark_dirty(self, stop_loss):
+        """
+        Queues the changes of a trailing stop loss for the next flush.
+
+        :param stop_loss: (object) The trailing stop loss that changed.
+        """
+
+        with self.__lock:
+            self.__pending[stop_loss.index] = {
+                "stop_loss_index": stop_loss.index,
+                "highest": stop_loss.highest,
+                "trail": stop_loss.trail,
+                "open_stop_loss": stop_loss.is_open,
+            }
+
+    def save(self, stop_loss):
+        """
+        Makes the changes of a trailing stop loss durable right away, together with all queued changes.
+
+        :param stop_loss: (object) The trailing stop loss that changed.
+        """
+
+        self.mark_dirty(stop_loss)
+        self.flush()
+
+    def flush(self):
+        """
+        Appends all queued changes to the journal with one fsync. Writes the journal to the database when the
+        checkpoint interval has passed.
+
+        :return: (int) The number of stop losses that were written.
+        """
+
+        with self.__io_lock:
+            with self.__lock:
+                pending = list(self.__pending.values())
+                self.__pending.clear()
+
+            if pending:
+                try:
+                    with stop_loss_write_latency.time(operation="journal"):
+                        self.__journal.append(pending)
+                except OSError:
+                    # Keep the changes for the next flush, unless a newer change was queued in the meantime.
+                    with self.__lock:
+                        for change in pending:
+                            self.__pending.setdefault(change["stop_loss_index"], change)
+                    raise
+
+                for change in pending:
+                    self.__journaled[change["stop_loss_index"]] = change
+
+            if self.__journaled and time.monotonic() - self.__last_checkpoint > self._checkpoint_interval:
+                self.__checkpoint(changes=list(self.__journaled.values()))
+
+        return len(pending)
+
+    def checkpoint(self):
+        """
+        Writes all changes to the journal and then the journal to the database.
+        """
+
+        self.flush()
+        with self.__io_lock:
+            self.__checkpoint(changes=list(self.__journaled.values()))
+
+    def recover(self):
+        """
+        Writes the changes in the journal that weren't written to the database yet, ie. after a crash. Also adds
+        the indexes of the stop loss table when the database was created before they existed.
+
+        :return: (int) The number of stop losses that were recovered.
+        """
+
+        for index in StopLoss.__table__.indexes:
+            index.create(self.__engine, checkfirst=True)
+
+        with self.__io_lock:
+            changes = self.__journal.read()
+            changes.update(self.__journaled)
+            self.__checkpoint(changes=list(changes.values()))
+        return len(changes)
+
+    def __checkpoint(self, changes):
+        if changes:
+            statement = update(StopLoss.__table__) \
+                .where(StopLoss.__table__.c.index == bindparam("stop_loss_index")) \
+                .values(highest=bindparam("highest"), trail=bindparam("trail"),
+                        open_stop_loss=bindparam("open_stop_loss"))
+
+            session = self.__session()
+            try:
+                with stop_loss_write_latency.time(operation="checkpoint"):
+                    session.execute(statement, changes)
+                    session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                self.__session.remove()
+
+        # With synchronous=NORMAL the commit isn't synced yet. A full checkpoint syncs the write-ahead log and
+        # copies it to the database file, only then the journal can be emptied.
+        with self.__engine.connect() as connection:
+            busy, *_ = connection.exec_driver_sql("PRAGMA wal_checkpoint(FULL)").fetchone()
+        self.__last_checkpoint = time.monotonic()
+
+        if busy:
+            print("The database is busy. The stop loss journal is kept until the next checkpoint.")
+            return
+
+        self.__journal.truncate()
+        self.__journaled.clear()
+
+    def load_open(self):
+        """
+        Loads all open trailing stop losses with one query on the (open_stop_loss, asset) index.
+
+        :return: (list) The StopLoss rows.
+        """
+
+        session = self.__session()
+        try:
+            return session.query(StopLoss).filter_by(open_stop_loss=True).all()
+        finally:
+            self.__session.remove()
+
+    def load(self, symbol):
+        """
+        Loads the open trailing stop loss of an asset.
+
+        :param symbol: (str) Symbol of the asset.
+        :return: (object) The StopLoss row, or None when there's no open stop loss.
+        """
+
+        session = self.__session()
+        try:
+            return session.query(StopLoss).filter_by(asset=symbol, open_stop_loss=True).first()
+        finally:
+            self.__session.remove()
+
+    def get(self, index):
+        """
+        Returns a trailing stop loss by its index.
+
+        :param index: (int) The index of the stop loss in the database.
+        :return: (object) The StopLoss row.
+        """
+
+        session = self.__session()
+        try:
+            return session.query(StopLoss).filter_by(index=index).first()
+        finally:
+            self.__session.remove()
+
+
+repository = StopLossRepository()
@@ -1,20 +1,109 @@
 from class_blueprints.data import Data
-from class_blueprints.stop_loss import TrailingStopLoss
-from class_blueprints.trader import get_balance, get_latest_price, get_history
+from class_blueprints.indicators import IndicatorEngine
+from class_blueprints.metrics import signal_latency
+from class_blueprints.stop_loss import TrailingStopLoss, book as stop_loss_book
+
+
+class SignalReader:
+
+    def __init__(self, symbol, kline_store, indicators=None):
+        """
+        Downloads the candles of an asset and calculates the indicators that the signals of the strategy are based on.
+        It holds no trades, so it can run in another process than the strategy.
+
+        :param symbol: (str) The symbol of the asset.
+        :param kline_store: (object) Serves the candles with get_candles.
+        :param indicators: (dict) The IndicatorEngine per interval, ie. from a warm start.
+        """
+
+        self._symbol = symbol
+        self._kline_store = kline_store
+        self._indicators = indicators or {"4h": IndicatorEngine(), "30m": IndicatorEngine(), "1h": IndicatorEngine()}
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def symbol(self):
+        return self._symbol
+
+    @property
+    def indicators(self):
+        return self._indicators
+
+    # ----- CLASS METHODS ----- #
+
+    def get_market_state(self):
+        """
+        :return: (str) "bull" when the 4h EMA_50 is above the EMA_200, otherwise "bear".
+        """
+
+        data = self._get_market_state_data()
+        if data.latest("EMA_50") > data.latest("EMA_200"):
+            return "bull"
+        return "bear"
+
+    def read(self):
+        """
+        Determines the market state and calculates the indicators of its scenario.
+
+        :return: (tuple) The market state and the Data of the scenario, or None when the EMA's can't be compared.
+        """
+
+        data = self._get_market_state_data()
+
+        if data.latest("EMA_50") > data.latest("EMA_200"):
+            return "bull", self._get_bull_scenario_data()
+        elif data.latest("EMA_50") < data.latest("EMA_200"):
+            return "bear", self._get_bear_scenario_data()
+
+    def _get_market_state_data(self):
+        new_data = Data(data=self._kline_store.get_candles(symbol=self._symbol, interval="4h", limit=1000),
+                        indicators=self._indicators["4h"])
+        new_data.set_ema(window=50)
+        new_data.set_ema(window=200)
+        return new_data
+
+    def _get_bull_scenario_data(self):
+        new_data = Data(data=self._kline_store.get_candles(symbol=self._symbol, interval="30m", limit=1000),
+                        indicators=self._indicators["30m"])
+        new_data.set_ema(window=8)
+        new_data.set_ema(window=21)
+        return new_data
+
+    def _get_bear_scenario_data(self):
+        new_data = Data(data=self._kline_store.get_candles(symbol=self._symbol, interval="1h", limit=50),
+                        indicators=self._indicators["1h"])
+        new_data.set_rsi()
+        return new_data
 
 
 class Strategy:
 
-    def __init__(self, symbol, name, crypto):
+    def __init__(self, symbol, name, crypto, kline_store, prices, state=None):
+        """
+        :param kline_store: (object) Serves the candles of the signals. None when the signals are read by another
+        process, ie. a shard of the ShardedTraderBot, and passed to decide.
+        """
+
         self._name = name
         self._symbol = symbol
         self._type = "hodl"
+        self._prices = prices
+        self._crypto = crypto
+        self._reader = None
+        self._market_state = None
 
-        data = self._get_market_state_data()
-        if data.df["EMA_50"].iloc[-1] > data.df["EMA_200"].iloc[-1]:
-            self._market_state = "bull"
-        else:
-            self._market_state = "bear"
+        if kline_store is not None:
+            # A warm start restores the state that get_state saved.
+            indicators = state["indicators"] if state is not None else None
+            self._reader = SignalReader(symbol=symbol, kline_store=kline_store, indicators=indicators)
+
+        if state is not None:
+            self._market_state = state["market_state"]
+
+        # The restored indicators only need the candles that closed since the snapshot.
+        if self._market_state is None and self._reader is not None:
+            self._market_state = self._reader.get_market_state()
 
         self._stop_loss = self._set_stop_loss(crypto=crypto)
 
@@ -48,15 +137,17 @@ class Strategy:
         :return: (object) Returns trailing stop loss object or none when no trailing stop loss is active.
         """
 
-        try:
-            stop_loss = TrailingStopLoss()
-            stop_loss.load(symbol=self._symbol)
+        stop_loss = stop_loss_book.get(symbol=self._symbol)
 
-        except AttributeError:
+        if stop_loss is None:
             print("No Active stop loss found. Checking balance.")
-            price = float(get_latest_price(asset=self._symbol)["price"])
+            price = self._prices.get_price(symbol=self._symbol)
 
             if crypto.balance * price > 10:
+                # The trail depends on the market state, without a reader it's known after the first reading.
+                if self._market_state is None:
+                    return None
+
                 print("Substantial balance found. Setting trailing stop loss.")
                 stop_loss = TrailingStopLoss()
 
@@ -71,7 +162,7 @@ class Strategy:
                 return None
 
         else:
-            price = float(get_latest_price(asset=self._symbol)["price"])
+            price = self._prices.get_price(symbol=self._symbol)
 
             if crypto.balance * price < 10:
                 print("Something must have gone wrong, no active trade was found. Closing stop loss and\n"
@@ -86,60 +177,71 @@ class Strategy:
         return self._market_state
 
     # ----- CLASS METHODS ----- #
-    def _get_market_state_data(self):
-        new_data = Data(data=get_history(symbol=self._symbol, interval="4h", limit=1000))
-        new_data.set_ema(window=50)
-        new_data.set_ema(window=200)
-        return new_data
 
-    def _get_bull_scenario_data(self):
-        new_data = Data(data=get_history(symbol=self._symbol, interval="30m", limit=1000))
-        new_data.set_ema(window=8)
-        new_data.set_ema(window=21)
-        return new_data
+    def get_state(self):
+        """
+        :return: (dict) The indicators and market state, to restore the strategy with after a restart.
+        """
 
-    def _get_bear_scenario_data(self):
-        new_data = Data(data=get_history(symbol=self._symbol, interval="1h", limit=50))
-        new_data.set_rsi()
-        return new_data
+        return {"indicators": self._reader.indicators if self._reader else None, "market_state": self._market_state}
 
-    def check_stop_loss(self):
-        price = float(get_latest_price(asset=self._symbol)["price"])
+    def check_stop_loss(self, low=None, high=None):
+        """
+        Checks if the trailing stop loss is triggered and otherwise adjusts it to the highest price.
 
-        if price < self._stop_loss.trail and price < self._stop_loss.buy_price:
+        :param low: (float) The lowest price since the last check. Default is the latest price.
+        :param high: (float) The highest price since the last check. Default is the latest price.
+        :return: (str) "sell" when the stop loss is triggered, otherwise "continue".
+        """
+
+        price = self._prices.get_price(symbol=self._symbol)
+        low = price if low is None else low
+        high = price if high is None else high
+
+        if low < self._stop_loss.trail and low < self._stop_loss.buy_price:
             print("Trailing stop loss is triggered. Crypto will be sold.")
             return "sell"
-        self._stop_loss.adjust_stop_loss(price=price)
+        self._stop_loss.adjust_stop_loss(price=high)
         return "continue"
 
     def check_for_signal(self):
         """Check if current data gives off a buy or sell signal"""
-        data = self._get_market_state_data()
+        with signal_latency.time(symbol=self._symbol):
+            reading = self._reader.read()
 
-        if data.df["EMA_50"].iloc[-1] > data.df["EMA_200"].iloc[-1]:
-            self._market_state = "bull"
+            if reading:
+                market_state, data = reading
+                return data, self.decide(market_state=market_state, price=data.price, values=data.values)
 
-            bull_data = self._get_bull_scenario_data()
-            price = bull_data.df["Price"].iloc[-1]
+    def decide(self, market_state, price, values):
+        """
+        Decides on the action from the indicators that a SignalReader calculated.
 
-            if bull_data.df["EMA_8"].iloc[-1] > bull_data.df["EMA_21"].iloc[-1] and not self._stop_loss:
-                return bull_data, "buy"
+        :param market_state: (str) "bull" or "bear".
+        :param price: (float) The latest price.
+        :param values: (dict) The latest values of the indicators of the scenario of the market state.
+        :return: (str) "buy", "sell" or "continue".
+        """
 
-            elif bull_data.df["EMA_8"].iloc[-1] < bull_data.df["EMA_21"].iloc[-1] and self._stop_loss:
-                if price > self._stop_loss.buy_price:
-                    return bull_data, "sell"
+        if self._market_state is None and self._stop_loss is None:
+            self._market_state = market_state
+            self._stop_loss = self._set_stop_loss(crypto=self._crypto)
+        self._market_state = market_state
 
-            return bull_data, "continue"
+        if market_state == "bull":
+            if values["EMA_8"] > values["EMA_21"] and not self._stop_loss:
+                return "buy"
 
-        elif data.df["EMA_50"].iloc[-1] < data.df["EMA_200"].iloc[-1]:
-            self._market_state = "bear"
+            elif values["EMA_8"] < values["EMA_21"] and self._stop_loss:
+                if price > self._stop_loss.buy_price:
+                    return "sell"
 
-            bear_data = self._get_bear_scenario_data()
+            return "continue"
 
-            if bear_data.df["RSI"].iloc[-1] <= 30 and not self._stop_loss:
-                return bear_data, "buy"
+        if values["RSI"] <= 30 and not self._stop_loss:
+            return "buy"
 
-            elif bear_data.df["RSI"].iloc[-1] >= 40 and self._stop_loss:
-                return bear_data, "sell"
+        elif values["RSI"] >= 40 and self._stop_loss:
+            return "sell"
 
-            return bear_data, "continue"
+        return "continue"
@@ -0,0 +1,85 @@
+import threading
+from class_blueprints.candles import Candles
+from class_blueprints.clock import Clock
+from class_blueprints.kline_store import INTERVALS_MS
+from class_blueprints.resampler import Resampler
+
+
+class MultiTimeframeStore:
+
+    def __init__(self, kline_store, base_interval="30m", max_age=1, clock=None):
+        """
+        Serves the candles of every interval from one base interval per symbol, with the same get_candles as the
+        kline store. Only the base interval is downloaded, the higher intervals are resampled in memory, so all
+        intervals agree on the latest price.
+
+        :param kline_store: (KlineStore) The store of the base candles.
+        :param base_interval: (str) The interval that is downloaded, ie. "30m". The other intervals need to be a
+        multiple of it.
+        :param max_age: (float) Seconds the base candles of a symbol are used before the new candles are downloaded,
+        so the intervals of one signal check share one download.
+        :param clock: (Clock) The clock that tells the age of the candles. Default is real time.
+        """
+
+        self._kline_store = kline_store
+        self._base_interval = base_interval
+        self._base_ms = INTERVALS_MS[base_interval]
+        self._max_age = max_age
+        self._clock = clock or Clock()
+        self.__resamplers = {}
+        self.__updated_at = {}
+        self.__locks = {}
+        self.__lock = threading.Lock()
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def base_interval(self):
+        return self._base_interval
+
+    # ----- CLASS METHODS ----- #
+
+    def get_candles(self, symbol, interval, limit):
+        """
+        Returns the latest candles of an asset. The last candle is the open candle.
+
+        :param symbol: (str) The symbol of the asset.
+        :param interval: (str) The interval of the candles ie. "4h".
+        :param limit: (int) The number of candles that needs to be returned.
+        :return: (Candles) The candles.
+        """
+
+        symbol = symbol.lower()
+        length = INTERVALS_MS[interval]
+
+        # A long history of a high interval costs a lot of base candles, ie. 1000 4h candles are 8000 30m candles and
+        # eight paged requests when the symbol isn't in the store yet. The kline store keeps them, so after that only
+        # the candles since the last stored one are downloaded, also after a restart.
+        needed = limit * length // self._base_ms
+
+        with self.__get_lock(symbol):
+            resampler = self.__resamplers.get(symbol)
+            now = self._clock.monotonic()
+
+            # The first request, or one that needs a longer history, reads all base candles from the store.
+            if resampler is None or resampler.max_candles < needed:
+                candles = self._kline_store.get_candles(symbol=symbol, interval=self._base_interval, limit=needed)
+                resampler = Resampler(base_ms=self._base_ms, max_candles=needed)
+                resampler.update(open_times=candles.open_times, closes=candles.closes)
+                self.__resamplers[symbol] = resampler
+                self.__updated_at[symbol] = now
+
+            # Otherwise only the candles from the last stored one onwards are downloaded.
+            elif now - self.__updated_at[symbol] >= self._max_age:
+                candles = Candles.from_klines(self._kline_store.download(symbol=symbol, interval=self._base_interval,
+                                                                         start_time=resampler.last_open_time))
+                resampler.update(open_times=candles.open_times, closes=candles.closes)
+                self.__updated_at[symbol] = now
+
+            open_times, closes = resampler.get(length=length, limit=limit)
+        return Candles(open_times=open_times, closes=closes)
+
+    def __get_lock(self, symbol):
+        # Strategies of different symbols may ask for candles at the same time, ie. at startup.
+        with self.__lock:
+            return self.__locks.setdefault(symbol, threading.Lock())
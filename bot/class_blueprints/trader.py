@@ -1,20 +1,44 @@
 import hashlib
 import hmac
+import json
 import config
 from decorators import *
+from class_blueprints.client import BinanceClient
+from class_blueprints.rate_limiter import RateLimiter
+from class_blueprints.kline_decoder import decode_klines
+
+client = BinanceClient(
+    base_url=getattr(config, "API_URL", "https://api.binance.com"),
+    headers=config.header,
+    pool_size=getattr(config, "POOL_SIZE", 10),
+    timeout=getattr(config, "TIMEOUT", 10),
+    rate_limiter=RateLimiter(weight_limit=getattr(config, "WEIGHT_LIMIT", 1200)),
+)
 
 
 @check_response
 @connection_authenticator
 def get_latest_price(asset):
-    endpoint = "https://api.binance.com/api/v3/ticker/price"
-    return requests.get(endpoint, params={"symbol": asset.upper()})
+    endpoint = "/api/v3/ticker/price"
+    return client.get(endpoint, params={"symbol": asset.upper()})
 
 @check_response
 @connection_authenticator
+def get_latest_prices(assets=None):
+    """Get latest prices of the given assets, or of all assets, in one request"""
+    endpoint = "/api/v3/ticker/price"
+
+    if assets is None:
+        return client.get(endpoint)
+
+    symbols = json.dumps([asset.upper() for asset in assets], separators=(",", ":"))
+    return client.get(endpoint, params={"symbols": symbols})
+
+@check_response(decoder=decode_klines)
+@connection_authenticator
 def get_history(**kwargs):
-    """Get history of asset price data"""
-    endpoint = "https://api.binance.com/api/v3/klines"
+    """Get history of asset price data, with the prices as numbers"""
+    endpoint = "/api/v3/klines"
 
     params = {
         "symbol": kwargs["symbol"].upper(),
@@ -22,7 +46,10 @@ def get_history(**kwargs):
         "limit": kwargs["limit"],
     }
 
-    return requests.get(endpoint, params=params, headers=config.header)
+    if "start_time" in kwargs:
+        params["startTime"] = kwargs["start_time"]
+
+    return client.get(endpoint, params=params)
 
 @check_response
 @connection_authenticator
@@ -31,7 +58,7 @@ def get_balance():
 
     # Prepare variables
     ms_time = round(time.time() * 1000)
-    endpoint = "https://api.binance.com/api/v3/account"
+    endpoint = "/api/v3/account"
 
     # Create hashed signature
     query_string = f"timestamp={ms_time}"
@@ -42,13 +69,34 @@ def get_balance():
         "signature": signature,
     }
 
-    return requests.get(endpoint, params=params, headers=config.header)
+    return client.get(endpoint, params=params)
+
+def _find_order(**kwargs):
+    """Get an order by the client order id it was posted with, ie. when the response of the post was lost"""
+    if not kwargs.get("client_order_id"):
+        return None
+
+    endpoint = "/api/v3/order"
+    ms_time = round(time.time() * 1000)
+    symbol = kwargs["asset"].upper()
+    client_order_id = kwargs["client_order_id"]
+
+    params = {
+        "symbol": symbol,
+        "origClientOrderId": client_order_id,
+        "timestamp": ms_time,
+    }
+
+    query_string = f"symbol={symbol}&origClientOrderId={client_order_id}&timestamp={ms_time}"
+    signature = hmac.new(config.apiSecret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256).hexdigest()
+    params["signature"] = signature
+    return client.get(endpoint, params=params)
 
 @check_response
-@connection_authenticator
+@connection_authenticator(recover=_find_order)
 def post_order(**kwargs):
     # Prepare variables
-    endpoint = "https://api.binance.com/api/v3/order"
+    endpoint = "/api/v3/order"
     asset = kwargs["asset"].upper()
     side = kwargs["action"].upper()
     order_type = kwargs["order_type"].upper()
@@ -76,21 +124,31 @@ def post_order(**kwargs):
         query_string = f"symbol={asset}&side={side}&type={order_type}&" \
                        f"{quantity_type}={amount}&timestamp={ms_time}"
 
+    # The client order id is used to match the fill notifications of the user data stream to the order.
+    if kwargs.get("client_order_id"):
+        params["newClientOrderId"] = kwargs["client_order_id"]
+        query_string += f"&newClientOrderId={kwargs['client_order_id']}"
+
     signature = hmac.new(config.apiSecret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256).hexdigest()
     params["signature"] = signature
-    return requests.post(endpoint, params=params, headers=config.header)
+    return client.post(endpoint, params=params)
 
 @check_response
 @connection_authenticator
-def get_exchange_info(asset):
-    """Get asset information"""
-    endpoint = "https://api.binance.com/api/v3/exchangeInfo"
-    return requests.get(endpoint, params={"symbol": asset.upper()})
+def get_exchange_info(asset=None, assets=None):
+    """Get information of one asset, or of a list of assets in one request"""
+    endpoint = "/api/v3/exchangeInfo"
+
+    if assets is not None:
+        symbols = json.dumps([symbol.upper() for symbol in assets], separators=(",", ":"))
+        return client.get(endpoint, params={"symbols": symbols})
+
+    return client.get(endpoint, params={"symbol": asset.upper()})
 
 @check_response
 @connection_authenticator
 def query_order(asset_symbol, order_id):
-    endpoint = "https://api.binance.com/api/v3/order"
+    endpoint = "/api/v3/order"
     ms_time = round(time.time() * 1000)
     symbol = asset_symbol.upper()
 
@@ -103,12 +161,12 @@ def query_order(asset_symbol, order_id):
     query_string = f"symbol={symbol}&orderId={order_id}&timestamp={ms_time}"
     signature = hmac.new(config.apiSecret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256).hexdigest()
     params["signature"] = signature
-    return requests.get(endpoint, params=params, headers=config.header)
+    return client.get(endpoint, params=params)
 
 @check_response
 @connection_authenticator
 def cancel_order(symbol, order_id):
-    endpoint = "https://api.binance.com/api/v3/order"
+    endpoint = "/api/v3/order"
     ms_time = round(time.time() * 1000)
 
     params = {
@@ -120,12 +178,12 @@ def cancel_order(symbol, order_id):
     query_string = f"symbol={symbol.upper()}&orderId={order_id}&timestamp={ms_time}"
     signature = hmac.new(config.apiSecret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256).hexdigest()
     params["signature"] = signature
-    return requests.delete(endpoint, params=params, headers=config.header)
+    return client.delete(endpoint, params=params)
 
 @check_response
 @connection_authenticator
 def cancel_all_orders(symbol):
-    endpoint = "https://api.binance.com/api/v3/openOrders"
+    endpoint = "/api/v3/openOrders"
     ms_time = round(time.time() * 1000)
 
     params = {
@@ -136,4 +194,24 @@ def cancel_all_orders(symbol):
     query_string = f"symbol={symbol}&timestamp={ms_time}"
     signature = hmac.new(config.apiSecret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256).hexdigest()
     params["signature"] = signature
-    return requests.delete(endpoint, params=params, headers=config.header)
+    return client.delete(endpoint, params=params)
+
+@check_response
+@connection_authenticator
+def create_listen_key():
+    """Get a listen key for the user data stream"""
+    endpoint = "/api/v3/userDataStream"
+    return client.post(endpoint)
+
+@check_response
+@connection_authenticator
+def keep_alive_listen_key(listen_key):
+    """Extend the validity of a listen key by 60 minutes"""
+    endpoint = "/api/v3/userDataStream"
+    return client.put(endpoint, params={"listenKey": listen_key})
+
+@check_response
+@connection_authenticator
+def close_listen_key(listen_key):
+    endpoint = "/api/v3/userDataStream"
+    return client.delete(endpoint, params={"listenKey": listen_key})
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+import websocket
+from class_blueprints.trader import create_listen_key, keep_alive_listen_key
+
+
+class UserDataStream:
+
+    def __init__(self, url="wss://stream.binance.com:9443", keep_alive_interval=1800, reconnect_delay=5):
+        """
+        Listens to the user data stream of the Binance API in a background thread, so order updates arrive as soon
+        as the exchange processes them.
+
+        :param url: (str) The url of the websocket API.
+        :param keep_alive_interval: (float) Seconds between extending the validity of the listen key.
+        :param reconnect_delay: (float) Seconds to wait before connecting again after the connection was lost.
+        """
+
+        self._url = url.rstrip("/")
+        self._keep_alive_interval = keep_alive_interval
+        self._reconnect_delay = reconnect_delay
+        self._connected = False
+        self.__listen_key = None
+        self.__handlers = {}
+        self.__stopped = threading.Event()
+        self.__app = None
+        self.__threads = []
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def connected(self):
+        return self._connected
+
+    # ----- CLASS METHODS ----- #
+
+    def on_event(self, event_type, handler):
+        """
+        Adds a handler that is called with every event of a type.
+
+        :param event_type: (str) The type of the event ie. "executionReport".
+        :param handler: (function) Takes the event as given by the Binance API.
+        """
+
+        self.__handlers.setdefault(event_type, []).append(handler)
+
+    def on_execution_report(self, handler):
+        self.on_event("executionReport", handler)
+
+    def start(self):
+        """
+        Connects to the stream in a background thread and keeps the listen key alive in another.
+        """
+
+        self.__stopped.clear()
+        self.__threads = [threading.Thread(target=self._run, name="user-data-stream", daemon=True),
+                          threading.Thread(target=self._keep_alive, name="user-data-keep-alive", daemon=True)]
+        for thread in self.__threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Closes the connection and stops the background threads.
+        """
+
+        self.__stopped.set()
+        if self.__app is not None:
+            self.__app.close()
+        for thread in self.__threads:
+            thread.join(timeout=5)
+
+    def _run(self):
+        while not self.__stopped.is_set():
+            try:
+                self.__listen_key = create_listen_key()["listenKey"]
+            except Exception as error:
+                print(f"Can't get a listen key for the user data stream: {error}")
+            else:
+                self.__app = websocket.WebSocketApp(f"{self._url}/ws/{self.__listen_key}",
+                                                    on_open=self._handle_open, on_message=self._handle_message,
+                                                    on_close=self._handle_close, on_error=self._handle_error)
+                self.__app.run_forever(ping_interval=60, ping_timeout=10)
+                self._connected = False
+
+            if not self.__stopped.is_set():
+                print(f"User data stream disconnected. Connecting again in {self._reconnect_delay} seconds.")
+                time.sleep(self._reconnect_delay)
+
+    def _keep_alive(self):
+        while not self.__stopped.wait(self._keep_alive_interval):
+            if self.__listen_key is None:
+                continue
+
+            try:
+                keep_alive_listen_key(listen_key=self.__listen_key)
+            except Exception as error:
+                print(f"Can't keep the listen key of the user data stream alive: {error}")
+
+    def _handle_open(self, app):
+        self._connected = True
+
+    def _handle_close(self, app, status_code, message):
+        self._connected = False
+
+    def _handle_error(self, app, error):
+        print(f"There's an issue with the user data stream: {error}")
+
+    def _handle_message(self, app, message):
+        event = json.loads(message)
+
+        for handler in self.__handlers.get(event.get("e"), ()):
+            handler(event)
@@ -0,0 +1,93 @@
+import os
+import pickle
+import time
+
+FOUR_HOURS = 14_400
+
+
+class WarmStart:
+
+    __VERSION = 1
+
+    def __init__(self, path, max_age=86_400):
+        """
+        Saves the state of the strategies to a binary file, so a restart doesn't have to download and process the
+        history of every symbol again. The kline store already keeps the candles and only downloads the new ones,
+        the snapshot keeps the indicators that were calculated over them and the market state.
+
+        :param path: (str) The path of the snapshot.
+        :param max_age: (int) Seconds after which a snapshot isn't used anymore. The 1h RSI only looks back 50
+        candles, so after a long stop its state can't be continued.
+        """
+
+        self._path = path
+        self._max_age = max_age
+        self.__saved_at = None
+        self.__strategies = {}
+
+    # ----- GETTERS / SETTERS ----- #
+
+    @property
+    def saved_at(self):
+        return self.__saved_at
+
+    # ----- CLASS METHODS ----- #
+
+    def load(self):
+        """
+        Loads the snapshot. A missing, broken, old or outdated snapshot is ignored and every strategy starts cold.
+
+        :return: (bool) True when the snapshot can be used.
+        """
+
+        self.__saved_at, self.__strategies = None, {}
+
+        try:
+            with open(self._path, "rb") as file:
+                data = pickle.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+            print(f"Can't read the snapshot {self._path}: {error}. Starting cold.")
+            return False
+
+        if data.get("version") != self.__VERSION or time.time() - data["saved_at"] > self._max_age:
+            return False
+
+        self.__saved_at, self.__strategies = data["saved_at"], data["strategies"]
+        return True
+
+    def get_state(self, symbol):
+        """
+        Returns the saved state of a strategy. The market state is only returned when no 4h candle has closed since
+        the snapshot was saved, otherwise it needs to be calculated again.
+
+        :param symbol: (str) The symbol of the strategy.
+        :return: (dict) The indicators and market state, or None when the symbol isn't in the snapshot.
+        """
+
+        state = self.__strategies.get(symbol)
+        if state is None:
+            return None
+
+        if self.__saved_at // FOUR_HOURS != time.time() // FOUR_HOURS:
+            state = dict(state, market_state=None)
+        return state
+
+    def save(self, strategies):
+        """
+        Writes the state of all strategies. The file is replaced at once, so a crash never leaves half a snapshot.
+
+        :param strategies: (list) The strategies.
+        """
+
+        data = {
+            "version": self.__VERSION,
+            "saved_at": time.time(),
+            "strategies": {strategy.symbol: strategy.get_state() for strategy in strategies},
+        }
+
+        temporary_path = f"{self._path}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._path)
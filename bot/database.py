@@ -1,9 +1,33 @@
-from sqlalchemy import create_engine
-from sqlalchemy import Column, String, Integer, Float, Boolean
+from sqlalchemy import create_engine, event
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 import config
 
 Base = declarative_base()
+_engine = None
+
+
+def get_engine():
+    """
+    Returns the engine that is shared by the whole bot. The database uses write-ahead logging, so writes don't block
+    reads and a commit costs one append instead of rewriting the journal.
+
+    :return: (Engine) The SQLAlchemy engine.
+    """
+
+    global _engine
+
+    if _engine is None:
+        _engine = create_engine(f"sqlite:///{config.db_path}")
+
+        @event.listens_for(_engine, "connect")
+        def set_sqlite_pragma(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+    return _engine
 
 
 class StopLoss(Base):
@@ -17,6 +41,22 @@ class StopLoss(Base):
     trail = Column(Float, nullable=False)
     open_stop_loss = Column(Boolean, nullable=False)
 
+    # Serves the lookup of all open stop losses and of the open stop loss of one asset.
+    __table_args__ = (Index("ix_stop_losses_open_asset", "open_stop_loss", "asset"), )
+
+
+class Kline(Base):
+    __tablename__ = "klines"
+    symbol = Column(String(20), primary_key=True)
+    interval = Column(String(5), primary_key=True)
+    open_time = Column(BigInteger, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+    close_time = Column(BigInteger, nullable=False)
+
 
 if __name__ == "__main__":
 
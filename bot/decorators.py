@@ -2,42 +2,119 @@ import requests
 import sys
 import os
 import time
+import random
 import functools
 import config
 import smtplib
-from class_blueprints.exceptions import BinanceAccountIssue
+from class_blueprints.circuit_breaker import CircuitBreaker
+from class_blueprints.metrics import api_retries
+from class_blueprints.exceptions import BinanceAccountIssue, BinanceConnectionIssue, BinanceRateLimitHit
 
 
-def connection_authenticator(func):
-    """Checks if there is a connection with the API"""
-    def wrapper(*args, n=0, **kwargs):
-        try:
-            response = func(*args, **kwargs)
+def get_backoff(attempt, base=0.5, cap=30):
+    """
+    Returns a random delay up to an exponentially growing maximum, so retries of many requests don't hit the API at
+    the same moment.
 
-        except requests.exceptions.ConnectionError:
+    :param attempt: (int) The number of the retry, starting at 0.
+    :param base: (float) The maximum delay of the first retry in seconds.
+    :param cap: (float) The highest maximum delay in seconds.
+    :return: (float) The delay in seconds.
+    """
 
-            # Restart bot if exception is not resolved
-            if n == 3:
-                os.system(config.command)
-                sys.exit("Can't connect to the API. Restarting bot.")
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def connection_authenticator(func=None, recover=None):
+    """
+    Retries a request with jittered exponential backoff when the connection fails or the API has an internal error.
+    Every endpoint has its own circuit breaker, so an endpoint that keeps failing is skipped right away until it
+    recovers. The request function is called again for every retry, so signed requests get a fresh timestamp. When
+    the request weight limit was hit, the retry waits for the time the API asked for.
+
+    :param recover: (function) Called with the arguments of the request before it's sent again. Returns the
+    response of the earlier attempt when it was processed after all, ie. an order that was placed. Makes the retry
+    of a request that isn't idempotent safe.
+    """
+
+    if func is None:
+        return functools.partial(connection_authenticator, recover=recover)
+
+    breaker = CircuitBreaker(name=func.__name__,
+                             failure_threshold=getattr(config, "BREAKER_THRESHOLD", 5),
+                             reset_timeout=getattr(config, "BREAKER_TIMEOUT", 30))
+    retries = getattr(config, "RETRIES", 5)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                raise BinanceConnectionIssue(f"The API is unavailable for {breaker.name}.")
+
+            try:
+                if attempt and recover is not None:
+                    try:
+                        response = recover(*args, **kwargs)
+                    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                        response = None
+
+                    if response is not None and response.ok:
+                        breaker.record_success()
+                        return response
+
+                response = func(*args, **kwargs)
+
+            except BinanceRateLimitHit as error:
+                # The API answered, so the endpoint is fine. The request is signed again after the wait.
+                breaker.record_success()
+                if attempt == retries:
+                    raise
+                print(f"{error} Waiting {error.retry_after:.0f} seconds.")
+                api_retries.inc(endpoint=breaker.name)
+                time.sleep(error.retry_after)
+                continue
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+                breaker.record_failure()
+                if attempt == retries:
+                    raise BinanceConnectionIssue(f"Can't connect to the API for {breaker.name}.") from error
+
+            except Exception:
+                # Any other error, ie. a broken chunked response, still has to end the test request of a half-open
+                # breaker, otherwise the endpoint stays blocked.
+                breaker.record_failure()
+                raise
 
-            # Try connecting again, max 3 times
             else:
-                print("There's an issue with the API connection. Please HODL.")
-                time.sleep(5)
-                return wrapper(*args, n=n + 1, **kwargs)
-        else:
-            return response
+                if response.status_code < 500:
+                    breaker.record_success()
+                    return response
+
+                breaker.record_failure()
+                if attempt == retries:
+                    return response
+
+            print("There's an issue with the API connection. Please HODL.")
+            api_retries.inc(endpoint=breaker.name)
+            time.sleep(get_backoff(attempt=attempt))
     return wrapper
 
 
-def check_response(func):
-    """Checks if the response is as expected"""
+def check_response(func=None, decoder=None):
+    """
+    Checks if the response is as expected
+
+    :param decoder: (function) Decodes the body of a successful response. Default is response.json().
+    """
+
+    if func is None:
+        return functools.partial(check_response, decoder=decoder)
+
     def wrapper(*args, **kwargs):
         response = func(*args, **kwargs)
 
         if response.ok:
-            return response.json()
+            return response.json() if decoder is None else decoder(response.content)
         else:
             skippable_codes = (-1022, )
             try:
@@ -1,23 +1,92 @@
+import time
 import config
+from functions import format_border
 from class_blueprints.strategies import Strategy
 from class_blueprints.crypto import Crypto
 from class_blueprints.portfolio import Portfolio
+from class_blueprints.account_state import AccountState
+from class_blueprints.trader import get_balance
+from class_blueprints.kline_store import KlineStore
+from class_blueprints.timeframes import MultiTimeframeStore
+from class_blueprints.prices import PriceSnapshot
+from class_blueprints.market_stream import MarketStream
+from class_blueprints.order_tracker import OrderTracker
+from class_blueprints.user_data_stream import UserDataStream
+from class_blueprints.stop_loss import book as stop_loss_book
+from class_blueprints.metrics import registry as metrics
+from class_blueprints.warm_start import WarmStart
+from class_blueprints.bootstrapper import Bootstrapper
 from trader_bot import TraderBot
+from async_trader_bot import AsyncTraderBot
+from sharded_bot import ShardedTraderBot
 
 
 def main():
+    tic = time.perf_counter()
+
+    # The workers of the shards calculate the indicators, the snapshot only has the ones of this process.
+    shards = getattr(config, "SHARDS", None)
+    if shards and getattr(config, "SNAPSHOT_PATH", None):
+        raise ValueError("SNAPSHOT_PATH can't be used with SHARDS. Remove one of them from config.py.")
+
+    # Export the metrics
+    if getattr(config, "METRICS_PORT", None):
+        metrics.serve(port=config.METRICS_PORT)
+    if getattr(config, "METRICS_DUMP", None):
+        metrics.start_dump(path=config.METRICS_DUMP, interval=getattr(config, "METRICS_INTERVAL", 60))
 
     # Create all objects
     cryptos = [Crypto(crypto=key, fiat=config.FIAT_MARKET, name=value) for key, value in config.CRYPTOS.items()]
-    portfolio = Portfolio(owner=config.USER, fiat=config.FIAT_MARKET, cryptos=cryptos)
+    account_state = AccountState(fiat=config.FIAT_MARKET, fetch=get_balance,
+                                 resync_interval=getattr(config, "ACCOUNT_RESYNC_INTERVAL", 3600))
+    portfolio = Portfolio(owner=config.USER, fiat=config.FIAT_MARKET, cryptos=cryptos, account_state=account_state)
+    kline_store = MultiTimeframeStore(kline_store=KlineStore(), base_interval=getattr(config, "BASE_INTERVAL", "30m"))
+    prices = PriceSnapshot(symbols=portfolio.crypto_balances.keys())
+    prices.refresh()
+    stop_loss_book.load()
+
+    stream_url = getattr(config, "STREAM_URL", "wss://stream.binance.com:9443")
+    market_stream = None
+    if getattr(config, "MARKET_STREAM", True):
+        market_stream = MarketStream(symbols=prices.symbols, url=stream_url)
+
+    # The user data stream reports the fills, and the new balances of the assets that changed.
+    order_tracker = OrderTracker()
+    if getattr(config, "USER_DATA_STREAM", True):
+        user_data_stream = UserDataStream(url=stream_url)
+        user_data_stream.on_event("outboundAccountPosition", account_state.apply_balances)
+        order_tracker.attach(user_data_stream)
 
-    strategies = []
-    for symbol, crypto in portfolio.crypto_balances.items():
-        strategy = Strategy(symbol=symbol, name="Golden Cross", crypto=crypto)
-        strategies.append(strategy)
+    # Restores the indicators and market states of the last run, so only the new candles need to be processed.
+    warm_start = None
+    if getattr(config, "SNAPSHOT_PATH", None):
+        warm_start = WarmStart(path=config.SNAPSHOT_PATH, max_age=getattr(config, "SNAPSHOT_MAX_AGE", 86_400))
+        warm_start.load()
+
+    # The strategies are created at the same time, the stop losses of all of them were loaded with one query. With
+    # shards the workers download the candles, the strategies here only decide on their readings.
+    def create_strategy(symbol):
+        state = warm_start.get_state(symbol=symbol) if warm_start else None
+        return Strategy(symbol=symbol, name="Golden Cross", crypto=portfolio.crypto_balances[symbol],
+                        kline_store=None if shards else kline_store, prices=prices, state=state)
+
+    bootstrapper = Bootstrapper(workers=getattr(config, "BOOTSTRAP_WORKERS", getattr(config, "POOL_SIZE", 10)))
+    strategies = bootstrapper.run(symbols=list(portfolio.crypto_balances), create=create_strategy)
+    format_border("STRATEGY BOOTSTRAP")
+    print(f"\n{bootstrapper.format_timings(limit=20)}\n")
 
     # Create bot object and activate it
-    bot = TraderBot(name=config.BOT_NAME, strategies=strategies, portfolio=portfolio)
+    if shards:
+        bot = ShardedTraderBot(name=config.BOT_NAME, strategies=strategies, portfolio=portfolio, prices=prices,
+                               shards=shards, market_stream=market_stream, order_tracker=order_tracker)
+    elif getattr(config, "ASYNC_MODE", False):
+        bot = AsyncTraderBot(name=config.BOT_NAME, strategies=strategies, portfolio=portfolio, prices=prices,
+                             market_stream=market_stream, order_tracker=order_tracker, warm_start=warm_start)
+    else:
+        bot = TraderBot(name=config.BOT_NAME, strategies=strategies, portfolio=portfolio, prices=prices,
+                        market_stream=market_stream, order_tracker=order_tracker, warm_start=warm_start)
+
+    format_border(f"STARTED IN {time.perf_counter() - tic:0.2f} SECONDS")
     bot.activate()
 
 
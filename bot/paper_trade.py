@@ -0,0 +1,137 @@
+import argparse
+import contextlib
+import os
+import time
+import config
+from functions import format_border
+
+# The strategy reads the last 1000 4h candles, so the replay starts after that many candles are known.
+WARMUP_MS = 1000 * 14_400_000
+BASE_INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "30m": 1800}
+
+
+def load_base_candles(kline_store, symbol, interval, start_time, end_time, download=True):
+    """
+    Loads the candles that the paper exchange replays from the kline store.
+
+    :param kline_store: (object) The kline store with the real candles.
+    :param symbol: (str) The symbol of the asset.
+    :param interval: (str) The base interval ie. "1m".
+    :param start_time: (int) Open time in ms of the first candle.
+    :param end_time: (int) Open time in ms after the last candle.
+    :param download: (bool) Downloads the missing candles first when True.
+    :return: (list) Candles as lists of open time, open, high, low, close and volume.
+    """
+
+    if download:
+        kline_store.download(symbol=symbol, interval=interval, start_time=start_time)
+    return [kline for kline in kline_store.load(symbol=symbol, interval=interval) if start_time <= kline[0] < end_time]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot against a paper exchange that replays stored candles.")
+    parser.add_argument("--days", type=int, default=30, help="Number of days to replay.")
+    parser.add_argument("--interval", choices=BASE_INTERVALS, default="1m",
+                        help="Interval of the replayed candles. The stop losses and fills are checked every candle.")
+    parser.add_argument("--balance", type=float, default=1000, help="Fiat balance to start with.")
+    parser.add_argument("--fee", type=float, default=0.001, help="Fee per trade.")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Times faster than real time to replay. Default is as fast as possible.")
+    parser.add_argument("--db", default="paper.db", help="Database of the paper trades. It's emptied on every run.")
+    parser.add_argument("--offline", action="store_true", help="Only use candles that are already stored.")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary.")
+    args = parser.parse_args()
+
+    # The paper trades get their own database, so they never mix with the stop losses of the real bot. The path
+    # needs to be set before the modules that open the database are imported.
+    source_path = config.db_path
+    config.db_path = args.db
+    for path in (args.db, f"{args.db}-wal", f"{args.db}-shm", f"{args.db}.journal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # A failed paper order stops the run instead of restarting the real bot.
+    config.command = ""
+
+    from sqlalchemy import create_engine
+    from database import Base, get_engine
+    from class_blueprints import trader
+    from class_blueprints.clock import SimulatedClock
+    from class_blueprints.paper_exchange import PaperExchange
+    from class_blueprints.kline_store import KlineStore
+    from class_blueprints.timeframes import MultiTimeframeStore
+    from class_blueprints.strategies import Strategy
+    from class_blueprints.crypto import Crypto
+    from class_blueprints.portfolio import Portfolio
+    from class_blueprints.account_state import AccountState
+    from class_blueprints.prices import PriceSnapshot
+    from class_blueprints.order_tracker import OrderTracker
+    from class_blueprints.stop_loss import book as stop_loss_book
+    from trader_bot import TraderBot
+
+    step = BASE_INTERVALS[args.interval]
+    end_time = int(time.time()) // step * step
+    start_time = end_time - args.days * 86_400
+    symbols = [crypto + config.FIAT_MARKET for crypto in config.CRYPTOS]
+
+    source_store = KlineStore(engine=create_engine(f"sqlite:///{source_path}"))
+    candles = {symbol: load_base_candles(kline_store=source_store, symbol=symbol, interval=args.interval,
+                                         start_time=start_time * 1000 - WARMUP_MS, end_time=end_time * 1000,
+                                         download=not args.offline)
+               for symbol in symbols}
+    symbol_info = None
+    if not args.offline:
+        symbol_info = {info["symbol"]: info for info in trader.get_exchange_info(assets=symbols)["symbols"]}
+
+    # From here on every request of the bot goes to the paper exchange.
+    clock = SimulatedClock(start=start_time)
+    exchange = PaperExchange(candles=candles, clock=clock, balances={config.FIAT_MARKET: args.balance},
+                             fiat=config.FIAT_MARKET, base_interval=args.interval, fee=args.fee,
+                             symbol_info=symbol_info)
+    trader.client = exchange
+    Base.metadata.create_all(get_engine())
+
+    with contextlib.ExitStack() as stack:
+        if args.quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+
+        cryptos = [Crypto(crypto=key, fiat=config.FIAT_MARKET, name=value) for key, value in config.CRYPTOS.items()]
+        account_state = AccountState(fiat=config.FIAT_MARKET, fetch=trader.get_balance, fee=args.fee, clock=clock)
+        portfolio = Portfolio(owner=config.USER, fiat=config.FIAT_MARKET, cryptos=cryptos, account_state=account_state)
+        kline_store = MultiTimeframeStore(kline_store=KlineStore(clock=clock),
+                                          base_interval=getattr(config, "BASE_INTERVAL", "30m"), clock=clock)
+        prices = PriceSnapshot(symbols=portfolio.crypto_balances.keys())
+        prices.refresh()
+        stop_loss_book.load()
+
+        strategies = [Strategy(symbol=symbol, name="Golden Cross", crypto=crypto, kline_store=kline_store,
+                               prices=prices) for symbol, crypto in portfolio.crypto_balances.items()]
+        bot = TraderBot(name=config.BOT_NAME, strategies=strategies, portfolio=portfolio, prices=prices,
+                        order_tracker=OrderTracker(clock=clock), clock=clock)
+
+        # Every candle is one tick of the bot, the signals are checked every 30 minutes like activate does.
+        tic = time.perf_counter()
+        for current_time in range(start_time + step, end_time + 1, step):
+            clock.set(current_time)
+            bot.tick(check_signal=current_time % 1800 == 0)
+
+            if args.speed:
+                delay = (current_time - start_time) / args.speed - (time.perf_counter() - tic)
+                if delay > 0:
+                    time.sleep(delay)
+        duration = time.perf_counter() - tic
+
+    value = exchange.get_balance(config.FIAT_MARKET) + sum(
+        exchange.get_balance(symbol[:-len(config.FIAT_MARKET)]) * exchange.get_price(symbol) for symbol in symbols)
+
+    format_border(f"PAPER TRADING {args.days} DAYS")
+    print(f"\nTrades: {len(exchange.trades)}")
+    print(f"Start value: {args.balance:.2f} {config.FIAT_MARKET.upper()}")
+    print(f"End value: {value:.2f} {config.FIAT_MARKET.upper()}")
+    print(f"Requests: {exchange.requests}")
+    print(f"Elapsed time: {duration:0.4f} seconds.")
+    print(f"Speed: {(clock.time() - start_time) / max(duration, 1e-9):,.0f} times real time.\n")
+
+
+if __name__ == "__main__":
+    main()
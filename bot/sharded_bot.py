@@ -0,0 +1,229 @@
+import multiprocessing
+import os
+import queue
+import time
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+from trader_bot import TraderBot
+from decorators import *
+from functions import format_border
+from class_blueprints import trader
+from class_blueprints.rate_limiter import RateLimiter
+from class_blueprints.kline_store import KlineStore
+from class_blueprints.timeframes import MultiTimeframeStore
+from class_blueprints.strategies import SignalReader
+from class_blueprints.stop_loss_repository import repository as stop_loss_repository
+from class_blueprints.metrics import tick_latency
+import config
+
+
+def run_shard(symbols, base_interval, weight_share, requests, results):
+    """
+    Main function of a worker process. Calculates the indicators of its symbols on every request of the coordinator
+    and sends them back one symbol at a time, so the coordinator can trade on the first symbols while the others are
+    still being calculated.
+
+    :param symbols: (list) The symbols of the shard.
+    :param base_interval: (str) The interval the other intervals are resampled from.
+    :param weight_share: (float) Part of the request weight limit of the API this worker may use.
+    :param requests: (Queue) The ticks to calculate the indicators for. None stops the worker.
+    :param results: (Queue) The readings, shared by all workers.
+    """
+
+    trader.client.rate_limiter = RateLimiter(weight_limit=getattr(config, "WEIGHT_LIMIT", 1200), share=weight_share)
+    kline_store = MultiTimeframeStore(kline_store=KlineStore(), base_interval=base_interval)
+    readers = [SignalReader(symbol=symbol, kline_store=kline_store) for symbol in symbols]
+
+    while True:
+        tick = requests.get()
+        if tick is None:
+            return
+
+        for reader in readers:
+            try:
+                reading = reader.read()
+            except BinanceConnectionIssue as error:
+                results.put((tick, reader.symbol, None, f"{error} Trying again next tick."))
+                continue
+            except BinanceAccountIssue:
+                results.put((tick, reader.symbol, None, "The API refused the candles. Continuing"))
+                continue
+            except SQLAlchemyError as error:
+                # All workers write to the same kline table, it can be locked for longer than the timeout.
+                results.put((tick, reader.symbol, None, f"Can't store the candles: {error}. Trying again next tick."))
+                continue
+
+            if reading is None:
+                results.put((tick, reader.symbol, None, "Something went wrong. Continuing"))
+                continue
+
+            market_state, data = reading
+            results.put((tick, reader.symbol, {"market_state": market_state, "price": data.price,
+                                               "values": data.values,
+                                               "open_time": int(data.candles.open_times[-1])}, None))
+
+
+class ShardedTraderBot(TraderBot):
+    """
+    Splits the symbols over worker processes that download the candles and calculate the indicators. This process
+    keeps the portfolio and the stop losses, and places every order, so the fiat balance is never spent twice. The
+    workers and this process talk over multiprocessing queues. The strategies of this process only decide on the
+    readings, so they are made without a kline store.
+    """
+
+    def __init__(self, name, strategies, portfolio, prices, shards=None, market_stream=None, order_tracker=None,
+                 timeout=600, warm_start=None):
+        """
+        :param shards: (int) The number of worker processes. Default is the number of cores.
+        :param timeout: (float) Seconds to wait for the readings of a signal tick.
+        :param warm_start: (WarmStart) Not supported, the indicators are kept by the workers.
+        """
+
+        if warm_start is not None:
+            raise ValueError("A warm start can't be used with shards, the workers calculate the indicators.")
+
+        super().__init__(name=name, strategies=strategies, portfolio=portfolio, prices=prices,
+                         market_stream=market_stream, order_tracker=order_tracker)
+        self._shards = max(1, min(shards or os.cpu_count() or 1, len(strategies)))
+        self._timeout = timeout
+        self.__context = multiprocessing.get_context("spawn")
+        self._results = self.__context.Queue()
+        self.__workers = []
+        self.__tick = 0
+
+        # The workers and this process share the request weight limit of the key, the used weight the API reports
+        # only corrects the bucket after the first requests.
+        self._weight_share = 1 / (self._shards + 1)
+        if getattr(trader.client, "rate_limiter", None) is not None:
+            trader.client.rate_limiter = RateLimiter(weight_limit=getattr(config, "WEIGHT_LIMIT", 1200),
+                                                     share=self._weight_share)
+
+    # ----- WORKERS ----- #
+
+    def start_workers(self):
+        """
+        Starts a worker for every shard. The symbols are dealt round-robin, so every shard gets a similar number.
+        """
+
+        symbols = [strategy.symbol for strategy in self._strategies]
+        self.__workers = [self._start_worker(number=number, symbols=symbols[number::self._shards])
+                          for number in range(self._shards)]
+
+    def stop_workers(self):
+        for process, requests, symbols in self.__workers:
+            requests.put(None)
+        for process, requests, symbols in self.__workers:
+            process.join(timeout=5)
+        self.__workers = []
+
+    def restart_dead_workers(self):
+        """
+        Starts a new worker for every worker that has died, ie. on an unexpected error. Its indicators are
+        calculated from scratch again.
+        """
+
+        for number, (process, requests, symbols) in enumerate(self.__workers):
+            if not process.is_alive():
+                print(f"Shard {number} stopped with exit code {process.exitcode}. Starting it again.")
+                self.__workers[number] = self._start_worker(number=number, symbols=symbols)
+
+    def _start_worker(self, number, symbols):
+        """
+        Starts the worker process of a shard.
+
+        :param number: (int) The number of the shard.
+        :param symbols: (list) The symbols of the shard.
+        :return: (tuple) The process, the queue of its requests and its symbols.
+        """
+
+        requests = self.__context.Queue()
+        process = self.__context.Process(target=run_shard, name=f"shard-{number}", daemon=True,
+                                         kwargs={"symbols": symbols, "requests": requests, "results": self._results,
+                                                 "base_interval": getattr(config, "BASE_INTERVAL", "30m"),
+                                                 "weight_share": self._weight_share})
+        process.start()
+        return process, requests, symbols
+
+    # ----- ON/OFF BUTTON ----- #
+
+    def activate(self):
+        """Activate the main loop of the bot"""
+        self.start_workers()
+        try:
+            super().activate()
+        finally:
+            self.stop_workers()
+
+    def tick(self, check_signal, streaming=False):
+        """
+        Checks all strategies once and trades on their signals. The signals are calculated by the workers.
+
+        :param check_signal: (bool) Checks for signals when True, otherwise only checks the stop losses.
+        :param streaming: (bool) True when the market stream checks the stop losses and keeps the prices up to date.
+        """
+
+        if not check_signal:
+            return super().tick(check_signal=False, streaming=streaming)
+
+        try:
+            if not streaming:
+                self._prices.refresh()
+            self._portfolio.update_portfolio()
+
+            self.restart_dead_workers()
+            self.__tick += 1
+            for process, requests, symbols in self.__workers:
+                requests.put(self.__tick)
+
+            remaining = len(self._strategies)
+            deadline = time.monotonic() + self._timeout
+            while remaining:
+                try:
+                    tick, symbol, reading, error = self._results.get(timeout=1)
+                except queue.Empty:
+                    # A worker that died won't send the rest of its readings.
+                    if time.monotonic() < deadline and all(process.is_alive() for process, *_ in self.__workers):
+                        continue
+                    print(f"No readings for {remaining} symbols. Continuing")
+                    break
+
+                # Readings of a tick that timed out are too old to trade on.
+                if tick != self.__tick:
+                    continue
+                remaining -= 1
+
+                if reading is None:
+                    print(error)
+                    continue
+
+                try:
+                    with tick_latency.time(symbol=symbol, source="shard"):
+                        self.trade_on_reading(strategy=self._strategies_by_symbol[symbol], reading=reading)
+                except BinanceConnectionIssue as error:
+                    # Only this symbol is tried again on the next tick, the others are still traded.
+                    print(f"{error} Trying {symbol.upper()} again next tick.")
+
+        except BinanceConnectionIssue as error:
+            print(f"{error} Trying again next tick.")
+
+        stop_loss_repository.flush()
+
+    def trade_on_reading(self, strategy, reading):
+        """
+        Decides on the reading of a worker and places the order.
+
+        :param strategy: (object) The strategy of the symbol.
+        :param reading: (dict) The market state, price and indicator values of the symbol.
+        """
+
+        action = strategy.decide(market_state=reading["market_state"], price=reading["price"],
+                                 values=reading["values"])
+
+        format_border(f"CURRENT MARKET STATE FOR {strategy.symbol.upper()}: {strategy.market_state.upper()}")
+        row = pd.Series({"Price": reading["price"], **reading["values"]},
+                        name=pd.to_datetime(reading["open_time"], unit="ms"))
+        print(f"\n{row}\n")
+        self._portfolio.print_portfolio()
+
+        if action != "continue":
+            self.execute_action(action=action, strategy=strategy)
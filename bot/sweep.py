@@ -0,0 +1,180 @@
+import argparse
+import itertools
+import os
+import random
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import config
+from functions import format_border
+from class_blueprints.kline_store import KlineStore
+from class_blueprints.backtester import Backtester, DEFAULT_PARAMETERS
+from backtest import load_candles
+
+DEFAULT_GRID = {
+    "bull_fast": [5, 8, 13],
+    "bull_slow": [21, 34],
+    "rsi_buy": [25, 30, 35],
+    "rsi_sell": [40, 50],
+    "bull_trail_ratio": [0.9, 0.95, 0.99],
+    "bear_trail_ratio": [0.9, 0.95, 0.99],
+}
+
+# Parameters that need to stay smaller than their partner.
+ORDERED = (("market_fast", "market_slow"), ("bull_fast", "bull_slow"), ("rsi_buy", "rsi_sell"))
+
+# Candles of the worker process, views on the shared memory block.
+_candles = None
+_shared_memory = None
+
+
+def share_candles(candles):
+    """
+    Copies the candles of all symbols into one shared memory block, so the workers can read them without copying.
+
+    :param candles: (dict) Candles per symbol and interval as NumPy columns.
+    :return: (tuple) The shared memory block and a layout to find the columns in it.
+    """
+
+    layout = []
+    offset = 0
+    for symbol, intervals in candles.items():
+        for interval, columns in intervals.items():
+            for name, column in columns.items():
+                layout.append((symbol, interval, name, column.dtype.str, offset, len(column)))
+                offset += column.nbytes
+
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for symbol, interval, name, dtype, start, length in layout:
+        view = np.ndarray(length, dtype=dtype, buffer=block.buf, offset=start)
+        view[:] = candles[symbol][interval][name]
+    return block, layout
+
+
+def _attach_candles(name, layout):
+    """Initialises a worker with read only views on the shared candles."""
+    global _candles, _shared_memory
+
+    _shared_memory = shared_memory.SharedMemory(name=name)
+    _candles = {}
+    for symbol, interval, column, dtype, start, length in layout:
+        view = np.ndarray(length, dtype=dtype, buffer=_shared_memory.buf, offset=start)
+        view.setflags(write=False)
+        _candles.setdefault(symbol, {}).setdefault(interval, {})[column] = view
+
+
+def _run_parameters(parameters):
+    """Backtests one set of parameters over all symbols in the worker."""
+    results = [Backtester(candles=candles, parameters=parameters).run() for candles in _candles.values()]
+    return {
+        **parameters,
+        "average_return": float(np.mean([result["total_return"] for result in results])),
+        "worst_drawdown": float(max(result["max_drawdown"] for result in results)),
+        "trades": sum(result["number_of_trades"] for result in results),
+        "win_rate": float(np.mean([result["win_rate"] for result in results])),
+    }
+
+
+def _get(parameters, name):
+    return parameters.get(name, DEFAULT_PARAMETERS[name])
+
+
+def create_parameter_sets(grid, samples=None, seed=None):
+    """
+    Returns every combination of the grid, or a random sample of them.
+
+    :param grid: (dict) Values to try per parameter.
+    :param samples: (int) Number of random combinations. Default is every combination.
+    :param seed: (int) Seed for the random sample.
+    :return: (list) Parameter sets.
+    """
+
+    names = list(grid)
+    combinations = itertools.product(*(grid[name] for name in names))
+    parameter_sets = [dict(zip(names, values)) for values in combinations]
+    parameter_sets = [p for p in parameter_sets if all(_get(p, fast) < _get(p, slow) for fast, slow in ORDERED)]
+
+    if samples is not None and samples < len(parameter_sets):
+        parameter_sets = random.Random(seed).sample(parameter_sets, samples)
+    return parameter_sets
+
+
+def sweep(candles, parameter_sets, workers=None):
+    """
+    Backtests all parameter sets over a pool of processes that share the candles.
+
+    :param candles: (dict) Candles per symbol and interval as NumPy columns.
+    :param parameter_sets: (list) The parameter sets to test.
+    :param workers: (int) Number of processes. Default is the number of cores.
+    :return: (list) Results ranked from the highest average return to the lowest.
+    """
+
+    workers = workers or os.cpu_count()
+    block, layout = share_candles(candles)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_candles,
+                                 initargs=(block.name, layout)) as executor:
+            chunksize = max(1, len(parameter_sets) // (workers * 4))
+            results = list(executor.map(_run_parameters, parameter_sets, chunksize=chunksize))
+    finally:
+        block.close()
+        block.unlink()
+
+    return sorted(results, key=lambda result: result["average_return"], reverse=True)
+
+
+def print_results(results, top):
+    names = [name for name in results[0] if name in DEFAULT_PARAMETERS] if results else []
+    columns = names + ["average_return", "worst_drawdown", "win_rate", "trades"]
+
+    print(" | ".join(f"{column:>16}" for column in ["rank"] + columns))
+    for rank, result in enumerate(results[:top], start=1):
+        values = [f"{rank:>16}"]
+        for column in columns:
+            value = result[column]
+            values.append(f"{value:>16.4f}" if isinstance(value, float) else f"{value:>16}")
+        print(" | ".join(values))
+
+
+def parse_grid(values):
+    grid = dict(DEFAULT_GRID)
+    for value in values or []:
+        name, options = value.split("=")
+        if name not in DEFAULT_PARAMETERS:
+            raise ValueError(f"Unknown parameter: {name}.")
+        grid[name] = [type(DEFAULT_PARAMETERS[name])(option) for option in options.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the parameters of the Golden Cross strategy.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to test. Default is every crypto in config.")
+    parser.add_argument("--days", type=int, default=365, help="Number of days to test.")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2",
+                        help="Values to try for a parameter, replaces the default values.")
+    parser.add_argument("--samples", type=int, help="Test a random sample of the grid.")
+    parser.add_argument("--seed", type=int, help="Seed of the random sample.")
+    parser.add_argument("--workers", type=int, help="Number of processes. Default is the number of cores.")
+    parser.add_argument("--top", type=int, default=20, help="Number of results to show.")
+    parser.add_argument("--offline", action="store_true", help="Only use candles that are already stored.")
+    args = parser.parse_args()
+
+    symbols = args.symbols or [crypto + config.FIAT_MARKET for crypto in config.CRYPTOS]
+    kline_store = KlineStore()
+    candles = {symbol: load_candles(kline_store=kline_store, symbol=symbol, days=args.days,
+                                    download=not args.offline) for symbol in symbols}
+    parameter_sets = create_parameter_sets(grid=parse_grid(args.grid), samples=args.samples, seed=args.seed)
+
+    tic = time.perf_counter()
+    results = sweep(candles=candles, parameter_sets=parameter_sets, workers=args.workers)
+    duration = time.perf_counter() - tic
+
+    format_border(f"SWEEP OF {len(parameter_sets)} PARAMETER SETS OVER {len(symbols)} SYMBOLS")
+    print_results(results=results, top=args.top)
+    print(f"\nElapsed time: {duration:0.4f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
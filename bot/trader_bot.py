@@ -1,9 +1,14 @@
-import sqlalchemy
 import math
 from decorators import *
 from functions import format_border
 from class_blueprints.stop_loss import TrailingStopLoss
-from class_blueprints.trader import get_exchange_info, get_latest_price, post_order, query_order, cancel_order
+from class_blueprints.stop_loss_repository import repository as stop_loss_repository
+from class_blueprints.exchange_info import SymbolFilters
+from class_blueprints.order_tracker import OrderTracker
+from class_blueprints.clock import Clock
+from class_blueprints.scheduler import Scheduler
+from class_blueprints.metrics import order_latency, orders, tick_latency, missed_deadlines
+from class_blueprints.trader import post_order, cancel_order
 from class_blueprints.trader import cancel_all_orders
 import os
 import config
@@ -12,18 +17,24 @@ import sys
 
 class TraderBot:
 
-    def __init__(self, name, strategies, portfolio):
+    def __init__(self, name, strategies, portfolio, prices, market_stream=None, order_tracker=None, clock=None,
+                 warm_start=None):
 
         self._name = name
         self._strategies = strategies
+        self._strategies_by_symbol = {strategy.symbol: strategy for strategy in strategies}
         self._portfolio = portfolio
+        self._prices = prices
+        self._market_stream = market_stream
+        self._order_tracker = order_tracker or OrderTracker()
+        self._clock = clock or Clock()
+        self._warm_start = warm_start
+        self._symbol_filters = SymbolFilters(symbols=portfolio.crypto_balances.keys())
         self.__timer = 1800
-        self.__engine = sqlalchemy.create_engine(f"sqlite:///{config.db_path}")
 
     # ----- HANDLING DATA ----- #
 
-    @staticmethod
-    def get_correct_fractional_part(symbol, quantity, price=True):
+    def get_correct_fractional_part(self, symbol, quantity, price=True):
         """
         Determines how many numbers the fractional part of the quantity may have according to Binance API rules.
 
@@ -33,16 +44,13 @@ class TraderBot:
         Default is True.
         :return: The adjusted quantity.
         """
-        symbol_info = get_exchange_info(symbol)["symbols"][0]
 
         if price:
-            lot_size_filter = symbol_info["filters"][0]
-            step_type = "tickSize"
+            step = self._symbol_filters.get_tick_size(symbol=symbol)
         else:
-            lot_size_filter = symbol_info["filters"][2]
-            step_type = "stepSize"
+            step = self._symbol_filters.get_step_size(symbol=symbol)
 
-        step_size = lot_size_filter[step_type].find("1") - 1
+        step_size = step.find("1") - 1
 
         if step_size < 0:
             return math.floor(quantity)
@@ -77,7 +85,7 @@ class TraderBot:
         :return: (tuple) Returns the price and asset quantity; ready to be used for the order.
         """
 
-        price = float(get_latest_price(strategy.symbol)["price"])
+        price = self._prices.get_price(symbol=strategy.symbol)
         crypto = self._portfolio.query_crypto_balance(crypto=strategy.symbol)
 
         if action == "buy":
@@ -124,31 +132,60 @@ class TraderBot:
             print("There is no fiat in your account. No order will be place.")
 
         else:
+            client_order_id = self._order_tracker.track()
+
             try:
-                receipt = post_order(asset=symbol, action=action, order_type="limit", price=price,
-                                     quantity_type="quantity", amount=crypto_coins)
-                confirmation = query_order(asset_symbol=symbol, order_id=receipt["orderId"])
+                with order_latency.time(stage="post", side=action):
+                    receipt = post_order(asset=symbol, action=action, order_type="limit", price=price,
+                                         quantity_type="quantity", amount=crypto_coins,
+                                         client_order_id=client_order_id)
 
-                # Will check if the limit order is filled. After a certain amount of time it will cancel the
+                # Will wait until the limit order is filled. After a certain amount of time it will cancel the
                 # order and try again.
-                for _ in range(2):
-                    if confirmation["status"].lower() == "filled":
-                        return confirmation
-                    else:
-                        time.sleep(5)
-                        confirmation = query_order(asset_symbol=symbol, order_id=receipt["orderId"])
+                with order_latency.time(stage="fill", side=action):
+                    confirmation = self._order_tracker.wait(symbol=symbol, order_id=receipt["orderId"],
+                                                            client_order_id=client_order_id)
+                orders.inc(side=action, status=confirmation["status"].lower())
+
+                if confirmation["status"].lower() == "filled":
+                    return confirmation
+
+                with order_latency.time(stage="cancel", side=action):
+                    order = cancel_order(symbol=symbol, order_id=receipt["orderId"])
 
-                order = cancel_order(symbol=symbol, order_id=receipt["orderId"])
+                # Part of the order may have been filled before it was cancelled.
+                self._portfolio.account_state.apply_fill(order)
 
             except BinanceAccountIssue:
+                self.save_snapshot()
                 os.system(config.command)
                 sys.exit("Restarting bot. Please fix issue if it persists.")
 
             else:
                 if order["status"] == "canceled":
                     print("Limit order was not filled, order is cancelled. Will try again.")
+                    self._prices.refresh()
                     return self.place_limit_order(symbol=symbol, action=action, strategy=strategy)
 
+            finally:
+                # The future is forgotten as well when the order couldn't be placed or the wait failed.
+                self._order_tracker.forget(client_order_id)
+
+    def execute_action(self, action, strategy):
+        """
+        Places the limit order for an action and processes it when it's filled.
+
+        :param action: (str) The action that the limit order will execute. Can be either "buy" or "sell".
+        :param strategy: (object) The strategy that is currently used.
+        """
+
+        order_receipt = self.place_limit_order(symbol=strategy.symbol, action=action, strategy=strategy)
+
+        if order_receipt:
+            if order_receipt["status"].lower() == "filled":
+                self.process_order(receipt=order_receipt, strategy=strategy)
+                self.print_new_order(action, strategy.symbol)
+
     def process_order(self, receipt, strategy):
         """
         Will process the order and adjust all attributes if the order is filled.
@@ -157,7 +194,7 @@ class TraderBot:
         :param strategy: (object The strategy that is currently used.
         """
 
-        self._portfolio.update_portfolio()
+        self._portfolio.process_fill(receipt=receipt)
 
         if receipt["side"].lower() == "buy":
             strategy.stop_loss = TrailingStopLoss()
@@ -207,7 +244,6 @@ class TraderBot:
 
     def activate(self):
         """Activate the main loop of the bot"""
-        just_posted = False
 
         for symbol, crypto in self._portfolio.crypto_balances.items():
             try:
@@ -215,18 +251,79 @@ class TraderBot:
             except BinanceAccountIssue:
                 print(f"There are no orders to cancel for {symbol.upper()}.")
 
-        while True:
-            current_time = time.time()
+        if self._market_stream:
+            self._market_stream.start()
+        self._order_tracker.start()
 
-            if -1 <= (current_time % 60) <= 1:
+        scheduler = self.create_scheduler()
 
-                for strategy in self._strategies:
-                    action = None
+        try:
+            while True:
+                # Sleeps, or processes the market stream, until the next candle closes.
+                events = self.check_deadlines(scheduler.wait(idle=self.idle))
+                streaming = self._market_stream is not None and self._market_stream.connected
+                self.tick(check_signal="30m" in events, streaming=streaming)
+
+                if "30m" in events:
+                    self.save_snapshot()
+        finally:
+            self.save_snapshot()
+
+    def create_scheduler(self):
+        """
+        Schedules a tick at the close of every 1m candle, and a signal check at the close of every 30m candle. The
+        closes of the 1h and 4h candles fall on a 30m close, so the signal check uses those as well.
+
+        :return: (Scheduler) The scheduler.
+        """
+
+        scheduler = Scheduler(clock=self._clock)
+        scheduler.add(name="1m", interval=60)
+        scheduler.add(name="30m", interval=self.__timer)
+        return scheduler
+
+    @staticmethod
+    def check_deadlines(events):
+        """
+        Reports the deadlines that were missed because the previous tick took too long.
+
+        :param events: (list) The due events of the scheduler.
+        :return: (dict) The due events by name.
+        """
+
+        for event in events:
+            if event.missed:
+                missed_deadlines.inc(event.missed, event=event.name)
+                print(f"Missed {event.missed} {event.name} deadline(s), the previous tick took too long.")
+        return {event.name: event for event in events}
 
-                    if -1 <= (current_time % self.__timer) <= 1:
-                        if not just_posted:
-                            just_posted = True
+    def tick(self, check_signal, streaming=False):
+        """
+        Checks all strategies once and trades on their signals.
+
+        :param check_signal: (bool) Checks for signals when True, otherwise only checks the stop losses.
+        :param streaming: (bool) True when the market stream checks the stop losses and keeps the prices up to date.
+        """
 
+        try:
+            if not streaming:
+                self._prices.refresh()
+            if check_signal:
+                self._portfolio.update_portfolio()
+
+        except BinanceConnectionIssue as error:
+            # The bot keeps its state and tries again on the next tick.
+            print(f"{error} Trying again next tick.")
+            stop_loss_repository.flush()
+            return
+
+        for strategy in self._strategies:
+            action = None
+
+            # Every symbol is measured, also when it fails, the same as in the async and the sharded bot.
+            with tick_latency.time(symbol=strategy.symbol, source="tick"):
+                try:
+                    if check_signal:
                         try:
                             data, action = strategy.check_for_signal()
 
@@ -237,25 +334,72 @@ class TraderBot:
                         self.print_new_data(df=data.df, strategy=strategy)
                         self._portfolio.print_portfolio()
 
-                    elif -0.5 <= (current_time % 60) <= 0.5:
-                        if not just_posted:
-                            just_posted = True
+                    # The market stream checks the stop losses as soon as the prices come in.
+                    elif strategy.stop_loss and not streaming:
+                        action = strategy.check_stop_loss()
 
-                        if strategy.stop_loss:
-                            action = strategy.check_stop_loss()
+                    if action and action != "continue":
+                        self.execute_action(action=action, strategy=strategy)
 
-                    if action:
+                except BinanceConnectionIssue as error:
+                    # Only this symbol is tried again on the next tick, the others are still checked.
+                    print(f"{error} Trying {strategy.symbol.upper()} again next tick.")
 
-                        if action == "continue":
-                            continue
+        # All stop loss changes of this tick are written in one transaction.
+        stop_loss_repository.flush()
+
+    def save_snapshot(self):
+        """
+        Saves the state of the strategies for a warm start, when a warm start is used.
+        """
+
+        if self._warm_start is None:
+            return
 
-                        order_receipt = self.place_limit_order(symbol=strategy.symbol, action=action, strategy=strategy)
+        try:
+            self._warm_start.save(strategies=self._strategies)
+        except OSError as error:
+            print(f"Can't write the snapshot: {error}")
 
-                        if order_receipt:
-                            if order_receipt["status"].lower() == "filled":
-                                self.process_order(receipt=order_receipt, strategy=strategy)
-                                self.print_new_order(action, strategy.symbol)
+    def idle(self, seconds):
+        """
+        Waits between ticks. When the market stream is used, the stop losses are checked in the meantime.
+
+        :param seconds: (float) The number of seconds to wait.
+        """
+
+        if self._market_stream is None:
+            self._clock.sleep(seconds)
+        else:
+            self.process_market_stream(timeout=seconds)
+
+    def process_market_stream(self, timeout):
+        """
+        Checks the trailing stop losses against the prices that come in from the market stream, until the timeout
+        has passed.
+
+        :param timeout: (float) The number of seconds to process the stream.
+        """
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            ranges = self._market_stream.wait(timeout=max(remaining, 0))
+
+            for symbol, (low, high, last) in ranges.items():
+                self._prices.update(symbol=symbol, price=last)
+                strategy = self._strategies_by_symbol.get(symbol)
+
+                if strategy and strategy.stop_loss:
+                    with tick_latency.time(symbol=symbol, source="stream"):
+                        action = strategy.check_stop_loss(low=low, high=high)
+
+                    if action == "sell":
+                        try:
+                            self.execute_action(action="sell", strategy=strategy)
+                        except BinanceConnectionIssue as error:
+                            print(f"{error} Trying again with the next price.")
 
-            if just_posted:
-                time.sleep(55)
-                just_posted = False
+            if remaining <= 0:
+                return
@@ -0,0 +1,27 @@
+"""
+Lets the tests import the modules of the bot the way the bot imports them, ie. "from class_blueprints.trader import
+get_balance", with test settings in place of the config.py of the user.
+"""
+
+import os
+import sys
+import tempfile
+import types
+
+BOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bot")
+
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+if "config" not in sys.modules:
+    config = types.ModuleType("config")
+    config.apiKey = config.apiSecret = "test"
+    config.header = {"X-MBX-APIKEY": "test"}
+    config.db_path = os.path.join(tempfile.mkdtemp(prefix="bot-tests-"), "trades.db")
+    config.command = ""
+    config.FIAT_MARKET = "eur"
+    config.CRYPTOS = {"btc": "bitcoin"}
+    config.USER = config.BOT_NAME = "test"
+    # Nothing listens on this port, so a test can never reach the Binance API.
+    config.API_URL = "http://127.0.0.1:9"
+    sys.modules["config"] = config
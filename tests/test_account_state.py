@@ -0,0 +1,123 @@
+from bot.class_blueprints.clock import SimulatedClock
+from bot.class_blueprints.account_state import AccountState
+
+
+def create_state(balances, update_time=1_000, **kwargs):
+    responses = []
+
+    def fetch():
+        responses.append(balances)
+        return {"updateTime": update_time, "balances": [{"asset": asset.upper(), "free": str(free), "locked": "0"}
+                                                        for asset, free in balances.items()]}
+
+    clock = SimulatedClock(start=0)
+    state = AccountState(fiat="eur", fetch=fetch, clock=clock, **kwargs)
+    state.refresh()
+    return state, clock, responses
+
+
+def fill(side, quantity, quote_quantity, update_time, price=None):
+    return {"symbol": "BTCEUR", "side": side, "status": "FILLED", "price": str(price or quote_quantity / quantity),
+            "origQty": str(quantity), "executedQty": str(quantity), "cummulativeQuoteQty": str(quote_quantity),
+            "updateTime": update_time}
+
+
+def position(update_time, **balances):
+    return {"u": update_time, "B": [{"a": asset.upper(), "f": str(free), "l": str(locked)}
+                                    for asset, (free, locked) in balances.items()]}
+
+
+def test_fills_change_the_balances_without_a_download():
+    state, clock, responses = create_state({"eur": 1000, "btc": 0}, fee=0.001)
+
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=2_000))
+    assert state.get_balance("eur") == 800
+    assert state.get_balance("btc") == 2 * 0.999
+
+    state.apply_fill(fill(side="SELL", quantity=1, quote_quantity=150, update_time=3_000))
+    assert state.get_balance("eur") == 800 + 150 * 0.999
+    assert state.get_balance("BTC") == 2 * 0.999 - 1
+    assert state.get_balance("eth") == 0
+
+    assert not state.refresh()
+    assert len(responses) == 1
+
+
+def test_fills_before_the_reported_balances_are_skipped():
+    state, clock, responses = create_state({"eur": 1000, "btc": 0}, fee=0)
+
+    # The balance update of the stream arrives before the order tracker hands over the fill.
+    state.apply_balances(position(2_000, eur=(800, 0), btc=(2, 0)))
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=2_000))
+    assert state.get_balance("eur") == 800
+    assert state.get_balance("btc") == 2
+
+    # A fill from before the last download is in the downloaded balances.
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=500))
+    assert state.get_balance("eur") == 800
+
+
+def test_the_lock_of_a_placed_order_is_spent_once():
+    state, clock, responses = create_state({"eur": 1000, "btc": 0}, fee=0)
+
+    # The stream reports the placement of the buy order, the price limit is locked.
+    state.apply_balances(position(1_500, eur=(790, 210)))
+    assert state.get_balance("eur") == 790
+
+    # It's filled below the limit, so the rest of the lock is free again.
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=2_000, price=105))
+    assert state.get_balance("eur") == 800
+    assert state.get_balance("btc") == 2
+
+    state.apply_balances(position(2_000, eur=(800, 0), btc=(2, 0)))
+    assert not state.stale
+
+    # The same for a sell order, of which the coins are locked.
+    state.apply_balances(position(2_500, btc=(0, 2)))
+    state.apply_fill(fill(side="SELL", quantity=2, quote_quantity=220, update_time=3_000))
+    assert state.get_balance("btc") == 0
+    assert state.get_balance("eur") == 1020
+
+    state.apply_balances(position(3_000, eur=(1020, 0), btc=(0, 0)))
+    assert not state.stale
+    assert len(responses) == 1
+
+
+def test_a_receipt_without_an_exchange_time_triggers_a_resync():
+    state, clock, responses = create_state({"eur": 1000, "btc": 0}, fee=0)
+
+    receipt = fill(side="BUY", quantity=2, quote_quantity=200, update_time=None)
+    state.apply_fill(receipt)
+    assert state.get_balance("eur") == 1000
+    assert state.stale
+
+
+def test_drift_triggers_a_resync():
+    state, clock, responses = create_state({"eur": 1000, "btc": 0}, fee=0)
+
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=2_000))
+    state.apply_balances(position(3_000, btc=(1.5, 0)))
+    assert state.get_balance("btc") == 1.5
+    assert state.stale
+
+    assert state.refresh()
+    assert len(responses) == 2
+    assert not state.stale
+
+
+def test_spending_more_than_the_balance_triggers_a_resync():
+    state, clock, responses = create_state({"eur": 100, "btc": 0}, fee=0)
+
+    state.apply_fill(fill(side="BUY", quantity=2, quote_quantity=200, update_time=2_000))
+    assert state.get_balance("eur") == 0
+    assert state.stale
+
+
+def test_balances_are_downloaded_again_on_a_timer():
+    state, clock, responses = create_state({"eur": 100}, resync_interval=3600)
+
+    clock.advance(3599)
+    assert not state.refresh()
+    clock.advance(1)
+    assert state.refresh()
+    assert len(responses) == 2
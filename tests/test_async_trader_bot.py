@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+from types import SimpleNamespace
+from tests import bot_env
+from class_blueprints import trader
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.paper_exchange import PaperExchange
+from async_trader_bot import AsyncTraderBot
+
+SYMBOLS = ["btceur", "etheur"]
+
+
+class FakePortfolio:
+
+    crypto_balances = dict.fromkeys(SYMBOLS)
+
+    def print_portfolio(self):
+        pass
+
+
+class FakePrices:
+
+    def __init__(self):
+        self.prices = {}
+
+    def update(self, symbol, price):
+        self.prices[symbol] = price
+
+
+class FakeStrategy:
+    """Checks for a signal in a worker thread until it's released."""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.market_state = "bull"
+        self.stop_loss = SimpleNamespace(trail=1.0)
+        self.checks = 0
+        self.stop_loss_checks = 0
+        self.release = threading.Event()
+
+    def check_for_signal(self):
+        self.checks += 1
+        self.release.wait(timeout=5)
+        return SimpleNamespace(df=pd.DataFrame({"Price": [1.0]})), "continue"
+
+    def check_stop_loss(self, low=None, high=None):
+        self.stop_loss_checks += 1
+        return "continue"
+
+
+class FakeMarketStream:
+
+    def __init__(self, ranges):
+        self._ranges = ranges
+
+    def wait(self, timeout):
+        ranges, self._ranges = self._ranges, {}
+        if not ranges:
+            time.sleep(0.01)
+        return ranges
+
+
+def create_bot(monkeypatch, market_stream=None):
+    # The symbol filters are loaded from the paper exchange instead of Binance.
+    candles = {symbol: [[1_600_000_000_000, 1, 1, 1, 1, 1]] for symbol in SYMBOLS}
+    exchange = PaperExchange(candles=candles, clock=SimulatedClock(start=1_600_000_000), balances={"eur": 1000},
+                             fiat="eur")
+    monkeypatch.setattr(trader, "client", exchange)
+
+    strategies = [FakeStrategy(symbol=symbol) for symbol in SYMBOLS]
+    bot = AsyncTraderBot(name="test", strategies=strategies, portfolio=FakePortfolio(), prices=FakePrices(),
+                         market_stream=market_stream)
+    return bot, strategies
+
+
+def test_buy_orders_are_placed_one_at_a_time(monkeypatch):
+    bot, strategies = create_bot(monkeypatch)
+    events = []
+
+    async def place_limit_order_async(symbol, action, strategy):
+        events.append(f"place {symbol}")
+        await asyncio.sleep(0.01)
+        events.append(f"placed {symbol}")
+
+    monkeypatch.setattr(bot, "place_limit_order_async", place_limit_order_async)
+
+    async def trade(action):
+        # The lock is made in the loop of the bot, like run does.
+        bot._AsyncTraderBot__buy_lock = asyncio.Lock()
+        await asyncio.gather(*(bot._trade(action=action, strategy=strategy) for strategy in strategies))
+
+    # Both buy signals spend the same fiat balance, so the second waits until the first is done.
+    asyncio.run(trade(action="buy"))
+    assert events == ["place btceur", "placed btceur", "place etheur", "placed etheur"]
+
+    # Sell orders spend their own coins and are placed at the same time.
+    events.clear()
+    asyncio.run(trade(action="sell"))
+    assert events == ["place btceur", "place etheur", "placed btceur", "placed etheur"]
+
+
+def test_a_strategy_that_is_still_busy_is_skipped(monkeypatch):
+    bot, strategies = create_bot(monkeypatch)
+    strategy = strategies[0]
+
+    async def run_ticks():
+        bot._start_strategy(strategy=strategy, check_signal=True)
+        await asyncio.sleep(0.05)
+
+        # The next tick starts while the signal check of the previous tick hasn't finished.
+        bot._start_strategy(strategy=strategy, check_signal=True)
+        strategy.release.set()
+        while bot._AsyncTraderBot__busy:
+            await asyncio.sleep(0.01)
+
+        bot._start_strategy(strategy=strategy, check_signal=True)
+        while bot._AsyncTraderBot__busy:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run_ticks())
+    assert strategy.checks == 2
+
+
+def test_the_market_stream_skips_a_busy_strategy(monkeypatch):
+    market_stream = FakeMarketStream(ranges={"btceur": (1.0, 2.0, 1.5), "etheur": (3.0, 4.0, 3.5)})
+    bot, strategies = create_bot(monkeypatch, market_stream=market_stream)
+
+    async def consume():
+        bot._start_strategy(strategy=strategies[0], check_signal=True)
+        consumer = asyncio.create_task(bot._consume_market_stream())
+        await asyncio.sleep(0.05)
+
+        consumer.cancel()
+        strategies[0].release.set()
+        while bot._AsyncTraderBot__busy:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(consume())
+    assert [strategy.stop_loss_checks for strategy in strategies] == [0, 1]
+    assert bot._prices.prices == {"btceur": 1.5, "etheur": 3.5}
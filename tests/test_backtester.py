@@ -0,0 +1,131 @@
+import math
+import random
+import numpy as np
+from bot.class_blueprints.backtester import Backtester, exponential_moving_average, HALF_HOUR, HOUR, FOUR_HOURS
+from bot.class_blueprints.indicators import IndicatorEngine, ExponentialMovingAverage, RelativeStrengthIndex
+
+
+def create_candles(n, seed=7):
+    generator = random.Random(seed)
+    price = 2000.0
+    rows = []
+    for i in range(n):
+        open_price = price
+        price = price * (1 + generator.gauss(0, 0.01) + 0.002 * math.sin(i / 400))
+        high = max(open_price, price) * (1 + abs(generator.gauss(0, 0.003)))
+        low = min(open_price, price) * (1 - abs(generator.gauss(0, 0.003)))
+        rows.append([i * HALF_HOUR, open_price, high, low, price])
+    return rows
+
+
+def aggregate(rows, interval):
+    candles = {}
+    for open_time, open_price, high, low, close in rows:
+        start = open_time - open_time % interval
+        if start not in candles:
+            candles[start] = [start, open_price, high, low, close]
+        else:
+            candle = candles[start]
+            candle[2], candle[3], candle[4] = max(candle[2], high), min(candle[3], low), close
+    return list(candles.values())
+
+
+def to_arrays(rows):
+    columns = list(zip(*rows))
+    arrays = {"open_time": np.array(columns[0], dtype=np.int64)}
+    for position, name in enumerate(("open", "high", "low", "close"), start=1):
+        arrays[name] = np.array(columns[position])
+    return arrays
+
+
+def frame(rows, interval, decision_time, price, limit):
+    """The frame that the live bot downloads: closed candles plus the open candle priced at the current price"""
+    closed = [row for row in rows if row[0] + interval <= decision_time][-(limit - 1):]
+    return np.array([row[0] for row in closed] + [decision_time]), np.array([row[4] for row in closed] + [price])
+
+
+def live_signals(rows):
+    """Decides bar by bar with the streaming indicators, like Strategy.check_for_signal"""
+    hours, four_hours = aggregate(rows, HOUR), aggregate(rows, FOUR_HOURS)
+    engines = {"4h": IndicatorEngine(), "30m": IndicatorEngine(), "1h": IndicatorEngine()}
+    decisions = []
+
+    for i, row in enumerate(rows):
+        decision_time, price = row[0] + HALF_HOUR, row[4]
+
+        times, prices = frame(four_hours, FOUR_HOURS, decision_time, price, 1000)
+        engines["4h"].update(times, prices)
+        for window in (50, 200):
+            engines["4h"].add(f"EMA_{window}", ExponentialMovingAverage(window), times, prices)
+        if len(times) - 1 < 200:
+            decisions.append((0, False, False, False))
+            continue
+
+        fast, slow = engines["4h"].latest("EMA_50"), engines["4h"].latest("EMA_200")
+        state = 1 if fast > slow else -1 if fast < slow else 0
+
+        times, prices = frame(rows, HALF_HOUR, decision_time, price, 1000)
+        engines["30m"].update(times, prices)
+        for window in (8, 21):
+            engines["30m"].add(f"EMA_{window}", ExponentialMovingAverage(window), times, prices)
+        ema_8, ema_21 = engines["30m"].latest("EMA_8"), engines["30m"].latest("EMA_21")
+
+        times, prices = frame(hours, HOUR, decision_time, price, 50)
+        engines["1h"].update(times, prices)
+        engines["1h"].add("RSI", RelativeStrengthIndex(14, window=49), times, prices)
+        rsi = engines["1h"].latest("RSI") if len(times) == 50 else float("nan")
+
+        decisions.append((state,
+                          (state == 1 and ema_8 > ema_21) or (state == -1 and rsi <= 30),
+                          state == 1 and ema_8 < ema_21,
+                          state == -1 and rsi >= 40))
+    return decisions
+
+
+def live_trades(rows, decisions, trail_ratio=0.95):
+    """Walks the candles like the live bot, checking the trailing stop loss during every candle"""
+    trades, stop_loss = [], None
+    for i, row in enumerate(rows):
+        if stop_loss:
+            level = min(stop_loss["highest"] * trail_ratio, stop_loss["buy_price"])
+            if row[3] < level:
+                trades.append((stop_loss["entry"], i, "stop loss"))
+                stop_loss = None
+            else:
+                stop_loss["highest"] = max(stop_loss["highest"], row[2])
+
+        state, buy, bull_sell, bear_sell = decisions[i]
+        if not stop_loss and buy:
+            stop_loss = {"entry": i, "buy_price": row[4] * 1.001, "highest": row[4] * 1.001}
+        elif stop_loss and ((bull_sell and row[4] > stop_loss["buy_price"]) or bear_sell):
+            trades.append((stop_loss["entry"], i, "signal"))
+            stop_loss = None
+    return trades
+
+
+def test_ema_matches_recursion():
+    values = np.array([row[4] for row in create_candles(5000)])
+    expected = [values[0]]
+    for value in values[1:]:
+        expected.append((1 - 2 / 22) * expected[-1] + 2 / 22 * value)
+    assert np.allclose(exponential_moving_average(values, 21), expected, rtol=1e-10)
+
+
+def test_signals_and_trades_match_live_strategy():
+    rows = create_candles(4000)
+    candles = {"30m": to_arrays(rows), "1h": to_arrays(aggregate(rows, HOUR)),
+               "4h": to_arrays(aggregate(rows, FOUR_HOURS))}
+    backtester = Backtester(candles=candles)
+    signals = backtester.signals
+    decisions = live_signals(rows)
+
+    assert [decision[0] for decision in decisions] == signals["market_state"].tolist()
+    assert [decision[1] for decision in decisions] == signals["buy"].tolist()
+    assert [decision[2] for decision in decisions] == signals["bull_sell"].tolist()
+    assert [decision[3] for decision in decisions] == signals["bear_sell"].tolist()
+
+    result = backtester.run()
+    expected = live_trades(rows, decisions)
+    assert result["number_of_trades"] > 0
+    assert [(trade["entry_index"], trade["exit_index"], trade["reason"]) for trade in result["trades"]] == \
+           expected[:result["number_of_trades"]]
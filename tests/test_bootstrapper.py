@@ -0,0 +1,43 @@
+import threading
+import time
+import pytest
+from bot.class_blueprints.bootstrapper import Bootstrapper
+
+
+def test_objects_are_created_concurrently_in_order_of_the_symbols():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def create(symbol):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return symbol.upper()
+
+    bootstrapper = Bootstrapper(workers=4)
+    symbols = [f"c{number}eur" for number in range(12)]
+    assert bootstrapper.run(symbols=symbols, create=create) == [symbol.upper() for symbol in symbols]
+    assert peak[0] == 4
+    assert set(bootstrapper.timings) == set(symbols)
+    assert bootstrapper.total < sum(bootstrapper.timings.values())
+
+    table = bootstrapper.format_timings(limit=2).splitlines()
+    assert len(table) == 5
+    assert table[1].startswith("C")
+
+
+def test_an_error_is_raised_after_the_other_symbols_are_done():
+    created = []
+
+    def create(symbol):
+        if symbol == "btceur":
+            raise ValueError("no candles")
+        created.append(symbol)
+        return symbol
+
+    with pytest.raises(ValueError):
+        Bootstrapper(workers=2).run(symbols=["btceur", "etheur", "adaeur"], create=create)
+    assert sorted(created) == ["adaeur", "etheur"]
@@ -0,0 +1,14 @@
+import numpy as np
+from bot.class_blueprints.candles import Candles
+
+
+def test_candles_from_api_klines():
+    klines = [[1000 * i, "1.0", "2.0", "0.5", f"{100 + i}.5", "10.0", 1000 * i + 999, "0", 1, "0", "0", "0"]
+              for i in range(3)]
+    candles = Candles.from_klines(klines)
+
+    assert len(candles) == 3
+    assert candles.open_times.dtype == np.int64 and candles.closes.dtype == np.float64
+    assert candles.open_times.tolist() == [0, 1000, 2000]
+    assert candles.closes.tolist() == [100.5, 101.5, 102.5]
+    assert candles.nbytes == 48
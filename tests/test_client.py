@@ -0,0 +1,91 @@
+import ast
+import inspect
+from tests import bot_env
+from class_blueprints import client as client_module
+from class_blueprints import trader
+from class_blueprints.client import BinanceClient
+from class_blueprints.rate_limiter import RateLimiter
+
+ENDPOINTS = {
+    "get_latest_price": lambda: trader.get_latest_price(asset="btceur"),
+    "get_latest_prices": lambda: trader.get_latest_prices(assets=["btceur", "etheur"]),
+    "get_history": lambda: trader.get_history(symbol="btceur", interval="30m", limit=10),
+    "get_balance": lambda: trader.get_balance(),
+    "post_order": lambda: trader.post_order(asset="btceur", action="buy", order_type="limit", price=100,
+                                            quantity_type="quantity", amount=1, client_order_id="abc"),
+    "get_exchange_info": lambda: trader.get_exchange_info(assets=["btceur"]),
+    "query_order": lambda: trader.query_order(asset_symbol="btceur", order_id=1),
+    "cancel_order": lambda: trader.cancel_order(symbol="btceur", order_id=1),
+    "cancel_all_orders": lambda: trader.cancel_all_orders(symbol="btceur"),
+    "create_listen_key": lambda: trader.create_listen_key(),
+    "keep_alive_listen_key": lambda: trader.keep_alive_listen_key(listen_key="key"),
+    "close_listen_key": lambda: trader.close_listen_key(listen_key="key"),
+}
+
+
+class FakeResponse:
+
+    status_code = 200
+    ok = True
+    headers = {"X-MBX-USED-WEIGHT-1M": "10"}
+    content = b"[]"
+
+    def json(self):
+        return {}
+
+
+class FakeSession:
+    """Stands in for requests.Session and records every request that is sent over it."""
+
+    created = []
+
+    def __init__(self):
+        self.headers = {}
+        self.mounted = {}
+        self.requests = []
+        FakeSession.created.append(self)
+
+    def mount(self, prefix, adapter):
+        self.mounted[prefix] = adapter
+
+    def request(self, method, url, params=None, timeout=None):
+        self.requests.append((method, url, timeout))
+        return FakeResponse()
+
+
+def get_endpoint_names():
+    """The functions of the trader module that are decorated with check_response"""
+    tree = ast.parse(inspect.getsource(trader))
+    return {node.name for node in tree.body if isinstance(node, ast.FunctionDef)
+            and any("check_response" in ast.dump(decorator) for decorator in node.decorator_list)}
+
+
+def test_every_endpoint_uses_the_one_pooled_session(monkeypatch):
+    FakeSession.created = []
+    monkeypatch.setattr(client_module.requests, "Session", FakeSession)
+    client = BinanceClient(base_url="http://127.0.0.1:9/", headers={"X-MBX-APIKEY": "test"}, pool_size=4, timeout=7,
+                           rate_limiter=RateLimiter(weight_limit=1200))
+    monkeypatch.setattr(trader, "client", client)
+
+    paths = []
+    request = client.request
+
+    def record_request(method, path, params=None, priority=None):
+        paths.append(path)
+        return request(method, path, params=params, priority=priority)
+
+    monkeypatch.setattr(client, "request", record_request)
+
+    assert set(ENDPOINTS) == get_endpoint_names()
+    for call in ENDPOINTS.values():
+        call()
+
+    # One session with the pool for both schemes, and the api key header, was made for all requests.
+    session, = FakeSession.created
+    assert session.mounted["https://"] is session.mounted["http://"]
+    assert session.mounted["https://"]._pool_maxsize == 4
+    assert session.headers == {"X-MBX-APIKEY": "test"}
+
+    assert len(paths) == len(ENDPOINTS)
+    assert [(url, timeout) for method, url, timeout in session.requests] == [
+        (f"http://127.0.0.1:9{path}", 7) for path in paths]
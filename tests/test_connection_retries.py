@@ -0,0 +1,248 @@
+import pytest
+import requests
+from tests import bot_env
+import config
+import decorators
+from decorators import get_backoff, connection_authenticator
+from class_blueprints import circuit_breaker as circuit_breaker_module
+from class_blueprints import rate_limiter as rate_limiter_module
+from class_blueprints import trader
+from class_blueprints.circuit_breaker import CircuitBreaker
+from class_blueprints.client import BinanceClient
+from class_blueprints.exceptions import BinanceConnectionIssue
+from class_blueprints.rate_limiter import RateLimiter
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data or {}
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(decorators, "get_backoff", lambda attempt: 0)
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(decorators.random, "uniform", lambda low, high: high)
+    assert [get_backoff(attempt=attempt, base=0.5, cap=30) for attempt in range(8)] == [0.5, 1, 2, 4, 8, 16, 30, 30]
+
+    monkeypatch.setattr(decorators.random, "uniform", lambda low, high: low)
+    assert get_backoff(attempt=5) == 0
+
+
+def test_a_failing_connection_is_tried_the_number_of_retries(monkeypatch, no_sleep):
+    monkeypatch.setattr(config, "RETRIES", 3, raising=False)
+    monkeypatch.setattr(config, "BREAKER_THRESHOLD", 100, raising=False)
+    calls = []
+
+    @connection_authenticator
+    def get_prices():
+        calls.append(1)
+        raise requests.exceptions.ConnectionError()
+
+    with pytest.raises(BinanceConnectionIssue):
+        get_prices()
+    assert len(calls) == 4
+
+
+def test_a_server_error_is_returned_after_the_retries(monkeypatch, no_sleep):
+    monkeypatch.setattr(config, "RETRIES", 2, raising=False)
+    monkeypatch.setattr(config, "BREAKER_THRESHOLD", 100, raising=False)
+    responses = [FakeResponse(502), FakeResponse(200)]
+
+    @connection_authenticator
+    def get_prices():
+        return responses.pop(0)
+
+    assert get_prices().status_code == 200
+
+    responses = [FakeResponse(503)] * 3
+    assert get_prices().status_code == 503
+    assert not responses
+
+
+def test_the_breaker_skips_the_endpoint_until_it_recovers(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(name="get_prices", failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    # After the reset timeout one test request is let through, a failure opens the breaker again.
+    now[0] += 30
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # A test request that succeeds closes the breaker.
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_an_unexpected_error_of_the_test_request_does_not_block_the_endpoint(monkeypatch, no_sleep):
+    monkeypatch.setattr(config, "RETRIES", 0, raising=False)
+    monkeypatch.setattr(config, "BREAKER_THRESHOLD", 1, raising=False)
+    monkeypatch.setattr(config, "BREAKER_TIMEOUT", 30, raising=False)
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    errors = [requests.exceptions.Timeout(), requests.exceptions.ChunkedEncodingError()]
+
+    @connection_authenticator
+    def get_prices():
+        if errors:
+            raise errors.pop(0)
+        return FakeResponse(200)
+
+    with pytest.raises(BinanceConnectionIssue):
+        get_prices()
+
+    # The test request of the half-open breaker fails with an error that isn't retried.
+    now[0] += 30
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        get_prices()
+
+    now[0] += 30
+    assert get_prices().status_code == 200
+
+
+def test_the_breaker_stops_the_retries(monkeypatch, no_sleep):
+    monkeypatch.setattr(config, "RETRIES", 5, raising=False)
+    monkeypatch.setattr(config, "BREAKER_THRESHOLD", 2, raising=False)
+    calls = []
+
+    @connection_authenticator
+    def get_prices():
+        calls.append(1)
+        raise requests.exceptions.Timeout()
+
+    with pytest.raises(BinanceConnectionIssue, match="unavailable"):
+        get_prices()
+    assert len(calls) == 2
+
+
+class FakeOrderClient:
+    """Loses the response of the first post, the order was placed anyway."""
+
+    def __init__(self, placed):
+        self.placed = placed
+        self.posts = 0
+        self.lookups = 0
+
+    def post(self, endpoint, params=None):
+        self.posts += 1
+        if self.posts == 1:
+            raise requests.exceptions.ReadTimeout()
+        return FakeResponse(200, {"orderId": 2, "clientOrderId": params["newClientOrderId"]})
+
+    def get(self, endpoint, params=None):
+        self.lookups += 1
+        if self.placed:
+            return FakeResponse(200, {"orderId": 1, "clientOrderId": params["origClientOrderId"]})
+        return FakeResponse(400, {"code": -2013, "msg": "Order does not exist."})
+
+
+def place_order():
+    return trader.post_order(asset="btceur", action="buy", order_type="limit", price=100, quantity_type="quantity",
+                             amount=1, client_order_id="abc")
+
+
+def test_an_order_that_was_placed_is_found_instead_of_placed_again(monkeypatch, no_sleep):
+    client = FakeOrderClient(placed=True)
+    monkeypatch.setattr(trader, "client", client)
+
+    assert place_order() == {"orderId": 1, "clientOrderId": "abc"}
+    assert (client.posts, client.lookups) == (1, 1)
+
+
+def test_an_order_that_was_not_placed_is_placed_again(monkeypatch, no_sleep):
+    client = FakeOrderClient(placed=False)
+    monkeypatch.setattr(trader, "client", client)
+
+    assert place_order() == {"orderId": 2, "clientOrderId": "abc"}
+    assert (client.posts, client.lookups) == (2, 1)
+
+
+class FakeTime:
+    """Time that only moves when the bot sleeps."""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSession:
+    """Answers with the given status codes and records the parameters of every request."""
+
+    def __init__(self, status_codes):
+        self._status_codes = list(status_codes)
+        self.params = []
+
+    def request(self, method, url, params=None, timeout=None):
+        self.params.append(dict(params))
+        status_code = self._status_codes.pop(0)
+        if status_code == 429:
+            return FakeResponse(429, {"code": -1003}, headers={"Retry-After": "60"})
+        return FakeResponse(200, {"balances": []}, headers={"X-MBX-USED-WEIGHT-1M": "20"})
+
+
+def create_client(monkeypatch, status_codes):
+    fake_time = FakeTime(now=1_600_000_000)
+    for module in (decorators, trader, rate_limiter_module):
+        monkeypatch.setattr(module, "time", fake_time)
+
+    client = BinanceClient(base_url="http://127.0.0.1:9", rate_limiter=RateLimiter(weight_limit=1200))
+    session = FakeSession(status_codes)
+    monkeypatch.setattr(client, "_BinanceClient__session", session)
+    monkeypatch.setattr(trader, "client", client)
+    return fake_time, session
+
+
+def test_a_signed_request_is_signed_again_after_the_rate_limit(monkeypatch):
+    fake_time, session = create_client(monkeypatch, status_codes=[429, 200])
+
+    assert trader.get_balance() == {"balances": []}
+    assert fake_time.sleeps == [60]
+
+    # The resent request has the timestamp of after the wait, so it's within the recvWindow.
+    first, second = session.params
+    assert second["timestamp"] - first["timestamp"] == 60_000
+    assert second["signature"] != first["signature"]
+
+
+def test_a_rate_limit_that_lasts_is_a_connection_issue(monkeypatch):
+    # The endpoints of the trader read the number of retries when they are imported.
+    retries = getattr(config, "RETRIES", 5)
+    fake_time, session = create_client(monkeypatch, status_codes=[429] * (retries + 1))
+
+    with pytest.raises(BinanceConnectionIssue):
+        trader.get_balance()
+    assert len(session.params) == retries + 1
+    assert fake_time.sleeps == [60] * retries
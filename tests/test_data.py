@@ -0,0 +1,28 @@
+import numpy as np
+from tests import bot_env
+from class_blueprints.candles import Candles
+from class_blueprints.data import Data
+from class_blueprints.indicators import IndicatorEngine
+from class_blueprints.metrics import indicator_latency
+
+
+def count_updates():
+    return sum(entry["count"] for entry in indicator_latency.to_dict() if entry["labels"] == {"indicator": "update"})
+
+
+def create_candles(length):
+    return Candles(open_times=np.arange(length, dtype=np.int64) * 1_800_000,
+                   closes=100 + np.sin(np.arange(length, dtype=np.float64)))
+
+
+def test_the_update_of_every_tick_is_timed():
+    engine = IndicatorEngine()
+    first = Data(create_candles(300), indicators=engine)
+    first.set_ema(window=50)
+    updates = count_updates()
+
+    # After the first tick the indicator is only updated with the new candle, that's still measured.
+    second = Data(create_candles(301), indicators=engine)
+    second.set_ema(window=50)
+    assert count_updates() == updates + 1
+    assert second.latest("EMA_50") != first.latest("EMA_50")
@@ -0,0 +1,85 @@
+import pytest
+from tests import bot_env
+from class_blueprints import exchange_info as exchange_info_module
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.exceptions import BinanceConnectionIssue
+from class_blueprints.exchange_info import SymbolFilters
+
+
+class FakeExchange:
+    """Answers the exchangeInfo endpoint with the filters of the symbols it lists."""
+
+    def __init__(self, tick_size="0.01000000"):
+        self.tick_size = tick_size
+        self.listed = ["BTCEUR", "ETHEUR"]
+        self.requests = []
+        self.error = None
+
+    def get_exchange_info(self, assets):
+        self.requests.append(list(assets))
+        if self.error:
+            raise self.error
+
+        return {"symbols": [{"symbol": symbol, "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": "0.01000000", "tickSize": self.tick_size},
+            {"filterType": "LOT_SIZE", "minQty": "0.00001000", "stepSize": "0.00001000"},
+            {"filterType": "MIN_NOTIONAL", "minNotional": "10.00000000"},
+        ]} for symbol in self.listed if symbol.lower() in assets]}
+
+
+def create_filters(monkeypatch, ttl=3600):
+    exchange = FakeExchange()
+    monkeypatch.setattr(exchange_info_module, "get_exchange_info", exchange.get_exchange_info)
+    clock = SimulatedClock(start=1_600_000_000)
+    return SymbolFilters(symbols=["BTCEUR", "etheur"], ttl=ttl, clock=clock), exchange, clock
+
+
+def test_the_filters_of_all_symbols_are_loaded_with_one_request(monkeypatch):
+    filters, exchange, clock = create_filters(monkeypatch)
+
+    assert filters.get_tick_size(symbol="btceur") == "0.01000000"
+    assert filters.get_step_size(symbol="ETHEUR") == "0.00001000"
+    assert filters.get_filter(symbol="etheur", filter_type="MIN_NOTIONAL")["minNotional"] == "10.00000000"
+    assert exchange.requests == [["btceur", "etheur"]]
+
+
+def test_the_filters_are_loaded_again_after_the_ttl(monkeypatch):
+    filters, exchange, clock = create_filters(monkeypatch, ttl=3600)
+
+    exchange.tick_size = "0.10000000"
+    clock.advance(3600)
+    assert filters.get_tick_size(symbol="btceur") == "0.01000000"
+
+    clock.advance(1)
+    assert filters.get_tick_size(symbol="btceur") == "0.10000000"
+    assert len(exchange.requests) == 2
+
+
+def test_the_old_filters_are_used_when_they_can_not_be_loaded(monkeypatch):
+    filters, exchange, clock = create_filters(monkeypatch)
+
+    exchange.error = BinanceConnectionIssue("Can't connect to the API for get_exchange_info.")
+    clock.advance(3601)
+    assert filters.get_tick_size(symbol="btceur") == "0.01000000"
+
+    # The next call tries again.
+    exchange.error = None
+    exchange.tick_size = "0.10000000"
+    assert filters.get_tick_size(symbol="btceur") == "0.10000000"
+    assert len(exchange.requests) == 3
+
+
+def test_an_unknown_symbol_is_loaded_once(monkeypatch):
+    filters, exchange, clock = create_filters(monkeypatch)
+    exchange.listed = ["BTCEUR"]
+    filters.refresh()
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="ETHEUR"):
+            filters.get_tick_size(symbol="etheur")
+    assert len(exchange.requests) == 3
+
+    # The symbol is listed again when the filters are loaded after the ttl.
+    exchange.listed = ["BTCEUR", "ETHEUR"]
+    clock.advance(3601)
+    assert filters.get_tick_size(symbol="etheur") == "0.01000000"
@@ -0,0 +1,81 @@
+import math
+import random
+import pandas as pd
+from bot.class_blueprints.indicators import ExponentialMovingAverage, SimpleMovingAverage, RelativeStrengthIndex
+from bot.class_blueprints.indicators import IndicatorEngine
+
+TOLERANCE = 1e-9
+
+
+def random_prices(n, seed=1):
+    generator = random.Random(seed)
+    prices = [2000.0]
+    for _ in range(n - 1):
+        prices.append(prices[-1] * (1 + generator.gauss(0, 0.01)))
+    return prices
+
+
+def pandas_rsi(prices, length=14):
+    """Same calculation as pandas_ta.rsi"""
+    negative = pd.Series(prices).diff()
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    positive_avg = positive.ewm(alpha=1 / length, min_periods=length).mean()
+    negative_avg = negative.ewm(alpha=1 / length, min_periods=length).mean()
+    return 100 * positive_avg / (positive_avg + negative_avg.abs())
+
+
+def assert_close(streaming, expected):
+    if math.isnan(expected):
+        assert math.isnan(streaming)
+    else:
+        assert abs(streaming - expected) <= TOLERANCE * max(1.0, abs(expected))
+
+
+def test_ema_matches_pandas():
+    prices = random_prices(300)
+    expected = pd.Series(prices).ewm(span=21, adjust=False).mean()
+    ema = ExponentialMovingAverage(window=21)
+
+    for i, price in enumerate(prices):
+        assert_close(ema.peek(price), expected[i])
+        ema.update(price)
+
+
+def test_sma_matches_pandas():
+    prices = random_prices(300)
+    expected = pd.Series(prices).rolling(window=20).mean()
+    sma = SimpleMovingAverage(window=20)
+
+    for i, price in enumerate(prices):
+        assert_close(sma.peek(price), expected[i])
+        sma.update(price)
+
+
+def test_rsi_matches_pandas_over_sliding_frame():
+    prices = random_prices(300)
+    frame = 50
+    rsi = RelativeStrengthIndex(length=14, window=frame - 1)
+
+    for price in prices[:frame - 1]:
+        rsi.update(price)
+
+    for end in range(frame, len(prices)):
+        expected = pandas_rsi(prices[end - frame:end]).iloc[-1]
+        assert_close(rsi.peek(prices[end - 1]), expected)
+        rsi.update(prices[end - 1])
+
+
+def test_engine_only_adds_closed_candles_once():
+    prices = random_prices(100)
+    open_times = pd.DatetimeIndex(pd.date_range("2021-01-01", periods=100, freq="30min"))
+    engine = IndicatorEngine()
+
+    engine.update(open_times=open_times[:60], prices=prices[:60])
+    engine.add("EMA_8", ExponentialMovingAverage(window=8), open_times=open_times[:60], prices=prices[:60])
+
+    for end in range(61, 101):
+        engine.update(open_times=open_times[end - 60:end], prices=prices[end - 60:end])
+        expected = pd.Series(prices[:end]).ewm(span=8, adjust=False).mean().iloc[-1]
+        assert_close(engine.latest("EMA_8"), expected)
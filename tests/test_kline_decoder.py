@@ -0,0 +1,70 @@
+import json
+import pytest
+from bot.class_blueprints import kline_decoder
+from bot.class_blueprints.kline_decoder import decode_klines
+
+CONTENT = json.dumps([
+    [1_600_000_000_000, "20000.12345678", "20100.00000000", "19900.50000000", "20050.00000001", "12.34500000",
+     1_600_001_799_999, "247500.00000000", 321, "6.00000000", "120000.00000000", "0"],
+    [1_600_001_800_000, "0.00000100", "0.00000120", "0.00000090", "0.00000110", "1000000.00000000",
+     1_600_003_599_999, "1.10000000", 5, "500000.00000000", "0.55000000", "0"],
+], separators=(",", ":")).encode()
+
+
+def decode_with_float(content):
+    """
+    The path of response.json(), with float() on every field that Binance sends as a string. The last field is
+    unused by Binance, without quotes it's read as an int.
+    """
+
+    return [[float(field) if isinstance(field, str) else field for field in kline[:11]]
+            for kline in json.loads(content)]
+
+
+def get_types(klines):
+    return [[type(field) for field in kline] for kline in klines]
+
+
+@pytest.fixture(params=["json", "orjson"])
+def loads(request, monkeypatch):
+    if request.param == "orjson":
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(kline_decoder, "loads", orjson.loads)
+    else:
+        monkeypatch.setattr(kline_decoder, "loads", json.loads)
+    return request.param
+
+
+def test_klines_are_decoded_to_the_same_numbers_as_with_float(loads):
+    klines = [kline[:11] for kline in decode_klines(CONTENT)]
+    expected = decode_with_float(CONTENT)
+
+    assert klines == expected
+    assert get_types(klines) == get_types(expected)
+
+
+def test_the_open_and_close_times_stay_integers(loads):
+    kline = decode_klines(CONTENT)[0]
+    assert (kline[0], kline[6], kline[8]) == (1_600_000_000_000, 1_600_001_799_999, 321)
+    assert all(isinstance(field, int) for field in (kline[0], kline[6], kline[8]))
+
+
+def test_orjson_and_json_decode_the_same_klines(monkeypatch):
+    orjson = pytest.importorskip("orjson")
+
+    monkeypatch.setattr(kline_decoder, "loads", json.loads)
+    with_json = decode_klines(CONTENT)
+    monkeypatch.setattr(kline_decoder, "loads", orjson.loads)
+    with_orjson = decode_klines(CONTENT)
+
+    assert with_orjson == with_json
+    assert get_types(with_orjson) == get_types(with_json)
+
+
+def test_the_module_uses_orjson_when_it_is_installed():
+    try:
+        import orjson
+    except ImportError:
+        assert kline_decoder.loads is json.loads
+    else:
+        assert kline_decoder.loads is orjson.loads
@@ -0,0 +1,72 @@
+from tests import bot_env
+from sqlalchemy import create_engine
+from class_blueprints import kline_store as kline_store_module
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.kline_store import KlineStore
+
+LENGTH = 1_800_000
+START = 1_600_000_200_000 // LENGTH * LENGTH
+
+
+class FakeExchange:
+    """Serves the 30m candles that opened before the time of the clock, like the klines endpoint."""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self.closes = {}
+        self.requests = []
+
+    def get_history(self, symbol, interval, limit, start_time=None):
+        self.requests.append({"limit": limit, "start_time": start_time})
+        now = int(self._clock.time() * 1000)
+        open_times = sorted(open_time for open_time in self.closes if open_time <= now)
+
+        if start_time is None:
+            selected = open_times[-limit:]
+        else:
+            selected = [open_time for open_time in open_times if open_time >= start_time][:limit]
+        return [create_kline(open_time=open_time, close=self.closes[open_time]) for open_time in selected]
+
+
+def create_kline(open_time, close):
+    return [open_time, close, close, close, close, 1.0, open_time + LENGTH - 1]
+
+
+def create_store(tmp_path, monkeypatch):
+    clock = SimulatedClock(start=(START + 9 * LENGTH + 60_000) / 1000)
+    exchange = FakeExchange(clock=clock)
+    exchange.closes = {START + number * LENGTH: 100.0 + number for number in range(10)}
+    monkeypatch.setattr(kline_store_module, "get_history", exchange.get_history)
+
+    store = KlineStore(engine=create_engine(f"sqlite:///{tmp_path / 'klines.db'}"), clock=clock)
+    fetches = []
+    fetch_since = store._fetch_since
+
+    def record_fetch_since(symbol, interval, start_time):
+        fetches.append(start_time)
+        return fetch_since(symbol=symbol, interval=interval, start_time=start_time)
+
+    monkeypatch.setattr(store, "_fetch_since", record_fetch_since)
+    return store, clock, exchange, fetches
+
+
+def test_only_the_candles_after_the_last_stored_one_are_downloaded(tmp_path, monkeypatch):
+    store, clock, exchange, fetches = create_store(tmp_path, monkeypatch)
+
+    history = store.get_history(symbol="BTCEUR", interval="30m", limit=10)
+    assert [kline[0] for kline in history] == [START + number * LENGTH for number in range(10)]
+    assert exchange.requests == [{"limit": 10, "start_time": None}]
+
+    # Two candles later the open candle has closed at another price.
+    clock.advance(2 * LENGTH / 1000)
+    exchange.closes.update({START + 9 * LENGTH: 120.0, START + 10 * LENGTH: 121.0, START + 11 * LENGTH: 122.0})
+
+    history = store.get_history(symbol="btceur", interval="30m", limit=10)
+    assert fetches == [START + 9 * LENGTH]
+    assert exchange.requests[1:] == [{"limit": 3, "start_time": START + 9 * LENGTH}]
+    assert [kline[0] for kline in history] == [START + number * LENGTH for number in range(2, 12)]
+    assert [kline[4] for kline in history[-3:]] == [120.0, 121.0, 122.0]
+
+    # The stored candles are served from the store, also with the open candle overwritten.
+    assert store.load(symbol="btceur", interval="30m")[9] == create_kline(open_time=START + 9 * LENGTH, close=120.0)
+    assert len(store.load(symbol="btceur", interval="30m")) == 12
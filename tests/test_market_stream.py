@@ -0,0 +1,82 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from bot.class_blueprints.market_stream import MarketStream
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def send_frame(connection, text):
+    payload = text.encode()
+    if len(payload) < 126:
+        header = struct.pack("!BB", 0x81, len(payload))
+    else:
+        header = struct.pack("!BBH", 0x81, 126, len(payload))
+    connection.sendall(header + payload)
+
+
+def serve(server, messages, requests):
+    """Accepts one websocket connection, sends the messages and keeps the connection open until it's closed"""
+    connection, _ = server.accept()
+    request = b""
+    while b"\r\n\r\n" not in request:
+        request += connection.recv(1024)
+
+    lines = request.decode().split("\r\n")
+    requests.append(lines[0])
+    key = next(line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("sec-websocket-key"))
+    accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+    connection.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                        f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+
+    for message in messages:
+        send_frame(connection, json.dumps(message))
+
+    try:
+        while connection.recv(1024):
+            pass
+    except OSError:
+        pass
+    connection.close()
+
+
+def book_ticker(symbol, bid):
+    return {"stream": f"{symbol}@bookTicker", "data": {"u": 1, "s": symbol.upper(), "b": str(bid), "B": "1.0",
+                                                        "a": str(bid + 1), "A": "1.0"}}
+
+
+def kline(symbol, close):
+    return {"stream": f"{symbol}@kline_1m", "data": {"e": "kline", "E": 1, "s": symbol.upper(),
+                                                      "k": {"t": 0, "i": "1m", "c": str(close), "x": False}}}
+
+
+def test_market_stream_returns_low_high_and_last_price():
+    server = socket.create_server(("127.0.0.1", 0))
+    messages = [book_ticker("btceur", 100), book_ticker("btceur", 95), kline("btceur", 104),
+                book_ticker("btceur", 101), book_ticker("etheur", 10)]
+    requests = []
+    thread = threading.Thread(target=serve, args=(server, messages, requests), daemon=True)
+    thread.start()
+
+    stream = MarketStream(symbols=["BTCEUR", "ETHEUR"], url=f"ws://127.0.0.1:{server.getsockname()[1]}")
+    stream.start()
+
+    ranges = {}
+    try:
+        while len(ranges) < 2 or ranges["btceur"][2] != 101:
+            new_ranges = stream.wait(timeout=5)
+            assert new_ranges, "No prices received from the stream"
+            for symbol, (low, high, last) in new_ranges.items():
+                if symbol in ranges:
+                    low, high = min(low, ranges[symbol][0]), max(high, ranges[symbol][1])
+                ranges[symbol] = (low, high, last)
+    finally:
+        stream.stop()
+        server.close()
+
+    assert ranges == {"btceur": (95.0, 104.0, 101.0), "etheur": (10.0, 10.0, 10.0)}
+    assert requests[0].startswith("GET /stream?streams=btceur@bookTicker/btceur@kline_1m/etheur@bookTicker/")
+    assert stream.wait(timeout=0) == {}
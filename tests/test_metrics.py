@@ -0,0 +1,18 @@
+from bot.class_blueprints.metrics import MetricsRegistry
+
+
+def test_histogram_percentiles_and_prometheus_text():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("tick_seconds", "Duration of a tick.", buckets=(0.01, 0.1))
+    for i in range(100):
+        histogram.observe(i / 1000, symbol="btceur")
+    registry.counter("orders_total", "Orders.").inc(side="buy", status="filled")
+
+    assert histogram.quantile(0.5, symbol="btceur") == 0.05
+    assert histogram.quantile(0.99, symbol="btceur") == 0.099
+
+    text = registry.render()
+    assert 'tick_seconds_bucket{symbol="btceur",le="0.01"} 11' in text
+    assert 'tick_seconds_bucket{symbol="btceur",le="+Inf"} 100' in text
+    assert 'orders_total{side="buy",status="filled"} 1.0' in text
+    assert registry.to_dict()["tick_seconds"][0]["count"] == 100
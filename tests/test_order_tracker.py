@@ -0,0 +1,84 @@
+import json
+import threading
+from tests import bot_env
+from class_blueprints import order_tracker as order_tracker_module
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.order_tracker import OrderTracker
+from class_blueprints.user_data_stream import UserDataStream
+
+
+class FakeFillSource:
+
+    connected = True
+
+    def __init__(self):
+        self.handlers = []
+
+    def on_execution_report(self, handler):
+        self.handlers.append(handler)
+
+    def send(self, report):
+        for handler in self.handlers:
+            handler(report)
+
+
+def create_report(client_order_id, status, executed="0"):
+    return {"e": "executionReport", "s": "BTCEUR", "i": 7, "c": client_order_id, "C": "", "p": "100.00",
+            "q": "1.0", "z": executed, "Z": str(float(executed) * 100), "X": status, "o": "LIMIT", "S": "BUY",
+            "T": 1_600_000_000_123}
+
+
+def test_wait_returns_the_fill_of_the_user_data_stream():
+    source = FakeFillSource()
+    tracker = OrderTracker(fill_source=source, timeout=5)
+    client_order_id = tracker.track()
+
+    # The updates arrive while the bot waits, only a final one resolves the wait.
+    def send_updates():
+        source.send(create_report(client_order_id, status="NEW"))
+        source.send(create_report(client_order_id, status="FILLED", executed="1.0"))
+
+    threading.Timer(0.05, send_updates).start()
+    receipt = tracker.wait(symbol="btceur", order_id=7, client_order_id=client_order_id)
+
+    assert receipt["status"] == "FILLED"
+    assert receipt["executedQty"] == "1.0"
+    assert receipt["clientOrderId"] == client_order_id
+    assert receipt["updateTime"] == 1_600_000_000_123
+
+
+def test_without_a_stream_the_order_is_polled_until_it_is_filled(monkeypatch):
+    statuses = ["NEW", "PARTIALLY_FILLED", "FILLED"]
+    monkeypatch.setattr(order_tracker_module, "query_order",
+                        lambda asset_symbol, order_id: {"orderId": order_id, "status": statuses.pop(0)})
+    clock = SimulatedClock(start=1000)
+    tracker = OrderTracker(timeout=30, poll_interval=5, clock=clock)
+
+    receipt = tracker.wait(symbol="btceur", order_id=7, client_order_id=tracker.track())
+    assert receipt["status"] == "FILLED"
+    assert clock.time() == 1010
+
+
+def test_polling_stops_at_the_timeout(monkeypatch):
+    monkeypatch.setattr(order_tracker_module, "query_order",
+                        lambda asset_symbol, order_id: {"orderId": order_id, "status": "NEW"})
+    clock = SimulatedClock(start=1000)
+    tracker = OrderTracker(timeout=10, poll_interval=5, clock=clock)
+
+    receipt = tracker.wait(symbol="btceur", order_id=7, client_order_id=tracker.track())
+    assert receipt["status"] == "NEW"
+    assert clock.time() == 1010
+
+
+def test_the_user_data_stream_calls_the_handlers_of_an_event_type():
+    stream = UserDataStream()
+    reports, positions = [], []
+    stream.on_execution_report(reports.append)
+    stream.on_event("outboundAccountPosition", positions.append)
+
+    stream._handle_message(app=None, message=json.dumps(create_report("abc", status="FILLED")))
+    stream._handle_message(app=None, message=json.dumps({"e": "outboundAccountPosition", "u": 1, "B": []}))
+    stream._handle_message(app=None, message=json.dumps({"e": "balanceUpdate"}))
+
+    assert [report["c"] for report in reports] == ["abc"]
+    assert positions == [{"e": "outboundAccountPosition", "u": 1, "B": []}]
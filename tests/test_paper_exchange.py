@@ -0,0 +1,81 @@
+import json
+from bot.class_blueprints.clock import SimulatedClock
+from bot.class_blueprints.paper_exchange import PaperExchange
+
+START = 1_600_000_000 // 3600 * 3600
+
+
+def create_exchange(balances=None):
+    # One hour of 1m candles with a close of 100 + minute, and a dip to 90 in minute 30.
+    candles = []
+    for minute in range(60):
+        close = 100 + minute
+        low = 90 if minute == 30 else close - 1
+        candles.append([(START + minute * 60) * 1000, close, close + 1, low, close, 1])
+
+    clock = SimulatedClock(start=START)
+    exchange = PaperExchange(candles={"btceur": candles}, clock=clock, balances=balances or {"eur": 1000},
+                             fiat="eur", fee=0)
+    return exchange, clock
+
+
+def test_only_closed_candles_are_returned_and_resampled():
+    exchange, clock = create_exchange()
+    clock.set(START + 45 * 60)
+
+    klines = exchange.get("/api/v3/klines", params={"symbol": "BTCEUR", "interval": "1m", "limit": 1000}).json()
+    assert len(klines) == 45
+    assert float(klines[-1][4]) == 144
+
+    klines = exchange.get("/api/v3/klines", params={"symbol": "BTCEUR", "interval": "15m", "limit": 1000}).json()
+    assert [kline[0] for kline in klines] == [(START + minute * 60) * 1000 for minute in (0, 15, 30)]
+    assert float(klines[2][3]) == 90
+    assert float(klines[2][4]) == 144
+
+    response = exchange.get("/api/v3/ticker/price", params={"symbols": json.dumps(["BTCEUR"])})
+    assert float(response.json()[0]["price"]) == 144
+
+
+def test_marketable_order_fills_right_away():
+    exchange, clock = create_exchange()
+    clock.set(START + 10 * 60)
+
+    order = exchange.post("/api/v3/order", params={"symbol": "BTCEUR", "side": "BUY", "type": "LIMIT",
+                                                   "price": "110", "quantity": "2"}).json()
+    assert order["status"] == "FILLED"
+    assert exchange.get_balance("eur") == 780
+    assert exchange.get_balance("btc") == 2
+
+
+def test_limit_order_fills_against_the_low_of_a_later_candle():
+    exchange, clock = create_exchange()
+    clock.set(START + 10 * 60)
+
+    order = exchange.post("/api/v3/order", params={"symbol": "BTCEUR", "side": "BUY", "type": "LIMIT",
+                                                   "price": "95", "quantity": "1", "newClientOrderId": "abc"}).json()
+    assert order["status"] == "NEW"
+    assert exchange.get("/api/v3/account").json()["balances"][0]["locked"] == "95.00000000"
+
+    clock.set(START + 30 * 60)
+    assert exchange.get("/api/v3/order", params={"symbol": "BTCEUR", "orderId": order["orderId"]}).json()["status"] \
+        == "NEW"
+
+    clock.set(START + 31 * 60)
+    receipt = exchange.get("/api/v3/order", params={"symbol": "BTCEUR", "origClientOrderId": "abc"}).json()
+    assert receipt["status"] == "FILLED"
+    assert exchange.get_balance("btc") == 1
+
+
+def test_cancel_unlocks_the_funds_and_insufficient_balance_is_rejected():
+    exchange, clock = create_exchange()
+
+    order = exchange.post("/api/v3/order", params={"symbol": "BTCEUR", "side": "BUY", "type": "LIMIT",
+                                                   "price": "50", "quantity": "10"}).json()
+    canceled = exchange.delete("/api/v3/order", params={"symbol": "BTCEUR", "orderId": order["orderId"]}).json()
+    assert canceled["status"] == "CANCELED"
+    assert exchange.get_balance("eur") == 1000
+
+    response = exchange.post("/api/v3/order", params={"symbol": "BTCEUR", "side": "SELL", "type": "LIMIT",
+                                                      "price": "100", "quantity": "1"})
+    assert not response.ok
+    assert response.json()["code"] == -2010
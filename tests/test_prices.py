@@ -0,0 +1,71 @@
+import json
+import pytest
+from tests import bot_env
+from class_blueprints import trader
+from class_blueprints.prices import PriceSnapshot
+
+SYMBOLS = ["btceur", "etheur", "adaeur"]
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.status_code = 200
+        self.ok = True
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeClient:
+    """Answers the ticker price endpoint with the prices it has, and records the symbols of every request."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.requests = []
+
+    def get(self, endpoint, params=None):
+        assert endpoint == "/api/v3/ticker/price"
+        symbols = json.loads(params["symbols"])
+        self.requests.append(symbols)
+        return FakeResponse([{"symbol": symbol, "price": f"{self.prices[symbol]:.8f}"}
+                             for symbol in symbols if symbol in self.prices])
+
+
+def create_snapshot(monkeypatch, prices):
+    client = FakeClient(prices=prices)
+    monkeypatch.setattr(trader, "client", client)
+    return PriceSnapshot(symbols=[symbol.upper() for symbol in SYMBOLS]), client
+
+
+def test_one_request_per_tick_serves_every_strategy(monkeypatch):
+    snapshot, client = create_snapshot(monkeypatch, prices={"BTCEUR": 20000.0, "ETHEUR": 1500.0, "ADAEUR": 0.25})
+
+    for tick in range(3):
+        client.prices["BTCEUR"] += 100
+        snapshot.refresh()
+        assert [snapshot.get_price(symbol=symbol) for symbol in SYMBOLS] == [20100.0 + tick * 100, 1500.0, 0.25]
+
+    assert client.requests == [["BTCEUR", "ETHEUR", "ADAEUR"]] * 3
+
+
+def test_a_price_of_the_market_stream_replaces_the_snapshot(monkeypatch):
+    snapshot, client = create_snapshot(monkeypatch, prices={"BTCEUR": 20000.0, "ETHEUR": 1500.0, "ADAEUR": 0.25})
+    snapshot.refresh()
+
+    snapshot.update(symbol="BTCEUR", price=20500.0)
+    assert snapshot.get_price(symbol="btceur") == 20500.0
+    assert len(client.requests) == 1
+
+
+def test_a_missing_symbol_refreshes_the_snapshot_once(monkeypatch):
+    snapshot, client = create_snapshot(monkeypatch, prices={"BTCEUR": 20000.0})
+
+    # Without a refresh on the tick, the first lookup loads the snapshot.
+    assert snapshot.get_price(symbol="btceur") == 20000.0
+    assert len(client.requests) == 1
+
+    with pytest.raises(KeyError):
+        snapshot.get_price(symbol="etheur")
+    assert len(client.requests) == 2
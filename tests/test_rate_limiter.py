@@ -0,0 +1,47 @@
+import threading
+import time
+from bot.class_blueprints.rate_limiter import RateLimiter, get_weight, get_priority, HIGH, LOW
+
+
+def test_weights_and_priorities_of_endpoints():
+    assert get_weight("GET", "/api/v3/ticker/price", {"symbol": "BTCEUR"}) == 2
+    assert get_weight("GET", "/api/v3/ticker/price", {"symbols": '["BTCEUR","ETHEUR"]'}) == 4
+    assert get_weight("GET", "/api/v3/exchangeInfo") == 20
+    assert get_weight("GET", "/api/v3/unknown") == 1
+    assert get_priority("/api/v3/order") == HIGH
+    assert get_priority("/api/v3/klines") == LOW
+
+
+def test_reported_weight_limits_the_bucket():
+    limiter = RateLimiter(weight_limit=1200)
+    limiter.update(used_weight=1000)
+    assert limiter.available <= 201
+
+
+def test_a_share_of_the_weight_limit_is_used_per_process():
+    limiter = RateLimiter(weight_limit=1200, share=0.25)
+    assert limiter.available <= 300
+
+    # The reported weight is used by all processes, this one gets its share of what's left.
+    limiter.update(used_weight=800)
+    assert limiter.available <= 101
+
+
+def test_high_priority_requests_are_served_first_and_use_the_reserve():
+    limiter = RateLimiter(weight_limit=100, interval=1, reserve=0.1)
+    limiter.acquire(weight=90, priority=LOW)
+    order = []
+
+    def request(name, weight, priority):
+        limiter.acquire(weight=weight, priority=priority)
+        order.append(name)
+
+    history_thread = threading.Thread(target=request, args=("history", 20, LOW))
+    history_thread.start()
+    time.sleep(0.02)
+    order_thread = threading.Thread(target=request, args=("order", 10, HIGH))
+    order_thread.start()
+
+    history_thread.join(timeout=2)
+    order_thread.join(timeout=2)
+    assert order == ["order", "history"]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from bot.class_blueprints.resampler import Resampler, aggregate
+
+HALF_HOUR = 1_800_000
+HOUR = 3_600_000
+FOUR_HOURS = 14_400_000
+
+
+def create_candles(count, start=FOUR_HOURS * 100 + HALF_HOUR * 3, seed=1):
+    open_times = start + HALF_HOUR * np.arange(count, dtype=np.int64)
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, count)))
+    return open_times, closes
+
+
+def test_candles_are_grouped_on_the_boundaries_of_the_interval():
+    open_times, closes = create_candles(count=20)
+    four_hour_open_times, four_hour_closes = aggregate(open_times=open_times, closes=closes, length=FOUR_HOURS)
+
+    # The first 4h candle only has its last five 30m candles, the last one is still open.
+    assert list(four_hour_open_times) == [FOUR_HOURS * 100, FOUR_HOURS * 101, FOUR_HOURS * 102]
+    assert list(four_hour_closes) == [closes[4], closes[12], closes[19]]
+
+
+def test_incremental_updates_match_resampling_everything_again():
+    open_times, closes = create_candles(count=400)
+    resampler = Resampler(base_ms=HALF_HOUR, max_candles=100)
+    resampler.update(open_times=open_times[:100], closes=closes[:100])
+    resampler.get(length=HOUR, limit=1000)
+    resampler.get(length=FOUR_HOURS, limit=1000)
+
+    # Every update downloads the candles from the last stored open time, that one was still open.
+    live_closes = closes.copy()
+    position = 100
+    while position < len(open_times):
+        end = min(position + 7, len(open_times))
+        live_closes[end - 1] *= 1.01
+        resampler.update(open_times=open_times[position - 1:end], closes=live_closes[position - 1:end])
+        live_closes[end - 1] = closes[end - 1]
+        position = end
+
+    live_closes[-1] *= 1.01
+    expected_open_times, expected_closes = open_times[-100:], live_closes[-100:]
+    for length in (HOUR, FOUR_HOURS):
+        actual = resampler.get(length=length, limit=1000)
+        expected = aggregate(open_times=expected_open_times, closes=expected_closes, length=length)
+        assert np.array_equal(actual[0], expected[0])
+        assert np.array_equal(actual[1], expected[1])
+
+    # All intervals agree on the latest price.
+    assert resampler.get(length=HALF_HOUR, limit=1)[1][-1] == resampler.get(length=FOUR_HOURS, limit=1)[1][-1]
+
+
+def test_intervals_that_are_no_multiple_of_the_base_are_refused():
+    resampler = Resampler(base_ms=HOUR, max_candles=10)
+    with pytest.raises(ValueError):
+        resampler.get(length=HALF_HOUR, limit=10)
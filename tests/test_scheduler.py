@@ -0,0 +1,35 @@
+from bot.class_blueprints.clock import SimulatedClock
+from bot.class_blueprints.scheduler import Scheduler
+
+
+def create_scheduler(start):
+    clock = SimulatedClock(start=start)
+    scheduler = Scheduler(clock=clock)
+    scheduler.add(name="1m", interval=60)
+    scheduler.add(name="30m", interval=1800)
+    return scheduler, clock
+
+
+def test_deadlines_are_aligned_to_candle_closes():
+    scheduler, clock = create_scheduler(start=1790)
+    assert scheduler.time_until_next() == 10
+
+    events = scheduler.wait()
+    assert clock.time() == 1800
+    assert [(event.name, event.deadline, event.missed) for event in events] == [("1m", 1800, 0), ("30m", 1800, 0)]
+
+    events = scheduler.wait()
+    assert clock.time() == 1860
+    assert [event.name for event in events] == ["1m"]
+
+
+def test_missed_deadlines_are_run_once_and_reported():
+    scheduler, clock = create_scheduler(start=1790)
+    scheduler.wait()
+
+    # The tick at 1800 took more than three minutes.
+    clock.set(2000)
+    events = scheduler.pop_due()
+    assert [(event.name, event.deadline, event.missed) for event in events] == [("1m", 1860, 2)]
+    assert scheduler.pop_due() == []
+    assert scheduler.time_until_next() == 40
@@ -0,0 +1,169 @@
+import queue
+import time
+import pytest
+from types import SimpleNamespace
+from tests import bot_env
+from database import Base, get_engine
+from class_blueprints import trader
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.paper_exchange import PaperExchange
+from class_blueprints.strategies import Strategy
+from class_blueprints.warm_start import WarmStart
+from sharded_bot import ShardedTraderBot
+
+SYMBOLS = ["btceur", "etheur", "adaeur", "doteur"]
+
+
+class FakePortfolio:
+
+    crypto_balances = dict.fromkeys(SYMBOLS)
+
+    def update_portfolio(self):
+        pass
+
+    def print_portfolio(self):
+        pass
+
+
+class FakePrices:
+
+    def refresh(self):
+        pass
+
+    def get_price(self, symbol):
+        return 100.0
+
+
+class FakeStrategy:
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.market_state = None
+        self.stop_loss = None
+        self.prices = []
+
+    def decide(self, market_state, price, values):
+        self.market_state = market_state
+        self.prices.append(price)
+        return "continue"
+
+
+class FakeProcess:
+
+    def __init__(self):
+        self.alive = True
+        self.exitcode = None
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self, timeout=None):
+        pass
+
+
+class FakeRequests:
+    """Answers a tick at once with a reading for every symbol of the shard, like a worker that's very fast."""
+
+    def __init__(self, results, symbols, process):
+        self._results = results
+        self._symbols = symbols
+        self._process = process
+        self.price = 2.0
+
+    def put(self, tick):
+        if tick is None or not self._process.alive:
+            return
+        for symbol in self._symbols:
+            self._results.put((tick, symbol, create_reading(price=self.price), None))
+
+
+class FakeShardedBot(ShardedTraderBot):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._results = queue.Queue()
+        self.started = []
+        self.workers = {}
+
+    def _start_worker(self, number, symbols):
+        process = FakeProcess()
+        requests = FakeRequests(results=self._results, symbols=symbols, process=process)
+        self.started.append(number)
+        self.workers[number] = (process, requests)
+        return process, requests, symbols
+
+
+def create_reading(price):
+    return {"market_state": "bull", "price": price, "values": {"4h_ema_200": 1.0}, "open_time": 1_600_000_000_000}
+
+
+def create_bot(monkeypatch):
+    # The symbol filters are loaded from the paper exchange instead of Binance.
+    candles = {symbol: [[1_600_000_000_000, 1, 1, 1, 1, 1]] for symbol in SYMBOLS}
+    exchange = PaperExchange(candles=candles, clock=SimulatedClock(start=1_600_000_000), balances={"eur": 1000},
+                             fiat="eur")
+    monkeypatch.setattr(trader, "client", exchange)
+
+    strategies = [FakeStrategy(symbol=symbol) for symbol in SYMBOLS]
+    bot = FakeShardedBot(name="test", strategies=strategies, portfolio=FakePortfolio(), prices=FakePrices(),
+                         shards=2, timeout=5)
+    bot.start_workers()
+    return bot, strategies
+
+
+def test_readings_of_an_old_tick_are_discarded(monkeypatch):
+    bot, strategies = create_bot(monkeypatch)
+
+    # A reading that arrived after its tick timed out.
+    bot._results.put((0, "btceur", create_reading(price=1.0), None))
+    bot.tick(check_signal=True)
+
+    assert [strategy.prices for strategy in strategies] == [[2.0]] * len(SYMBOLS)
+    assert all(strategy.market_state == "bull" for strategy in strategies)
+
+
+def test_a_dead_worker_is_started_again(monkeypatch):
+    bot, strategies = create_bot(monkeypatch)
+    assert bot.started == [0, 1]
+
+    process, requests = bot.workers[0]
+    process.alive, process.exitcode = False, 1
+    bot.tick(check_signal=True)
+
+    assert bot.started == [0, 1, 0]
+    assert [strategy.prices for strategy in strategies] == [[2.0]] * len(SYMBOLS)
+
+
+def test_a_worker_that_dies_during_a_tick_does_not_block_the_others(monkeypatch):
+    bot, strategies = create_bot(monkeypatch)
+
+    # Shard 0 has the symbols at the even positions and dies before it answers.
+    process, requests = bot.workers[0]
+    requests.put = lambda tick: setattr(process, "alive", False)
+
+    start = time.monotonic()
+    bot.tick(check_signal=True)
+
+    assert time.monotonic() - start < 5
+    assert [strategy.prices for strategy in strategies] == [[], [2.0], [], [2.0]]
+
+
+def test_a_warm_start_is_rejected(monkeypatch, tmp_path):
+    with pytest.raises(ValueError):
+        FakeShardedBot(name="test", strategies=[FakeStrategy(symbol="btceur")], portfolio=FakePortfolio(),
+                       prices=FakePrices(), warm_start=WarmStart(path=str(tmp_path / "snapshot.bin")))
+
+
+def test_the_strategies_of_the_coordinator_download_nothing():
+    Base.metadata.create_all(get_engine())
+
+    # Without a kline store the market state is only known after the first reading of a worker.
+    strategy = Strategy(symbol="btceur", name="Golden Cross", crypto=SimpleNamespace(balance=1.0), kline_store=None,
+                        prices=FakePrices())
+    assert strategy.market_state is None
+    assert strategy.stop_loss is None
+
+    # The balance gets the trailing stop loss of the market state first, so it isn't bought again.
+    assert strategy.decide(market_state="bull", price=100.0, values={"EMA_8": 2.0, "EMA_21": 1.0}) == "continue"
+    assert strategy.stop_loss.trail_ratio == 0.99
+    strategy.stop_loss.close_stop_loss()
@@ -0,0 +1,113 @@
+import time
+from types import SimpleNamespace
+from tests import bot_env
+from sqlalchemy import create_engine, event
+from database import Base, StopLoss
+from class_blueprints import stop_loss_repository
+from class_blueprints.stop_loss_repository import StopLossRepository
+
+
+def create_engine_with_wal(path):
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def create_stop_loss(index=None, highest=100.0):
+    return SimpleNamespace(index=index, strategy_name="Golden Cross", asset="btceur", buy_price=100.0,
+                           highest=highest, trail_ratio=0.95, trail=highest * 0.95, is_open=True)
+
+
+def get_row(repository, index):
+    row = repository.get(index=index)
+    return row.highest, row.trail, row.open_stop_loss
+
+
+def test_recover_writes_the_journal_that_was_not_checkpointed(tmp_path):
+    engine = create_engine_with_wal(tmp_path / "trades.db")
+    journal_path = str(tmp_path / "trades.db.journal")
+    repository = StopLossRepository(engine=engine, journal_path=journal_path, checkpoint_interval=3600)
+
+    stop_loss = create_stop_loss()
+    stop_loss.index = repository.add(stop_loss)
+    stop_loss.highest, stop_loss.trail = 120.0, 114.0
+    repository.mark_dirty(stop_loss)
+    repository.flush()
+
+    # The bot stops before the checkpoint, the change is only in the journal.
+    assert get_row(repository, stop_loss.index) == (100.0, 95.0, True)
+
+    recovered = StopLossRepository(engine=engine, journal_path=journal_path)
+    assert recovered.recover() == 1
+    assert get_row(recovered, stop_loss.index) == (120.0, 114.0, True)
+    assert (tmp_path / "trades.db.journal").read_text() == ""
+
+
+def count_updates(engine):
+    updates = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record_update(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE stop_loss"):
+            updates.append(len(parameters) if executemany else 1)
+
+    return updates
+
+
+def test_the_changes_of_a_tick_are_written_to_the_journal_once(tmp_path):
+    engine = create_engine_with_wal(tmp_path / "trades.db")
+    journal_path = tmp_path / "trades.db.journal"
+    repository = StopLossRepository(engine=engine, journal_path=str(journal_path), checkpoint_interval=300)
+    updates = count_updates(engine)
+
+    stop_losses = [create_stop_loss() for _ in range(3)]
+    for stop_loss in stop_losses:
+        stop_loss.index = repository.add(stop_loss)
+
+    # The price moves a few times within one tick, only the latest change of every stop loss is kept.
+    for highest in (110.0, 120.0, 130.0):
+        for stop_loss in stop_losses:
+            stop_loss.highest, stop_loss.trail = highest, highest * 0.95
+            repository.mark_dirty(stop_loss)
+
+    assert repository.flush() == 3
+    assert len(journal_path.read_text().splitlines()) == 3
+    assert repository.flush() == 0
+    assert len(journal_path.read_text().splitlines()) == 3
+
+    # The database is only written at the checkpoint.
+    assert updates == []
+    assert get_row(repository, stop_losses[0].index) == (100.0, 95.0, True)
+
+
+def test_a_checkpoint_writes_all_changes_with_one_update(tmp_path, monkeypatch):
+    engine = create_engine_with_wal(tmp_path / "trades.db")
+    journal_path = tmp_path / "trades.db.journal"
+    repository = StopLossRepository(engine=engine, journal_path=str(journal_path), checkpoint_interval=300)
+    updates = count_updates(engine)
+
+    stop_losses = [create_stop_loss(highest=100.0 + number) for number in range(3)]
+    for stop_loss in stop_losses:
+        stop_loss.index = repository.add(stop_loss)
+        stop_loss.highest *= 2
+        stop_loss.trail, stop_loss.is_open = stop_loss.highest * 0.95, stop_loss.highest < 202
+        repository.mark_dirty(stop_loss)
+    repository.flush()
+
+    # The first flush after the checkpoint interval writes the journal to the database.
+    now = time.monotonic()
+    monkeypatch.setattr(stop_loss_repository.time, "monotonic", lambda: now + 301)
+    repository.flush()
+
+    assert updates == [3]
+    assert [get_row(repository, stop_loss.index) for stop_loss in stop_losses] == [
+        (stop_loss.highest, stop_loss.trail, stop_loss.is_open) for stop_loss in stop_losses]
+    assert journal_path.read_text() == ""
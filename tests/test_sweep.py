@@ -0,0 +1,91 @@
+import math
+import random
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+from tests import bot_env
+import sweep
+from class_blueprints.backtester import Backtester, candles_from_klines, HALF_HOUR, HOUR, FOUR_HOURS
+
+GRID = {"bull_fast": [5, 8], "rsi_buy": [25, 35]}
+
+
+def create_klines(n, interval, seed):
+    """A random walk of 30m candles, aggregated to the interval"""
+    generator = random.Random(seed)
+    price = 2000.0
+    klines = {}
+    for i in range(n):
+        open_price = price
+        price = price * (1 + generator.gauss(0, 0.01) + 0.002 * math.sin(i / 400))
+        high = max(open_price, price) * (1 + abs(generator.gauss(0, 0.003)))
+        low = min(open_price, price) * (1 - abs(generator.gauss(0, 0.003)))
+
+        start = i * HALF_HOUR - i * HALF_HOUR % interval
+        if start not in klines:
+            klines[start] = [start, open_price, high, low, price]
+        else:
+            kline = klines[start]
+            kline[2], kline[3], kline[4] = max(kline[2], high), min(kline[3], low), price
+    return list(klines.values())
+
+
+def create_candles():
+    return {symbol: {name: candles_from_klines(create_klines(n=3000, interval=interval, seed=seed))
+                     for name, interval in (("30m", HALF_HOUR), ("1h", HOUR), ("4h", FOUR_HOURS))}
+            for symbol, seed in (("btceur", 7), ("etheur", 11))}
+
+
+def record_blocks(monkeypatch):
+    """Records the names of the shared memory blocks that the sweep creates."""
+    names = []
+    share_candles = sweep.share_candles
+
+    def record(candles):
+        block, layout = share_candles(candles)
+        names.append(block.name)
+        return block, layout
+
+    monkeypatch.setattr(sweep, "share_candles", record)
+    return names
+
+
+def assert_unlinked(names):
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_the_parallel_sweep_matches_a_serial_backtest(monkeypatch):
+    candles = create_candles()
+    parameter_sets = sweep.create_parameter_sets(grid=GRID)
+    names = record_blocks(monkeypatch)
+
+    results = sweep.sweep(candles=candles, parameter_sets=parameter_sets, workers=2)
+
+    expected = []
+    for parameters in parameter_sets:
+        runs = [Backtester(candles=candles[symbol], parameters=parameters).run() for symbol in candles]
+        expected.append({
+            **parameters,
+            "average_return": float(np.mean([run["total_return"] for run in runs])),
+            "worst_drawdown": float(max(run["max_drawdown"] for run in runs)),
+            "trades": sum(run["number_of_trades"] for run in runs),
+            "win_rate": float(np.mean([run["win_rate"] for run in runs])),
+        })
+
+    assert len(parameter_sets) == 4
+    assert sum(result["trades"] for result in results) > 0
+    assert results == sorted(expected, key=lambda result: result["average_return"], reverse=True)
+    assert_unlinked(names)
+
+
+def test_the_shared_candles_are_removed_when_a_worker_fails(monkeypatch):
+    names = record_blocks(monkeypatch)
+
+    # The EMA of the worker can't be calculated with a window that isn't a number.
+    with pytest.raises(TypeError):
+        sweep.sweep(candles=create_candles(), parameter_sets=[{"bull_fast": 5}, {"bull_fast": None}], workers=2)
+
+    assert len(names) == 1
+    assert_unlinked(names)
@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+from tests import bot_env
+import trader_bot
+from class_blueprints import trader
+from class_blueprints.clock import SimulatedClock
+from class_blueprints.exceptions import BinanceConnectionIssue
+from class_blueprints.metrics import tick_latency
+from class_blueprints.order_tracker import OrderTracker
+from class_blueprints.paper_exchange import PaperExchange
+from trader_bot import TraderBot
+
+SYMBOLS = ["btceur", "etheur", "adaeur"]
+
+
+class FakePortfolio:
+
+    crypto_balances = dict.fromkeys(SYMBOLS)
+
+    def update_portfolio(self):
+        pass
+
+    def print_portfolio(self):
+        pass
+
+
+class FakePrices:
+
+    def refresh(self):
+        pass
+
+
+class FakeStrategy:
+
+    def __init__(self, symbol, error=None):
+        self.symbol = symbol
+        self.market_state = "bull"
+        self.stop_loss = None
+        self.checks = 0
+        self._error = error
+
+    def check_for_signal(self):
+        self.checks += 1
+        if self._error:
+            raise self._error
+        return SimpleNamespace(df=pd.DataFrame({"Price": [1.0]})), "continue"
+
+
+def create_bot(monkeypatch, strategies, order_tracker=None):
+    # The symbol filters are loaded from the paper exchange instead of Binance.
+    candles = {symbol: [[1_600_000_000_000, 1, 1, 1, 1, 1]] for symbol in SYMBOLS}
+    exchange = PaperExchange(candles=candles, clock=SimulatedClock(start=1_600_000_000), balances={"eur": 1000},
+                             fiat="eur")
+    monkeypatch.setattr(trader, "client", exchange)
+    return TraderBot(name="test", strategies=strategies, portfolio=FakePortfolio(), prices=FakePrices(),
+                     order_tracker=order_tracker)
+
+
+def test_a_connection_issue_of_one_symbol_does_not_skip_the_others(monkeypatch):
+    strategies = [FakeStrategy(symbol="btceur"),
+                  FakeStrategy(symbol="etheur", error=BinanceConnectionIssue("Can't connect to the API.")),
+                  FakeStrategy(symbol="adaeur")]
+    bot = create_bot(monkeypatch, strategies)
+
+    bot.tick(check_signal=True)
+    assert [strategy.checks for strategy in strategies] == [1, 1, 1]
+
+
+def test_prices_and_quantities_are_rounded_down_to_the_filters(monkeypatch):
+    # The paper exchange has a tick size of 0.01 and a step size of 0.00001.
+    bot = create_bot(monkeypatch, [FakeStrategy(symbol="btceur")])
+
+    assert bot.get_correct_fractional_part(symbol="btceur", quantity=123.456789) == 123.45
+    assert bot.get_correct_fractional_part(symbol="btceur", quantity=0.123456789, price=False) == 0.12345
+
+    monkeypatch.setattr(bot._symbol_filters, "get_tick_size", lambda symbol: "1.00000000")
+    assert bot.get_correct_fractional_part(symbol="btceur", quantity=123.456789) == 123
+
+
+def count_ticks(symbol):
+    return sum(entry["count"] for entry in tick_latency.to_dict()
+               if entry["labels"] == {"symbol": symbol, "source": "tick"})
+
+
+def test_every_symbol_of_a_tick_is_measured(monkeypatch):
+    strategies = [FakeStrategy(symbol="btceur", error=TypeError()),
+                  FakeStrategy(symbol="etheur", error=BinanceConnectionIssue("Can't connect to the API.")),
+                  FakeStrategy(symbol="adaeur")]
+    bot = create_bot(monkeypatch, strategies)
+    counts = [count_ticks(symbol) for symbol in SYMBOLS]
+
+    bot.tick(check_signal=True)
+    bot.tick(check_signal=False)
+    assert [count_ticks(symbol) - count for symbol, count in zip(SYMBOLS, counts)] == [2, 2, 2]
+
+
+def test_the_order_is_forgotten_when_it_can_not_be_placed(monkeypatch):
+    order_tracker = OrderTracker()
+    strategy = FakeStrategy(symbol="btceur")
+    bot = create_bot(monkeypatch, [strategy], order_tracker=order_tracker)
+
+    client_order_ids = []
+    original_track = order_tracker.track
+
+    def track():
+        client_order_ids.append(original_track())
+        return client_order_ids[-1]
+
+    monkeypatch.setattr(order_tracker, "track", track)
+    monkeypatch.setattr(bot, "get_coins_to_trade", lambda strategy, action: (100.0, 1.0))
+
+    def post_order(**kwargs):
+        raise BinanceConnectionIssue("Can't connect to the API for post_order.")
+
+    monkeypatch.setattr(trader_bot, "post_order", post_order)
+
+    with pytest.raises(BinanceConnectionIssue):
+        bot.place_limit_order(symbol="btceur", action="buy", strategy=strategy)
+
+    with pytest.raises(KeyError):
+        order_tracker.get_future(client_order_ids[0])
@@ -0,0 +1,52 @@
+import pickle
+from bot.class_blueprints import warm_start as warm_start_module
+from bot.class_blueprints.warm_start import WarmStart
+
+
+class FakeStrategy:
+
+    def __init__(self, symbol, market_state):
+        self.symbol = symbol
+        self.market_state = market_state
+
+    def get_state(self):
+        return {"indicators": {"4h": [1.0, 2.0]}, "market_state": self.market_state}
+
+
+def save_at(monkeypatch, path, timestamp):
+    monkeypatch.setattr(warm_start_module.time, "time", lambda: timestamp)
+    WarmStart(path=path).save(strategies=[FakeStrategy(symbol="btceur", market_state="bull")])
+
+
+def test_state_is_restored_within_the_same_4h_candle(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot.bin")
+    save_at(monkeypatch, path, timestamp=14_400 * 100 + 60)
+
+    monkeypatch.setattr(warm_start_module.time, "time", lambda: 14_400 * 100 + 600)
+    warm_start = WarmStart(path=path)
+    assert warm_start.load()
+    assert warm_start.get_state(symbol="btceur") == {"indicators": {"4h": [1.0, 2.0]}, "market_state": "bull"}
+    assert warm_start.get_state(symbol="etheur") is None
+
+
+def test_market_state_is_calculated_again_after_a_4h_close(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot.bin")
+    save_at(monkeypatch, path, timestamp=14_400 * 100 + 60)
+
+    monkeypatch.setattr(warm_start_module.time, "time", lambda: 14_400 * 101 + 60)
+    warm_start = WarmStart(path=path)
+    assert warm_start.load()
+    assert warm_start.get_state(symbol="btceur")["market_state"] is None
+
+
+def test_old_or_broken_snapshots_are_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot.bin")
+    save_at(monkeypatch, path, timestamp=1000)
+
+    monkeypatch.setattr(warm_start_module.time, "time", lambda: 1000 + 86_401)
+    assert not WarmStart(path=path).load()
+
+    with open(path, "wb") as file:
+        file.write(pickle.dumps({"version": 1})[:5])
+    assert not WarmStart(path=path).load()
+    assert not WarmStart(path=str(tmp_path / "missing.bin")).load()